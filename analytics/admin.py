@@ -1,3 +1,12 @@
 from django.contrib import admin
 
 # Register your models here.
+from .models import HotspotCounter
+
+
+@admin.register(HotspotCounter)
+class HotspotCounterAdmin(admin.ModelAdmin):
+    list_display = ('cell', 'category', 'recent', 'updated_at', 'last_alert_at')
+    list_filter = ('category',)
+    search_fields = ('cell',)
+    readonly_fields = ('cell', 'category', 'recent', 'weekdays', 'updated_at', 'observed_since', 'last_alert_at')
@@ -0,0 +1,179 @@
+"""
+Incremental hotspot and spike detection over crime report counts.
+
+Each grid cell (reports.geo) keeps one HotspotCounter per crime category
+and one for all categories together. A counter holds two exponentially
+decayed counts, both updated in O(1) when a report arrives, without
+reading any history:
+
+- `recent`, decayed with a mean life of SHORT_MEAN_LIFE (a day), which is
+  the cell's current activity;
+- `weekdays`, seven counts decayed over LONG_MEAN_LIFE (eight weeks), one
+  per weekday, which give the seasonal baseline: the usual daily rate on
+  the current weekday, less the recent activity being tested.
+
+A Poisson process with rate r per day gives `recent` a mean of r times the
+short mean life, so that is the count expected right now. When the
+observed count is improbable under a Poisson distribution with that mean
+(one-sided p below HOTSPOT_P_VALUE) the cell is spiking, and a draft
+community alert is raised for CPF members to approve.
+"""
+
+import logging
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from reports.geo import CELL_SIZE_DEGREES, cell_key_for, parse_cell_key
+
+from .models import HotspotCounter
+
+logger = logging.getLogger(__name__)
+
+SHORT_MEAN_LIFE = timedelta(hours=getattr(settings, 'HOTSPOT_SHORT_MEAN_LIFE_HOURS', 24))
+LONG_MEAN_LIFE = timedelta(days=getattr(settings, 'HOTSPOT_LONG_MEAN_LIFE_DAYS', 56))
+P_VALUE = getattr(settings, 'HOTSPOT_P_VALUE', 0.001)
+# Fewer reports than this are never a spike, however quiet the cell usually is
+MIN_COUNT = getattr(settings, 'HOTSPOT_MIN_COUNT', 3)
+# Expected counts are never taken below this, so new or quiet cells need a real cluster
+MIN_EXPECTED = 0.5
+ALERT_COOLDOWN = timedelta(hours=48)
+ALERT_CATEGORY = 'Crime Hotspot'
+ALL_CATEGORIES = ''
+
+
+def decay(value, elapsed, mean_life):
+    return value * math.exp(-elapsed / mean_life)
+
+
+def advance(counter, when):
+    """Decay a counter's counts to `when`; returns the weight a report made then adds"""
+    if when >= counter.updated_at:
+        elapsed = when - counter.updated_at
+        counter.recent = decay(counter.recent, elapsed, SHORT_MEAN_LIFE)
+        counter.weekdays = [decay(value, elapsed, LONG_MEAN_LIFE) for value in counter.weekdays]
+        counter.updated_at = when
+        return 1.0, 1.0
+    # A back-dated report: leave the clock alone and add it already decayed
+    elapsed = counter.updated_at - when
+    return decay(1.0, elapsed, SHORT_MEAN_LIFE), decay(1.0, elapsed, LONG_MEAN_LIFE)
+
+
+def add_report(counter, when):
+    """Count one report made at `when`"""
+    if len(counter.weekdays) != 7:
+        counter.weekdays = [0.0] * 7
+    short_weight, long_weight = advance(counter, when)
+    counter.recent += short_weight
+    counter.weekdays[timezone.localtime(when).weekday()] += long_weight
+
+
+def expected_recent(counter, now):
+    """Seasonal baseline: the `recent` count usual for this weekday"""
+    # How many decayed weeks of history the weekday counts cover; at least one,
+    # so a cell observed for minutes does not extrapolate them to a rate
+    observed = max(now - counter.observed_since, timedelta(0))
+    weeks = (LONG_MEAN_LIFE / timedelta(weeks=1)) * (1 - math.exp(-observed / LONG_MEAN_LIFE))
+    # Leave out the recent activity itself, most of which fell on this weekday,
+    # or a burst would raise its own baseline
+    usual = max(counter.weekdays[timezone.localtime(now).weekday()] - counter.recent, 0.0)
+    daily_rate = usual / max(weeks, 1.0)
+    return max(daily_rate * (SHORT_MEAN_LIFE / timedelta(days=1)), MIN_EXPECTED)
+
+
+def poisson_tail(k, mean):
+    """P(X >= k) for X ~ Poisson(mean)"""
+    if k <= 0:
+        return 1.0
+    term = math.exp(-mean)
+    below = term
+    for i in range(1, k):
+        term *= mean / i
+        below += term
+    return max(1.0 - below, 0.0)
+
+
+def spike_test(counter, now):
+    """(observed, expected, p-value, z-score) of a counter's current activity"""
+    observed = counter.recent
+    expected = expected_recent(counter, now)
+    p_value = poisson_tail(round(observed), expected)
+    z_score = (observed - expected) / math.sqrt(expected)
+    return observed, expected, p_value, z_score
+
+
+def tracking_started():
+    """When the earliest counter started observing; new cells are assumed quiet since then"""
+    first = HotspotCounter.objects.order_by('observed_since').values_list('observed_since', flat=True).first()
+    return first or timezone.now()
+
+
+def record_report(report, raise_alerts=True):
+    """Count a new report in its cell's counters and raise a draft alert if the cell is spiking"""
+    cell = cell_key_for(report.latitude, report.longitude)
+    if cell is None:
+        return []
+    now = timezone.now()
+    spikes = []
+    with transaction.atomic():
+        for category in (report.category, ALL_CATEGORIES):
+            # Create the row first: select_for_update locks nothing while it is missing, and two
+            # tasks for the first reports in a cell would both insert it
+            counter, _ = HotspotCounter.objects.get_or_create(
+                cell=cell,
+                category=category,
+                defaults={'observed_since': tracking_started(), 'updated_at': min(report.date_reported, now)},
+            )
+            counter = HotspotCounter.objects.select_for_update().get(pk=counter.pk)
+            add_report(counter, report.date_reported)
+            observed, expected, p_value, z_score = spike_test(counter, now)
+            if (
+                raise_alerts
+                and observed >= MIN_COUNT
+                and p_value < P_VALUE
+                and (counter.last_alert_at is None or now - counter.last_alert_at > ALERT_COOLDOWN)
+            ):
+                counter.last_alert_at = now
+                spikes.append((counter, observed, expected, p_value, z_score))
+            counter.save()
+        if spikes:
+            # One alert per report: the category spike if there is one, else the cell-wide one
+            raise_alert(report, *spikes[0])
+    return spikes
+
+
+def cell_centre(cell):
+    row, col = parse_cell_key(cell)
+    return round((row + 0.5) * CELL_SIZE_DEGREES, 6), round((col + 0.5) * CELL_SIZE_DEGREES, 6)
+
+
+def raise_alert(report, counter, observed, expected, p_value, z_score):
+    """Draft a community alert about a spiking cell for CPF approval"""
+    from community_alerts.models import Alert, AlertCategory
+
+    category, _ = AlertCategory.objects.get_or_create(
+        name=ALERT_CATEGORY, defaults={'icon': 'fa-fire', 'color': 'warning'}
+    )
+    what = dict(report.CRIME_CATEGORIES).get(counter.category, counter.category) if counter.category else 'crime'
+    latitude, longitude = cell_centre(counter.cell)
+    alert = Alert.objects.create(
+        title=f"Possible {what.lower()} hotspot near {report.location}"[:200],
+        content=(
+            f"{observed:.1f} recent reports of {what.lower()} in this area against {expected:.1f} usually "
+            f"expected on a {timezone.localtime().strftime('%A')} (p={p_value:.2g}, z={z_score:.1f}). "
+            f"Raised automatically from report \"{report.title}\"; review before approving."
+        ),
+        category=category,
+        severity='HIGH' if p_value < P_VALUE / 100 else 'MEDIUM',
+        expires_at=timezone.now() + ALERT_COOLDOWN,
+        location=report.location,
+        latitude=latitude,
+        longitude=longitude,
+        radius=int(CELL_SIZE_DEGREES * 111320 / 2),
+        is_approved=False,
+    )
+    logger.info(f"Raised draft hotspot alert {alert.id} for cell {counter.cell} ({what}, p={p_value:.2g})")
+    return alert
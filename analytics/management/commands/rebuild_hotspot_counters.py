@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from analytics.hotspots import ALL_CATEGORIES, add_report
+from analytics.models import HotspotCounter
+from reports.geo import cell_key_for
+from reports.models import CrimeReport
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the hotspot counters by replaying every crime report in date order (raises no alerts)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Reports to read per query'
+        )
+
+    def handle(self, *args, **options):
+        reports = (
+            CrimeReport.objects.filter(is_duplicate=False, latitude__isnull=False, longitude__isnull=False)
+            .order_by('date_reported')
+            .values_list('latitude', 'longitude', 'category', 'date_reported')
+        )
+        counters = {}
+        observed_since = None
+        replayed = 0
+        for latitude, longitude, category, date_reported in reports.iterator(chunk_size=options['batch_size']):
+            cell = cell_key_for(latitude, longitude)
+            observed_since = observed_since or date_reported
+            for key in ((cell, category), (cell, ALL_CATEGORIES)):
+                counter = counters.get(key)
+                if counter is None:
+                    counter = counters[key] = HotspotCounter(
+                        cell=key[0], category=key[1], updated_at=date_reported, observed_since=observed_since
+                    )
+                add_report(counter, date_reported)
+            replayed += 1
+
+        with transaction.atomic():
+            HotspotCounter.objects.all().delete()
+            HotspotCounter.objects.bulk_create(counters.values(), batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(f"Replayed {replayed} reports into {len(counters)} hotspot counters"))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:11
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HotspotCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell', models.CharField(max_length=32)),
+                ('category', models.CharField(blank=True, max_length=50)),
+                ('recent', models.FloatField(default=0, help_text='Reports decayed over HOTSPOT_SHORT_MEAN_LIFE_HOURS')),
+                ('weekdays', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('observed_since', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_alert_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='hotspotcounter',
+            constraint=models.UniqueConstraint(fields=('cell', 'category'), name='analytics_hotspot_counter_unique'),
+        ),
+    ]
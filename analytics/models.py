@@ -1,3 +1,24 @@
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
+
+class HotspotCounter(models.Model):
+    """Exponentially decayed report counts for one grid cell and crime category (see analytics.hotspots)"""
+    cell = models.CharField(max_length=32)
+    # Empty for the all-categories counter of the cell
+    category = models.CharField(max_length=50, blank=True)
+    recent = models.FloatField(default=0, help_text="Reports decayed over HOTSPOT_SHORT_MEAN_LIFE_HOURS")
+    # Reports per weekday (Monday first), decayed over HOTSPOT_LONG_MEAN_LIFE_DAYS
+    weekdays = models.JSONField(default=list)
+    updated_at = models.DateTimeField(default=timezone.now)
+    observed_since = models.DateTimeField(default=timezone.now)
+    last_alert_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cell', 'category'], name='analytics_hotspot_counter_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.cell} {self.category or 'all'}"
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from reports.models import CrimeReport
+
+from .tasks import record_report_for_hotspots
+
+
+@receiver(post_save, sender=CrimeReport)
+def count_report_for_hotspots(sender, instance, created, **kwargs):
+    if created and not instance.is_duplicate and instance.latitude is not None and instance.longitude is not None:
+        transaction.on_commit(lambda: record_report_for_hotspots.delay(instance.pk))
@@ -0,0 +1,22 @@
+import logging
+
+from celery import shared_task
+
+from reports.models import CrimeReport
+
+from .hotspots import record_report
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def record_report_for_hotspots(report_id):
+    """Add a new crime report to its cell's hotspot counters, raising a draft alert on a spike"""
+    report = CrimeReport.objects.filter(pk=report_id).first()
+    if report is None or report.is_duplicate:
+        # Hotspots count incidents, not every report of one
+        return 0
+    spikes = record_report(report)
+    if spikes:
+        logger.info(f"Report {report_id} set off {len(spikes)} hotspot counters in cell {spikes[0][0].cell}")
+    return len(spikes)
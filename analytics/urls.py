@@ -7,5 +7,6 @@ urlpatterns = [
     path('category-distribution/', views.crime_category_distribution, name='category_distribution'),
     path('trends-monthly/', views.crime_trends_monthly, name='trends_monthly'),
     path('trends-daily/', views.crime_trends_daily, name='trends_daily'),
+    path('by-area/', views.crime_by_area, name='by_area'),
     path('', views.analytics_dashboard_view, name='dashboard'),
 ]
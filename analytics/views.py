@@ -5,6 +5,8 @@ from django.db.models import Count
 from django.db.models.functions import TruncMonth, TruncDate
 from reports.models import CrimeReport # Assuming CrimeReport model is in reports app
 
+# Every chart counts incidents: duplicate reports of one incident are left out
+
 # Create your views here.
 
 @login_required
@@ -14,7 +16,7 @@ def crime_category_distribution(request):
         from django.core.exceptions import PermissionDenied
         raise PermissionDenied("You don't have permission to access analytics.")
     
-    category_data = CrimeReport.objects.values('category').annotate(count=Count('category')).order_by('category')
+    category_data = CrimeReport.objects.filter(is_duplicate=False).values('category').annotate(count=Count('category')).order_by('category')
     labels = [item['category'] for item in category_data]
     data = [item['count'] for item in category_data]
     return JsonResponse({'labels': labels, 'data': data})
@@ -26,7 +28,7 @@ def crime_trends_monthly(request):
         from django.core.exceptions import PermissionDenied
         raise PermissionDenied("You don't have permission to access analytics.")
     
-    monthly_data = CrimeReport.objects.annotate(month=TruncMonth('date_reported')).values('month').annotate(count=Count('id')).order_by('month')
+    monthly_data = CrimeReport.objects.filter(is_duplicate=False).annotate(month=TruncMonth('date_reported')).values('month').annotate(count=Count('id')).order_by('month')
     labels = [item['month'].strftime('%Y-%m') for item in monthly_data]
     data = [item['count'] for item in monthly_data]
     return JsonResponse({'labels': labels, 'data': data})
@@ -38,11 +40,24 @@ def crime_trends_daily(request):
         from django.core.exceptions import PermissionDenied
         raise PermissionDenied("You don't have permission to access analytics.")
     
-    daily_data = CrimeReport.objects.annotate(date=TruncDate('date_reported')).values('date').annotate(count=Count('id')).order_by('date')
+    daily_data = CrimeReport.objects.filter(is_duplicate=False).annotate(date=TruncDate('date_reported')).values('date').annotate(count=Count('id')).order_by('date')
     labels = [item['date'].strftime('%Y-%m-%d') for item in daily_data]
     data = [item['count'] for item in daily_data]
     return JsonResponse({'labels': labels, 'data': data})
 
+@login_required
+def crime_by_area(request):
+    # Check if user is admin
+    if not request.user.is_staff:
+        from django.core.exceptions import PermissionDenied
+        raise PermissionDenied("You don't have permission to access analytics.")
+    
+    # Grouped on the indexed area foreign key
+    area_data = CrimeReport.objects.filter(is_duplicate=False).values('area_id', 'area__name').annotate(count=Count('id')).order_by('-count')
+    labels = [item['area__name'] or 'Unassigned' for item in area_data]
+    data = [item['count'] for item in area_data]
+    return JsonResponse({'labels': labels, 'data': data})
+
 @login_required
 def analytics_dashboard_view(request):
     # Check if user is admin
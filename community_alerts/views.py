@@ -8,6 +8,7 @@ from django.core.paginator import Paginator
 from .models import Alert, AlertCategory, AlertReceipt
 from .forms import AlertForm
 from reports.tasks import send_sms_alert  # Reuse the existing SMS function
+from notifications.events import publish_event
 
 def is_staff_or_admin(user):
     """Check if user is staff, admin, or has special roles"""
@@ -220,6 +221,17 @@ def send_alert(request, pk):
         alert.is_sent = True
         alert.sent_at = timezone.now()
         alert.save()
+
+        # Push to open SSE streams
+        publish_event('alert', {
+            'id': alert.id,
+            'title': alert.title,
+            'content': alert.content,
+            'severity': alert.severity,
+            'category': alert.category.name,
+            'location': alert.location,
+            'sent_at': alert.sent_at.isoformat(),
+        })
         
         messages.success(request, f"Alert sent to {users_to_notify.count()} users.")
         return redirect('community_alerts:alert_detail', pk=alert.pk)
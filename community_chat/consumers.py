@@ -0,0 +1,77 @@
+import json
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from .events import CHAT_GROUP, serialize_message
+from .models import Message, MessageReaction
+
+CATCH_UP_LIMIT = 200
+
+
+class ChatConsumer(AsyncWebsocketConsumer):
+    """
+    Push chat deltas (new messages, deletions, reaction changes) to clients.
+
+    After (re)connecting, clients send {"action": "resume", "last_id": N} to
+    receive every message newer than N. If more than CATCH_UP_LIMIT messages
+    were missed the reply has "complete": false and the client should reload.
+    """
+
+    async def connect(self):
+        self.user = self.scope.get('user')
+        if not self.user or not self.user.is_authenticated:
+            await self.close()
+            return
+
+        # Join before catching up so no event falls in the gap
+        await self.channel_layer.group_add(CHAT_GROUP, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(CHAT_GROUP, self.channel_name)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            data = json.loads(text_data or '{}')
+        except ValueError:
+            return
+
+        if data.get('action') == 'resume':
+            try:
+                last_id = int(data.get('last_id') or 0)
+            except (TypeError, ValueError):
+                last_id = 0
+            messages, complete = await self.messages_since(last_id)
+            await self.send(text_data=json.dumps({
+                'type': 'resume',
+                'messages': messages,
+                'complete': complete,
+            }))
+
+    @database_sync_to_async
+    def messages_since(self, last_id):
+        """Messages newer than last_id, plus this user's reactions, in two queries"""
+        rows = list(
+            Message.objects.filter(id__gt=last_id, is_deleted=False)
+            .select_related('author')
+            .order_by('id')[:CATCH_UP_LIMIT + 1]
+        )
+        complete = len(rows) <= CATCH_UP_LIMIT
+        rows = rows[:CATCH_UP_LIMIT]
+        user_reacted_ids = set(MessageReaction.objects.filter(
+            user=self.user,
+            message_id__in=[msg.id for msg in rows],
+        ).values_list('message_id', flat=True))
+        return [
+            serialize_message(msg, msg.reaction_count, msg.id in user_reacted_ids)
+            for msg in rows
+        ], complete
+
+    async def chat_event(self, event):
+        data = dict(event['data'])
+        if event['event'] == 'reaction.changed':
+            # Only the reacting user's own sockets flip their "liked" state
+            liked = data.pop('liked')
+            data['user_reacted'] = liked if data.pop('user_id') == self.user.id else None
+        await self.send(text_data=json.dumps({'type': event['event'], **data}))
@@ -0,0 +1,47 @@
+"""
+Real-time chat events broadcast to connected ChatConsumer sockets.
+
+Events are small deltas rather than message lists:
+    message.created  - one new message, serialized in full
+    message.deleted  - {"id": ...}
+    reaction.changed - {"id": ..., "reaction_count": ..., "user_id": ..., "liked": ...}
+"""
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from media_assets.protected import protected_url
+
+CHAT_GROUP = 'community_chat'
+
+
+def serialize_message(msg, reaction_count=0, user_reacted=False):
+    """Serialize a message for the JSON feed and WebSocket events"""
+    return {
+        'id': msg.id,
+        'author': msg.author.username,
+        'author_id': msg.author_id,
+        'content': msg.content,
+        'timestamp': msg.timestamp.isoformat(),
+        'image_url': msg.image.url if msg.image else None,
+        'pdf_url': protected_url(msg, 'pdf') or None,
+        'video_url': protected_url(msg, 'video') or None,
+        'reaction_count': reaction_count,
+        'user_reacted': user_reacted,
+    }
+
+
+def broadcast(event, data):
+    """Send an event to every chat socket once the current transaction commits"""
+    def send():
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            CHAT_GROUP,
+            {
+                'type': 'chat.event',
+                'event': event,
+                'data': data,
+            }
+        )
+    transaction.on_commit(send)
@@ -1,9 +1,12 @@
 from django import forms
+from media_assets.forms import ChunkedUploadFormMixin
 from .models import Message
 
-class MessageForm(forms.ModelForm):
+class MessageForm(ChunkedUploadFormMixin, forms.ModelForm):
     """Form for posting messages with optional file attachments."""
 
+    chunked_upload_fields = ['image', 'pdf', 'video']
+
     class Meta:
         model = Message
         fields = ['content', 'image', 'pdf', 'video']
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.9 on 2026-10-19 05:25
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_reaction_counts(apps, schema_editor):
+    Message = apps.get_model('community_chat', 'Message')
+    MessageReaction = apps.get_model('community_chat', 'MessageReaction')
+    counts = (
+        MessageReaction.objects.filter(message=OuterRef('pk'))
+        .order_by()
+        .values('message')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Message.objects.update(reaction_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community_chat', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='reaction_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_reaction_counts, migrations.RunPython.noop),
+    ]
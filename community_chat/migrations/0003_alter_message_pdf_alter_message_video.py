@@ -0,0 +1,24 @@
+# Generated by Django 4.2.9 on 2026-10-19 05:39
+
+from django.db import migrations, models
+import media_assets.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community_chat', '0002_message_reaction_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='message',
+            name='pdf',
+            field=models.FileField(blank=True, null=True, storage=media_assets.storage.ContentAddressedStorage(blob_prefix='protected/'), upload_to='chat_pdfs/'),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='video',
+            field=models.FileField(blank=True, null=True, storage=media_assets.storage.ContentAddressedStorage(blob_prefix='protected/'), upload_to='chat_videos/'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from media_assets.storage import protected_storage
 
 class Message(models.Model):
     """Model for chat messages in the community chatboard."""
@@ -10,13 +11,16 @@ class Message(models.Model):
 
     # File attachments
     image = models.ImageField(upload_to='chat_images/', blank=True, null=True)
-    pdf = models.FileField(upload_to='chat_pdfs/', blank=True, null=True)
-    video = models.FileField(upload_to='chat_videos/', blank=True, null=True)
+    pdf = models.FileField(upload_to='chat_pdfs/', storage=protected_storage, blank=True, null=True)
+    video = models.FileField(upload_to='chat_videos/', storage=protected_storage, blank=True, null=True)
 
     # Metadata
     is_deleted = models.BooleanField(default=False)
     edited_at = models.DateTimeField(blank=True, null=True)
 
+    # Denormalized count of MessageReaction rows, maintained by toggle_reaction
+    reaction_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         ordering = ['timestamp']
         verbose_name = 'Message'
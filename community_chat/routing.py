@@ -0,0 +1,7 @@
+from django.urls import re_path
+
+from community_chat import consumers
+
+websocket_urlpatterns = [
+    re_path(r'ws/chat/', consumers.ChatConsumer.as_asgi()),
+]
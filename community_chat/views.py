@@ -4,9 +4,14 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from .models import Message, MessageReaction
 from .forms import MessageForm
+from .events import broadcast, serialize_message
+
+MESSAGE_FEED_LIMIT = 50
 
 @login_required
 def chatboard(request):
@@ -18,9 +23,16 @@ def chatboard(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
+    # One IN query for the current user's reactions on this page
+    user_reacted_ids = set(MessageReaction.objects.filter(
+        user=request.user,
+        message_id__in=[msg.id for msg in page_obj],
+    ).values_list('message_id', flat=True))
+
     context = {
         'page_obj': page_obj,
         'message_form': MessageForm(),
+        'user_reacted_ids': user_reacted_ids,
     }
     return render(request, 'community_chat/chatboard.html', context)
 
@@ -28,11 +40,12 @@ def chatboard(request):
 @require_POST
 def post_message(request):
     """Handle posting a new message with optional file attachments."""
-    form = MessageForm(request.POST, request.FILES)
+    form = MessageForm(request.POST, request.FILES, user=request.user)
     if form.is_valid():
         message = form.save(commit=False)
         message.author = request.user
         message.save()
+        broadcast('message.created', serialize_message(message))
         messages.success(request, 'Your message has been posted!')
         return redirect('community_chat:chatboard')
     else:
@@ -46,6 +59,7 @@ def delete_message(request, message_id):
     message = get_object_or_404(Message, id=message_id, author=request.user)
     message.is_deleted = True
     message.save()
+    broadcast('message.deleted', {'id': message.id})
     messages.success(request, 'Message deleted successfully.')
     return JsonResponse({'success': True})
 
@@ -54,21 +68,34 @@ def delete_message(request, message_id):
 def toggle_reaction(request, message_id):
     """Toggle like/unlike on a message."""
     message = get_object_or_404(Message, id=message_id)
-    reaction, created = MessageReaction.objects.get_or_create(
-        message=message,
-        user=request.user,
-        defaults={'reaction_type': 'like'}
-    )
 
-    if not created:
-        # User already reacted, remove the reaction
-        reaction.delete()
-        liked = False
-    else:
-        liked = True
+    with transaction.atomic():
+        reaction, created = MessageReaction.objects.get_or_create(
+            message=message,
+            user=request.user,
+            defaults={'reaction_type': 'like'}
+        )
 
-    # Get updated reaction count
-    reaction_count = message.reactions.count()
+        if created:
+            liked = True
+            delta = 1
+        else:
+            # User already reacted, remove the reaction
+            deleted, _ = MessageReaction.objects.filter(pk=reaction.pk).delete()
+            liked = False
+            delta = -deleted
+
+        # Keep the denormalized count in step without a read-modify-write race
+        if delta:
+            Message.objects.filter(pk=message.pk).update(reaction_count=F('reaction_count') + delta)
+        reaction_count = Message.objects.values_list('reaction_count', flat=True).get(pk=message.pk)
+
+    broadcast('reaction.changed', {
+        'id': message.id,
+        'reaction_count': reaction_count,
+        'user_id': request.user.id,
+        'liked': liked,
+    })
 
     return JsonResponse({
         'success': True,
@@ -78,30 +105,40 @@ def toggle_reaction(request, message_id):
 
 @login_required
 def get_messages(request):
-    """API endpoint to fetch messages (for AJAX updates)."""
-    since = request.GET.get('since')
-    if since:
-        messages_list = Message.objects.filter(
-            is_deleted=False,
-            timestamp__gt=since
-        ).select_related('author').order_by('timestamp')
+    """API endpoint to fetch messages (for AJAX updates).
+
+    Pass ``after=<id>`` for messages newer than a known id, or ``before=<id>``
+    to page backwards through history. The response includes ``last_id`` and
+    ``first_id`` cursors for the next request.
+    """
+    messages_list = Message.objects.filter(is_deleted=False).select_related('author')
+    try:
+        after = int(request.GET.get('after', 0))
+        before = int(request.GET.get('before', 0))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor'}, status=400)
+
+    if after:
+        messages_list = list(messages_list.filter(id__gt=after).order_by('id')[:MESSAGE_FEED_LIMIT])
     else:
-        messages_list = Message.objects.filter(
-            is_deleted=False
-        ).select_related('author').order_by('-timestamp')[:50]
-
-    messages_data = []
-    for msg in messages_list:
-        messages_data.append({
-            'id': msg.id,
-            'author': msg.author.username,
-            'content': msg.content,
-            'timestamp': msg.timestamp.isoformat(),
-            'image_url': msg.image.url if msg.image else None,
-            'pdf_url': msg.pdf.url if msg.pdf else None,
-            'video_url': msg.video.url if msg.video else None,
-            'reaction_count': msg.reactions.count(),
-            'user_reacted': msg.reactions.filter(user=request.user).exists(),
-        })
-
-    return JsonResponse({'messages': messages_data})
\ No newline at end of file
+        if before:
+            messages_list = messages_list.filter(id__lt=before)
+        messages_list = list(messages_list.order_by('-id')[:MESSAGE_FEED_LIMIT])
+
+    # One IN query for the current user's reactions instead of one per message
+    user_reacted_ids = set(MessageReaction.objects.filter(
+        user=request.user,
+        message_id__in=[msg.id for msg in messages_list],
+    ).values_list('message_id', flat=True))
+
+    messages_data = [
+        serialize_message(msg, msg.reaction_count, msg.id in user_reacted_ids)
+        for msg in messages_list
+    ]
+    ids = [msg.id for msg in messages_list]
+
+    return JsonResponse({
+        'messages': messages_data,
+        'first_id': min(ids) if ids else None,
+        'last_id': max(ids) if ids else after or None,
+    })
@@ -0,0 +1,129 @@
+"""
+Buffered page-view counters.
+
+A detail page view is one HINCRBY on a per-model Redis hash (listing id ->
+views since the last flush) instead of a save of the whole listing row.
+counters.tasks.flush_view_counts periodically swaps each hash out with an
+atomic RENAME and applies the deltas with bulk
+UPDATE ... SET view_count = view_count + delta statements, one per distinct
+delta. The snapshot is deleted from Redis before the database write and
+added back to the live hash if that write fails, so a flush is never
+applied twice. When no Redis cache is configured, or Redis is unreachable, the view
+is written straight through as a single-column F() update instead.
+"""
+
+import logging
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError
+from django.db import transaction
+from django.db.models import F
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+COUNTER_CACHE = getattr(settings, 'VIEW_COUNTER_CACHE', 'counters')
+KEY_PREFIX = 'views:'
+FLUSH_BATCH_SIZE = 500
+
+# Models with a view_count column whose views are buffered
+COUNTED_MODELS = [
+    'isell.SaleItem',
+    'iwanttobuy.BuyRequest',
+    'services.ServiceListing',
+]
+
+
+def get_redis():
+    """Raw Redis connection behind the counter cache, or None when it is not Redis"""
+    try:
+        return get_redis_connection(COUNTER_CACHE)
+    except (InvalidCacheBackendError, NotImplementedError):
+        return None
+
+
+def counter_key(label):
+    return f"{KEY_PREFIX}{label}"
+
+
+def write_through(model, pk, count=1):
+    model._default_manager.filter(pk=pk).update(view_count=F('view_count') + count)
+
+
+def record_view(instance):
+    """Count one view of `instance` without writing its row"""
+    redis = get_redis()
+    if redis is not None:
+        try:
+            redis.hincrby(counter_key(instance._meta.label), instance.pk, 1)
+        except RedisError as e:
+            logger.warning(f"Could not buffer view of {instance._meta.label} {instance.pk}: {e}")
+            redis = None
+    if redis is None:
+        write_through(type(instance), instance.pk)
+
+    # Show the view just counted without re-reading the row
+    instance.view_count += 1
+
+
+def flush_model(redis, model):
+    """Apply the buffered views of one model; returns the number of views written"""
+    key = counter_key(model._meta.label)
+    flushing = f"{key}:flushing"
+    if not redis.exists(flushing):
+        # A snapshot still present was never read by the last flush; apply it first
+        if not redis.exists(key):
+            return 0
+        # New views go to a fresh hash from here on
+        redis.rename(key, flushing)
+
+    # Take the snapshot out of Redis before writing, so no retry can apply it a second time
+    snapshot = redis.hgetall(flushing)
+    redis.delete(flushing)
+
+    by_delta = defaultdict(list)
+    for pk, count in snapshot.items():
+        by_delta[int(count)].append(int(pk))
+
+    try:
+        with transaction.atomic():
+            for delta, pks in by_delta.items():
+                for start in range(0, len(pks), FLUSH_BATCH_SIZE):
+                    model._default_manager.filter(pk__in=pks[start:start + FLUSH_BATCH_SIZE]).update(
+                        view_count=F('view_count') + delta
+                    )
+    except Exception:
+        restore_snapshot(redis, key, snapshot)
+        raise
+    return sum(delta * len(pks) for delta, pks in by_delta.items())
+
+
+def restore_snapshot(redis, key, snapshot):
+    """Add the views of a snapshot that failed to flush back onto the live hash"""
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for pk, count in snapshot.items():
+            pipe.hincrby(key, pk, int(count))
+        pipe.execute()
+    except RedisError as e:
+        logger.error(f"Lost {len(snapshot)} buffered view counts for {key}: {e}")
+
+
+def flush_view_counts():
+    """Write every buffered view to the database; returns {label: views written}"""
+    redis = get_redis()
+    if redis is None:
+        return {}
+
+    flushed = {}
+    for label in COUNTED_MODELS:
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            # App not installed in this deployment
+            continue
+        flushed[label] = flush_model(redis, model)
+    return flushed
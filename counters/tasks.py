@@ -0,0 +1,17 @@
+import logging
+
+from celery import shared_task
+
+from .buffer import flush_view_counts as flush_buffered_views
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_view_counts():
+    """Write page views buffered in Redis to the listings' view_count columns"""
+    flushed = flush_buffered_views()
+    total = sum(flushed.values())
+    if total:
+        logger.info(f"Flushed {total} buffered views: {flushed}")
+    return total
@@ -9,19 +9,24 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cpfcrimereportingsystem.settings')
+
+# Initialize Django before importing consumers so they can use models
+django_asgi_app = get_asgi_application()
+
 from channels.auth import AuthMiddlewareStack
 from channels.routing import ProtocolTypeRouter, URLRouter
-from django.core.asgi import get_asgi_application
 
+from community_chat import routing as chat_routing
 from dashboard import routing
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cpfcrimereportingsystem.settings')
-
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
         URLRouter(
-            routing.websocket_urlpatterns
+            routing.websocket_urlpatterns + chat_routing.websocket_urlpatterns
         )
     ),
 })
@@ -25,6 +25,76 @@ app.conf.beat_schedule = {
         'schedule': crontab(day_of_month='1', hour='6', minute='0'),
         'args': (),
     },
+
+    # Purge old Server-Sent Events replay history every night at 3:00 AM
+    'purge-stream-events': {
+        'task': 'notifications.tasks.purge_stream_events',
+        'schedule': crontab(hour='3', minute='0'),
+        'args': (),
+    },
+
+    # Clean up abandoned and unclaimed chunked uploads every hour
+    'purge-chunked-uploads': {
+        'task': 'media_assets.tasks.purge_chunked_uploads',
+        'schedule': crontab(minute='30'),
+        'args': (),
+    },
+
+    # Drop derivatives of images nothing points at any more, before the collector runs
+    'purge-orphaned-derivatives': {
+        'task': 'media_assets.tasks.purge_orphaned_derivatives',
+        'schedule': crontab(hour='3', minute='45'),
+        'args': (),
+    },
+
+    # Recount media blob references and delete unreferenced blobs every night at 4:00 AM
+    'collect-media-blobs': {
+        'task': 'media_assets.tasks.collect_media_blobs',
+        'schedule': crontab(hour='4', minute='0'),
+        'kwargs': {'recount': True},
+    },
+
+    # Write page views buffered in Redis to the listing tables every minute
+    'flush-view-counts': {
+        'task': 'counters.tasks.flush_view_counts',
+        'schedule': crontab(minute='*'),
+        'args': (),
+    },
+
+    # Re-render the crime map density tiles every night at 1:30 AM, ageing out old reports
+    'rebuild-heatmap-tiles': {
+        'task': 'reports.tasks.rebuild_heatmap_tiles',
+        'schedule': crontab(hour='1', minute='30'),
+        'args': (),
+    },
+
+    # Recompute "similar listings" recommendations every night at 2:30 AM
+    'compute-similar-listings': {
+        'task': 'search.tasks.compute_similar_listing_recommendations',
+        'schedule': crontab(hour='2', minute='30'),
+        'args': (),
+    },
+
+    # Expire marketplace listings past their expiry date every hour
+    'expire-marketplace-listings': {
+        'task': 'marketplace.tasks.expire_marketplace_listings',
+        'schedule': crontab(minute='5'),
+        'args': (),
+    },
+
+    # Release the uploads of listings removed more than 30 days ago every night at 3:30 AM
+    'purge-removed-listing-uploads': {
+        'task': 'marketplace.tasks.purge_removed_listing_uploads',
+        'schedule': crontab(hour='3', minute='30'),
+        'args': (),
+    },
+
+    # Reload the marketplace matching index hourly, catching changes made without signals
+    'rebuild-matching-index': {
+        'task': 'matching.tasks.rebuild_matching_index',
+        'schedule': crontab(minute='15'),
+        'args': (),
+    },
     
     # For testing purposes - uncomment to run every minute
     # 'test-crime-report': {
@@ -14,6 +14,7 @@ from pathlib import Path
 import os
 import sys
 from django.core.management.utils import get_random_secret_key
+from kombu import Exchange, Queue
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -39,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Project apps
     'accounts',
@@ -50,6 +52,13 @@ INSTALLED_APPS = [
     'community_chat',
     'kingspark_events',
     'community_alerts',
+    'media_assets',
+    'search',
+    'counters',
+    'matching',
+    'marketplace',
+    'inbox',
+    'geocoding',
     
     # Third-party apps
     'channels',  # For real-time features
@@ -148,7 +157,17 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
         'LOCATION': 'cache_table',
-    }
+    },
+    # Page-view counters buffered in Redis (see counters.buffer); no Hiredis parser
+    'counters': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': f"redis://{os.environ.get('REDIS_HOST', 'redis')}:{os.environ.get('REDIS_PORT', '6379')}/{os.environ.get('REDIS_COUNTER_DB', '2')}",
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SOCKET_CONNECT_TIMEOUT': 1,
+            'SOCKET_TIMEOUT': 1,
+        }
+    },
 }
 
 # Cache session if Redis is available
@@ -199,6 +218,23 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = '/app/media'
 
+# Store each distinct uploaded file once, under its SHA-256 digest (see media_assets.storage)
+DEFAULT_FILE_STORAGE = 'media_assets.storage.ContentAddressedStorage'
+
+# Documents and videos are served by media_assets.views.protected_media; behind
+# nginx the file transfer is handed off with X-Accel-Redirect
+PROTECTED_MEDIA_X_ACCEL_REDIRECT = not DEBUG
+
+# Resized WebP copies generated for uploaded images (see media_assets)
+MEDIA_DERIVATIVE_WIDTHS = [320, 640, 1280]
+MEDIA_DERIVATIVE_FORMAT = 'webp'
+MEDIA_DERIVATIVE_QUALITY = 80
+
+# Resumable chunked uploads for large media (see media_assets.uploads)
+CHUNKED_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+CHUNKED_UPLOAD_MAX_SIZE = 100 * 1024 * 1024
+CHUNKED_UPLOAD_EXPIRY_HOURS = 24
+
 # Use ManifestStaticFilesStorage in production for cache busting
 if not DEBUG:
     STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
@@ -238,6 +274,40 @@ CELERY_TASK_ACKS_LATE = True  # Only acknowledge tasks after they are done
 CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # Do not prefetch tasks
 CELERY_TASK_REJECT_ON_WORKER_LOST = True  # Reject lost tasks
 
+# CELERY QUEUES & ROUTING
+# Each workload class gets its own queue so a slow PDF build can never sit in
+# front of an urgent SMS. Run one worker pool per queue (see docker-compose.yml):
+#   alerts  - IO bound, threads pool, high concurrency
+#   email   - IO bound, threads pool
+#   reports - CPU bound (PDF/chart rendering, image resizing), prefork pool, low concurrency
+#   matching - marketplace matching; ONE solo process, as it owns the in-memory index
+# With the Redis broker a LOWER number means a HIGHER priority.
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_TASK_QUEUES = (
+    Queue('alerts', Exchange('alerts'), routing_key='alerts'),
+    Queue('email', Exchange('email'), routing_key='email'),
+    Queue('reports', Exchange('reports'), routing_key='reports'),
+    Queue('matching', Exchange('matching'), routing_key='matching'),
+    Queue('default', Exchange('default'), routing_key='default'),
+)
+CELERY_TASK_ROUTES = {
+    'reports.tasks.send_sms_alert': {'queue': 'alerts', 'priority': 0},
+    'reports.tasks.queue_latency_probe': {'queue': 'alerts', 'priority': 0},
+    'reports.tasks.send_monthly_report_email': {'queue': 'email', 'priority': 3},
+    'reports.tasks.generate_monthly_crime_report': {'queue': 'reports', 'priority': 9},
+    'media_assets.tasks.generate_image_derivatives': {'queue': 'reports', 'priority': 7},
+    'search.tasks.compute_similar_listing_recommendations': {'queue': 'reports', 'priority': 9},
+    'reports.tasks.render_heatmap_tiles': {'queue': 'reports', 'priority': 5},
+    'reports.tasks.rebuild_heatmap_tiles': {'queue': 'reports', 'priority': 9},
+    'matching.tasks.*': {'queue': 'matching', 'priority': 5},
+}
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+
 # CELERY BEAT SCHEDULER
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
@@ -258,6 +328,14 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Single-process in-memory layer for local benchmarking without Redis
+if os.environ.get('CHANNEL_LAYER') == 'memory':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
+
 # Logging configuration
 LOGGING = {
     'version': 1,
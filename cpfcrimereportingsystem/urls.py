@@ -42,6 +42,10 @@ urlpatterns = [
     path('iwanttobuy/', include('iwanttobuy.urls', namespace='iwanttobuy')),
     path('services/', include('services.urls', namespace='services')),
     path('alerts/', include('community_alerts.urls', namespace='community_alerts')),
+    path('notifications/', include('notifications.urls', namespace='notifications')),
+    path('', include('media_assets.urls', namespace='media_assets')),
+    path('search/', include('search.urls', namespace='search')),
+    path('inbox/', include('inbox.urls', namespace='inbox')),
     
     # Static pages
     path('about/', views.about, name='about'),
@@ -1,34 +1,140 @@
 import json
-from channels.generic.websocket import WebsocketConsumer
-from asgiref.sync import async_to_sync
-
-class CrimeAlertConsumer(WebsocketConsumer):
-    def connect(self):
-        self.room_name = 'crime_alerts'
-        self.room_group_name = 'crime_alerts'
-
-        # Join room group
-        async_to_sync(self.channel_layer.group_add)(
-            self.room_group_name,
-            self.channel_name
-        )
-        self.accept()
-
-    def disconnect(self, close_code):
-        # Leave room group
-        async_to_sync(self.channel_layer.group_discard)(
-            self.room_group_name,
-            self.channel_name
-        )
-
-    def receive(self, text_data):
-        # We don't expect to receive messages from the client in this consumer
-        pass
-
-    def send_alert(self, event):
-        message = event['message']
+import math
+import re
+
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from reports.geo import cell_key, cells_within, distance_km, parse_cell_key
+
+ALL = 'all'
+GROUP_PREFIX = 'crime_alerts'
+MAX_SUBSCRIPTION_GROUPS = 100
+MAX_RADIUS_KM = 5.0
+CATEGORY_PATTERN = re.compile(r'^[A-Z_]{1,50}$')
+
+
+def alert_group_name(cell=ALL, category=ALL):
+    """Channel layer group for one (area cell, crime category) pair"""
+    return f"{GROUP_PREFIX}.{cell or ALL}.{category or ALL}"
+
+
+def alert_groups_for(cell, category):
+    """All groups that should receive an alert for a report in this cell and category"""
+    cells = [cell, ALL] if cell else [ALL]
+    return [alert_group_name(c, cat) for c in cells for cat in (category, ALL)]
+
+
+class CrimeAlertConsumer(AsyncWebsocketConsumer):
+    """
+    Push crime alerts to clients subscribed to area cells and categories.
+
+    Clients start with no subscription and send:
+        {"action": "subscribe", "lat": -25.3, "lng": 28.6, "radius_km": 2, "categories": ["THEFT"]}
+        {"action": "subscribe", "cells": ["-2538_2860"], "categories": []}
+        {"action": "subscribe"}  (every area, every category)
+        {"action": "unsubscribe"}
+
+    Each client joins exactly one group per (cell, category) combination, so
+    an alert is never delivered twice to the same socket.
+    """
+
+    async def connect(self):
+        self.subscribed_groups = set()
+        self.center = None
+        self.radius_km = None
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        # Leave all subscribed groups
+        await self.set_groups(set())
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            data = json.loads(text_data or '{}')
+        except ValueError:
+            await self.send_error('Invalid JSON')
+            return
+        if not isinstance(data, dict):
+            await self.send_error('Expected a JSON object')
+            return
+
+        action = data.get('action')
+        if action == 'subscribe':
+            await self.subscribe(data)
+        elif action == 'unsubscribe':
+            self.center = self.radius_km = None
+            await self.set_groups(set())
+            await self.send(text_data=json.dumps({'type': 'unsubscribed'}))
+        else:
+            await self.send_error(f'Unknown action: {action}')
+
+    async def subscribe(self, data):
+        categories = data.get('categories') or [ALL]
+        if not isinstance(categories, list):
+            await self.send_error('Invalid category')
+            return
+        if ALL in categories:
+            categories = [ALL]
+        if not all(isinstance(c, str) and CATEGORY_PATTERN.match(c) for c in categories if c != ALL):
+            await self.send_error('Invalid category')
+            return
+
+        center = radius_km = None
+        try:
+            if data.get('lat') is not None and data.get('lng') is not None:
+                center = (float(data['lat']), float(data['lng']))
+                radius_km = float(data.get('radius_km', 1))
+                # NaN and infinity pass float() but would break the cell arithmetic
+                if not all(math.isfinite(value) for value in (*center, radius_km)) or radius_km <= 0:
+                    raise ValueError('area out of range')
+                radius_km = min(radius_km, MAX_RADIUS_KM)
+                cells = cells_within(center[0], center[1], radius_km)
+            elif data.get('cells') and ALL not in data['cells']:
+                if not isinstance(data['cells'], list):
+                    raise TypeError('cells must be a list')
+                cells = [cell_key(*parse_cell_key(c)) for c in data['cells']]
+            else:
+                cells = [ALL]
+        except (TypeError, ValueError, OverflowError):
+            await self.send_error('Invalid area')
+            return
+
+        groups = {alert_group_name(cell, category) for cell in cells for category in categories}
+        if len(groups) > MAX_SUBSCRIPTION_GROUPS:
+            await self.send_error('Subscription too large; use fewer cells or categories')
+            return
+
+        self.center, self.radius_km = center, radius_km
+        await self.set_groups(groups)
+        await self.send(text_data=json.dumps({
+            'type': 'subscribed',
+            'cells': cells,
+            'categories': categories,
+        }))
+
+    async def set_groups(self, groups):
+        """Move this socket from its current groups to exactly `groups`"""
+        for group in self.subscribed_groups - groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
+        for group in groups - self.subscribed_groups:
+            await self.channel_layer.group_add(group, self.channel_name)
+        self.subscribed_groups = groups
+
+    async def send_error(self, error):
+        await self.send(text_data=json.dumps({'type': 'error', 'error': error}))
+
+    async def send_alert(self, event):
+        alert = event.get('alert', {})
+
+        # Cells cover the bounding box; trim to the requested circle
+        if self.center and alert.get('latitude') is not None and alert.get('longitude') is not None:
+            distance = distance_km(self.center[0], self.center[1], alert['latitude'], alert['longitude'])
+            if distance > self.radius_km:
+                return
 
         # Send message to WebSocket
-        self.send(text_data=json.dumps({
-            'message': message
+        await self.send(text_data=json.dumps({
+            'type': 'alert',
+            'message': event['message'],
+            'alert': alert,
         }))
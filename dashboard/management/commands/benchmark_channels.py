@@ -0,0 +1,217 @@
+import asyncio
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from channels.layers import DEFAULT_CHANNEL_LAYER, channel_layers
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from community_chat import routing as chat_routing
+from community_chat.events import CHAT_GROUP
+from dashboard import routing
+from dashboard.consumers import alert_groups_for
+
+User = get_user_model()
+
+
+class BenchmarkUserMiddleware:
+    """Put a fixed authenticated user in the scope instead of using sessions"""
+
+    def __init__(self, app, user):
+        self.app = app
+        self.user = user
+
+    async def __call__(self, scope, receive, send):
+        return await self.app(dict(scope, user=self.user), receive, send)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark WebSocket fan-out through CrimeAlertConsumer and ChatConsumer'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--consumer',
+            choices=['alerts', 'chat'],
+            default='alerts',
+            help='Which consumer to benchmark'
+        )
+
+        parser.add_argument(
+            '--clients',
+            type=int,
+            default=500,
+            help='Number of simulated WebSocket clients'
+        )
+
+        parser.add_argument(
+            '--bursts',
+            type=int,
+            default=5,
+            help='Number of publish bursts'
+        )
+
+        parser.add_argument(
+            '--burst-size',
+            type=int,
+            default=20,
+            help='Events published per burst'
+        )
+
+        parser.add_argument(
+            '--cells',
+            type=int,
+            default=10,
+            help='Alerts only: number of area cells clients are spread across'
+        )
+
+        parser.add_argument(
+            '--layer',
+            choices=['memory', 'redis'],
+            default='memory',
+            help='Channel layer to run against'
+        )
+
+        parser.add_argument(
+            '--redis-url',
+            default='redis://localhost:6379/0',
+            help='Redis URL for --layer redis (e.g. a local redis-server)'
+        )
+
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=10.0,
+            help='Seconds to wait for each delivery'
+        )
+
+    def handle(self, *args, **options):
+        capacity = max(1000, options['bursts'] * options['burst_size'] * 2)
+        if options['layer'] == 'memory':
+            from channels.layers import InMemoryChannelLayer
+            layer = InMemoryChannelLayer(capacity=capacity)
+        else:
+            try:
+                from channels_redis.core import RedisChannelLayer
+            except ImportError:
+                raise CommandError('channels_redis is required for --layer redis')
+            layer = RedisChannelLayer(hosts=[options['redis_url']], capacity=capacity)
+
+        previous = channel_layers.set(DEFAULT_CHANNEL_LAYER, layer)
+        try:
+            results = asyncio.run(self.run(layer, options))
+        finally:
+            channel_layers.set(DEFAULT_CHANNEL_LAYER, previous)
+
+        self.report(results, options)
+
+    async def run(self, layer, options):
+        application = BenchmarkUserMiddleware(
+            URLRouter(routing.websocket_urlpatterns + chat_routing.websocket_urlpatterns),
+            User(id=0, username='benchmark'),
+        )
+        is_chat = options['consumer'] == 'chat'
+        path = '/ws/chat/' if is_chat else '/ws/crime_alerts/'
+        cells = [f"{-2530 - i}_2860" for i in range(max(1, options['cells']))]
+
+        # Connect clients and measure the memory they hold
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        clients = []
+        client_cells = []
+        for i in range(options['clients']):
+            communicator = WebsocketCommunicator(application, path)
+            connected, _ = await communicator.connect()
+            if not connected:
+                raise CommandError(f'Client {i} could not connect to {path}')
+            if not is_chat:
+                cell = cells[i % len(cells)]
+                await communicator.send_json_to({'action': 'subscribe', 'cells': [cell]})
+                await communicator.receive_json_from(timeout=options['timeout'])
+                client_cells.append(cell)
+            clients.append(communicator)
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        latencies = []
+        delivered = 0
+        started = time.perf_counter()
+        for _ in range(options['bursts']):
+            expected = [0] * len(clients)
+            for _ in range(options['burst_size']):
+                sent_at = time.perf_counter()
+                if is_chat:
+                    await layer.group_send(CHAT_GROUP, {
+                        'type': 'chat.event',
+                        'event': 'message.deleted',
+                        'data': {'id': 0, 'sent_at': sent_at},
+                    })
+                    expected = [count + 1 for count in expected]
+                else:
+                    cell = random.choice(cells)
+                    event = {
+                        'type': 'send_alert',
+                        'message': 'Benchmark alert',
+                        'alert': {'cell': cell, 'category': 'THEFT', 'sent_at': sent_at},
+                    }
+                    for group in alert_groups_for(cell, 'THEFT'):
+                        await layer.group_send(group, event)
+                    expected = [
+                        count + (client_cells[i] == cell)
+                        for i, count in enumerate(expected)
+                    ]
+
+            burst_latencies = await asyncio.gather(*[
+                self.drain(communicator, count, options['timeout'], is_chat)
+                for communicator, count in zip(clients, expected)
+            ])
+            for client_latencies in burst_latencies:
+                latencies.extend(client_latencies)
+                delivered += len(client_latencies)
+        elapsed = time.perf_counter() - started
+
+        for communicator in clients:
+            await communicator.disconnect()
+
+        return {
+            'latencies': latencies,
+            'delivered': delivered,
+            'elapsed': elapsed,
+            'memory_per_client': (after - before) / max(1, len(clients)),
+        }
+
+    async def drain(self, communicator, count, timeout, is_chat):
+        """Receive `count` events from one client and return their latencies"""
+        latencies = []
+        for _ in range(count):
+            try:
+                payload = json.loads(await communicator.receive_from(timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+            sent_at = payload['sent_at'] if is_chat else payload['alert']['sent_at']
+            latencies.append(time.perf_counter() - sent_at)
+        return latencies
+
+    def report(self, results, options):
+        latencies = sorted(results['latencies'])
+        self.stdout.write(self.style.NOTICE(
+            f"{options['consumer']} consumer, {options['layer']} layer, "
+            f"{options['clients']} clients, {options['bursts']}x{options['burst_size']} events"
+        ))
+        if not latencies:
+            self.stdout.write(self.style.ERROR('No events were delivered'))
+            return
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(f"Delivered: {results['delivered']} messages in {results['elapsed']:.2f}s "
+                          f"({results['delivered'] / results['elapsed']:.0f} msg/s)")
+        self.stdout.write(f"Latency: p50={percentile(0.50):.2f}ms p95={percentile(0.95):.2f}ms "
+                          f"p99={percentile(0.99):.2f}ms max={latencies[-1] * 1000:.2f}ms "
+                          f"mean={statistics.mean(latencies) * 1000:.2f}ms")
+        self.stdout.write(f"Memory per connection: {results['memory_per_client'] / 1024:.1f} KiB")
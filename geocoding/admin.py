@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import Area, GazetteerEntry
+
+
+@admin.register(GazetteerEntry)
+class GazetteerEntryAdmin(admin.ModelAdmin):
+    list_display = ['name', 'kind', 'latitude', 'longitude', 'aliases', 'is_active', 'updated_at']
+    list_filter = ['kind', 'is_active']
+    search_fields = ['name', 'aliases']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(Area)
+class AreaAdmin(admin.ModelAdmin):
+    list_display = ['name', 'code', 'kind', 'is_active', 'updated_at']
+    list_filter = ['kind', 'is_active']
+    search_fields = ['name', 'code']
+    readonly_fields = ['min_latitude', 'max_latitude', 'min_longitude', 'max_longitude', 'updated_at']
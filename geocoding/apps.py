@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+class GeocodingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'geocoding'
+    verbose_name = 'Offline Geocoding'
+
+    def ready(self):
+        import geocoding.signals  # Import signals here
@@ -0,0 +1,129 @@
+"""
+Point-in-area lookup for ward and patrol sector boundaries.
+
+Area bounding boxes are packed into an in-process R-tree (Sort-Tile-
+Recursive bulk loading, NODE_CAPACITY entries per node). Looking up a
+point descends only into nodes whose box contains it, and the few areas
+left are confirmed with an exact ray-casting point-in-polygon test that
+honours holes and multipolygons. The tree is rebuilt when the boundaries
+change, the same way the gazetteer is (see geocoding.versioned).
+"""
+
+import math
+
+from .versioned import VersionedIndex
+
+NODE_CAPACITY = 8
+VERSION_KEY = 'geocoding:areas_version'
+
+
+def point_in_ring(x, y, ring):
+    """Ray casting: whether (x, y) lies inside a closed ring of [x, y] points"""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def point_in_polygons(x, y, polygons):
+    """Whether (x, y) is inside a MultiPolygon: in some outer ring and none of its holes"""
+    for outer, *holes in polygons:
+        if point_in_ring(x, y, outer) and not any(point_in_ring(x, y, hole) for hole in holes):
+            return True
+    return False
+
+
+class Node:
+    __slots__ = ['box', 'children', 'leaf']
+
+    def __init__(self, children, leaf):
+        self.children = children
+        self.leaf = leaf
+        boxes = [child[0] if leaf else child.box for child in children]
+        self.box = (
+            min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes),
+        )
+
+
+def box_contains(box, x, y):
+    return box[0] <= x <= box[2] and box[1] <= y <= box[3]
+
+
+def pack(items, leaf):
+    """One level of Sort-Tile-Recursive packing: sort by x into slices, each slice by y into nodes"""
+    boxes = [item[0] if leaf else item.box for item in items]
+    order = sorted(range(len(items)), key=lambda i: (boxes[i][0] + boxes[i][2]) / 2)
+    node_count = math.ceil(len(items) / NODE_CAPACITY)
+    slice_size = NODE_CAPACITY * math.ceil(math.sqrt(node_count))
+    nodes = []
+    for start in range(0, len(order), slice_size):
+        vertical_slice = sorted(order[start:start + slice_size], key=lambda i: (boxes[i][1] + boxes[i][3]) / 2)
+        for node_start in range(0, len(vertical_slice), NODE_CAPACITY):
+            nodes.append(Node([items[i] for i in vertical_slice[node_start:node_start + NODE_CAPACITY]], leaf))
+    return nodes
+
+
+class AreaIndex:
+    """R-tree over area bounding boxes, with exact polygon tests at the leaves"""
+
+    def __init__(self, areas):
+        # areas: iterable of (area id, (min_x, min_y, max_x, max_y), polygons)
+        entries = [(box, (area_id, polygons)) for area_id, box, polygons in areas]
+        self.root = None
+        if not entries:
+            return
+        level = pack(entries, leaf=True)
+        while len(level) > 1:
+            level = pack(level, leaf=False)
+        self.root = level[0]
+
+    def locate(self, latitude, longitude):
+        """Id of the area containing a point, or None"""
+        if self.root is None or latitude is None or longitude is None:
+            return None
+        x, y = float(longitude), float(latitude)
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not box_contains(node.box, x, y):
+                continue
+            if not node.leaf:
+                stack.extend(node.children)
+                continue
+            for box, (area_id, polygons) in node.children:
+                if box_contains(box, x, y) and point_in_polygons(x, y, polygons):
+                    return area_id
+        return None
+
+
+def load_index():
+    from .models import Area
+
+    rows = Area.objects.filter(is_active=True).values_list(
+        'id', 'min_longitude', 'min_latitude', 'max_longitude', 'max_latitude', 'polygons'
+    )
+    return AreaIndex((row[0], row[1:5], row[5]) for row in rows)
+
+
+_index = VersionedIndex(VERSION_KEY, load_index)
+
+
+def invalidate_areas():
+    _index.invalidate()
+
+
+def get_area_index():
+    """The process-wide index, reloaded after the boundaries change"""
+    index, _ = _index.get()
+    return index
+
+
+def area_for(latitude, longitude):
+    """Id of the active area containing a coordinate, or None"""
+    return get_area_index().locate(latitude, longitude)
@@ -0,0 +1,207 @@
+"""
+Offline geocoder for the free-text locations people type into reports,
+listings and events.
+
+Place names from the local gazetteer (GazetteerEntry rows) are normalized
+into token sequences and loaded into two in-memory indexes:
+
+- a token trie, which finds every exact mention of a known name anywhere in
+  a text in one pass over its tokens ("next to the clinic on Mahlangu St");
+- a character-trigram index, which shortlists near-misses of a phrase
+  ("Kwamlanga", "kings prk") for a final difflib similarity check.
+
+The most specific place mentioned wins (a landmark over a street over a
+section over a town). Results are memoized per normalized text, in process
+and in the shared cache, and no network access is ever needed.
+"""
+
+import hashlib
+import re
+from collections import Counter, OrderedDict, namedtuple
+from difflib import SequenceMatcher
+
+from django.core.cache import cache
+
+from .versioned import VersionedIndex
+
+GeocodeResult = namedtuple('GeocodeResult', ['latitude', 'longitude', 'name', 'kind', 'score'])
+
+FUZZY_THRESHOLD = 0.85
+MIN_TRIGRAM_OVERLAP = 0.5
+MEMO_SIZE = 10000
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+VERSION_KEY = 'geocoding:gazetteer_version'
+
+# More specific places first
+KIND_RANK = {'landmark': 0, 'street': 1, 'section': 2, 'suburb': 3, 'town': 4}
+
+ABBREVIATIONS = {
+    'st': 'street', 'str': 'street', 'rd': 'road', 'ave': 'avenue', 'av': 'avenue', 'dr': 'drive',
+    'cres': 'crescent', 'cnr': 'corner', 'ext': 'extension', 'sect': 'section', 'stn': 'station',
+    'hosp': 'hospital', 'sch': 'school', 'mt': 'mount',
+}
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+END = object()
+MISS = ''
+
+
+def normalize(text):
+    """Lower-case tokens with punctuation dropped and street abbreviations expanded"""
+    return tuple(ABBREVIATIONS.get(token, token) for token in TOKEN_RE.findall((text or '').lower()))
+
+
+def trigrams(phrase):
+    padded = f"  {phrase} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    """Trie and trigram indexes over a fixed set of place names"""
+
+    def __init__(self, entries):
+        # entries: iterable of (names, latitude, longitude, kind, display name)
+        self.places = []
+        self.trie = {}
+        self.trigram_postings = {}
+        self.phrases = []
+        self.max_tokens = 1
+        self.memo = OrderedDict()
+
+        for names, latitude, longitude, kind, display_name in entries:
+            place_id = len(self.places)
+            self.places.append((float(latitude), float(longitude), kind, display_name))
+            for name in names:
+                tokens = normalize(name)
+                if not tokens:
+                    continue
+                self.add_to_trie(tokens, place_id)
+                self.add_phrase(' '.join(tokens), place_id)
+                # "Kwa Mhlanga" and "KwaMhlanga" are the same place
+                if len(tokens) > 1:
+                    self.add_phrase(''.join(tokens), place_id)
+                self.max_tokens = max(self.max_tokens, len(tokens))
+
+    def add_to_trie(self, tokens, place_id):
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(END, set()).add(place_id)
+
+    def add_phrase(self, phrase, place_id):
+        phrase_id = len(self.phrases)
+        self.phrases.append((phrase, place_id))
+        for gram in trigrams(phrase):
+            self.trigram_postings.setdefault(gram, []).append(phrase_id)
+
+    def exact_matches(self, tokens):
+        """{place id: longest matched token count} for names mentioned verbatim"""
+        found = {}
+        for start in range(len(tokens)):
+            node = self.trie
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                for place_id in node.get(END, ()):
+                    found[place_id] = max(found.get(place_id, 0), end - start + 1)
+        return found
+
+    def fuzzy_matches(self, tokens):
+        """{place id: similarity} for phrases of the text that nearly match a name"""
+        found = {}
+        windows = {
+            sep.join(tokens[start:start + size])
+            for size in range(1, self.max_tokens + 1)
+            for start in range(len(tokens) - size + 1)
+            for sep in (' ', '')
+        }
+        for window in windows:
+            if len(window) < 4:
+                continue
+            grams = trigrams(window)
+            overlap = Counter()
+            for gram in grams:
+                overlap.update(self.trigram_postings.get(gram, ()))
+            for phrase_id, shared in overlap.items():
+                phrase, place_id = self.phrases[phrase_id]
+                # Dice coefficient over trigrams shortlists; difflib decides
+                if 2 * shared / (len(grams) + len(trigrams(phrase))) < MIN_TRIGRAM_OVERLAP:
+                    continue
+                score = SequenceMatcher(None, window, phrase).ratio()
+                if score >= FUZZY_THRESHOLD and score > found.get(place_id, 0):
+                    found[place_id] = score
+        return found
+
+    def result(self, place_id, score):
+        latitude, longitude, kind, name = self.places[place_id]
+        return GeocodeResult(latitude, longitude, name, kind, round(score, 3))
+
+    def locate(self, tokens):
+        """The most specific place a tokenized text mentions, or None"""
+        exact = self.exact_matches(tokens)
+        if exact:
+            best_rank = min(KIND_RANK.get(self.places[place_id][2], 9) for place_id in exact)
+            best = [place_id for place_id in exact if KIND_RANK.get(self.places[place_id][2], 9) == best_rank]
+            if len(best) > 1 and self.places[best[0]][2] == 'street':
+                # "corner of A street and B street": between the two
+                latitude = sum(self.places[place_id][0] for place_id in best) / len(best)
+                longitude = sum(self.places[place_id][1] for place_id in best) / len(best)
+                name = ' & '.join(sorted(self.places[place_id][3] for place_id in best))
+                return GeocodeResult(latitude, longitude, name, 'street', 1.0)
+            return self.result(max(best, key=lambda place_id: exact[place_id]), 1.0)
+
+        fuzzy = self.fuzzy_matches(tokens)
+        if not fuzzy:
+            return None
+        place_id = min(fuzzy, key=lambda place_id: (KIND_RANK.get(self.places[place_id][2], 9), -fuzzy[place_id]))
+        return self.result(place_id, fuzzy[place_id])
+
+    def lookup(self, tokens, version):
+        """locate() memoized in this process and in the shared cache"""
+        if tokens in self.memo:
+            self.memo.move_to_end(tokens)
+            return self.memo[tokens]
+
+        key = f"geocoding:{version}:{hashlib.md5(' '.join(tokens).encode()).hexdigest()}"
+        cached = cache.get(key)
+        if cached is None:
+            found = self.locate(tokens)
+            cache.set(key, tuple(found) if found else MISS, CACHE_TIMEOUT)
+        else:
+            found = GeocodeResult(*cached) if cached != MISS else None
+
+        self.memo[tokens] = found
+        if len(self.memo) > MEMO_SIZE:
+            self.memo.popitem(last=False)
+        return found
+
+
+def load_gazetteer():
+    from .models import GazetteerEntry
+
+    return Gazetteer(
+        (entry.names(), entry.latitude, entry.longitude, entry.kind, entry.name)
+        for entry in GazetteerEntry.objects.filter(is_active=True)
+    )
+
+
+_gazetteer = VersionedIndex(VERSION_KEY, load_gazetteer)
+
+
+def invalidate_gazetteer():
+    """Called when an entry changes: every process reloads and old cached results are ignored"""
+    _gazetteer.invalidate()
+
+
+def get_gazetteer():
+    """(gazetteer, version) for this process, reloaded after the entries change"""
+    return _gazetteer.get()
+
+
+def geocode(text):
+    """GeocodeResult for a free-text location, or None when no known place is mentioned"""
+    tokens = normalize(text)
+    if not tokens:
+        return None
+    gazetteer, version = get_gazetteer()
+    return gazetteer.lookup(tokens, version)
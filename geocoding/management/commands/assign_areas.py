@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from geocoding.areas import get_area_index, invalidate_areas
+from reports.models import CrimeReport
+
+
+class Command(BaseCommand):
+    help = 'Tag every crime report with the ward or patrol sector containing its coordinates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Reports to read and update per query'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        invalidate_areas()
+        index = get_area_index()
+
+        changed_total = 0
+        seen = 0
+        last_id = 0
+        while True:
+            batch = list(
+                CrimeReport.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .only('id', 'latitude', 'longitude', 'area')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+            seen += len(batch)
+
+            changed = []
+            for report in batch:
+                area_id = index.locate(report.latitude, report.longitude)
+                if area_id != report.area_id:
+                    report.area_id = area_id
+                    changed.append(report)
+            CrimeReport.objects.bulk_update(changed, ['area'], batch_size=batch_size)
+            changed_total += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(f"Checked {seen} reports, updated the area of {changed_total}"))
@@ -0,0 +1,61 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from geocoding.targets import fill_coordinates, target_models
+
+
+class Command(BaseCommand):
+    help = 'Estimate missing coordinates of reports, events and listings from their location text'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows to read and update per query'
+        )
+
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many rows would be geocoded'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        for model, text_fields, flag in target_models():
+            update_fields = ['latitude', 'longitude'] + ([flag] if flag else [])
+            matched = 0
+            unmatched = Counter()
+            last_id = 0
+            while True:
+                batch = list(
+                    model.objects.filter(id__gt=last_id, latitude__isnull=True)
+                    .order_by('id')
+                    .only('id', *text_fields, *update_fields)[:batch_size]
+                )
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                changed = []
+                for instance in batch:
+                    if fill_coordinates(instance, text_fields, flag) is None:
+                        unmatched[getattr(instance, text_fields[0]) or ''] += 1
+                    else:
+                        changed.append(instance)
+                if changed and not options['dry_run']:
+                    # bulk_update sends no pre_save, so the estimates are written as computed
+                    model.objects.bulk_update(changed, update_fields, batch_size=batch_size)
+                matched += len(changed)
+
+            self.stdout.write(
+                f"{model._meta.label}: geocoded {matched}, no match for {sum(unmatched.values())}"
+            )
+            # The most common misses are the best candidates for new gazetteer entries
+            for text, count in unmatched.most_common(10):
+                self.stdout.write(f"    {count:>5}  {text!r}")
+
+        self.stdout.write(self.style.SUCCESS('Geocoding backfill complete'))
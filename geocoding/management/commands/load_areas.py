@@ -0,0 +1,68 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from geocoding.models import Area
+
+
+class Command(BaseCommand):
+    help = 'Load ward or patrol sector boundaries from a GeoJSON FeatureCollection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='GeoJSON file with Polygon or MultiPolygon features')
+
+        parser.add_argument(
+            '--kind',
+            choices=[kind for kind, _ in Area.KIND_CHOICES],
+            default='sector',
+            help='What the features are'
+        )
+
+        parser.add_argument(
+            '--name-property',
+            default='name',
+            help='Feature property holding the area name'
+        )
+
+        parser.add_argument(
+            '--code-property',
+            default='code',
+            help='Feature property holding a unique identifier (defaults to the name)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], encoding='utf-8') as f:
+                collection = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+
+        loaded = skipped = 0
+        for feature in collection.get('features', []):
+            geometry = feature.get('geometry') or {}
+            properties = feature.get('properties') or {}
+            if geometry.get('type') == 'Polygon':
+                polygons = [geometry['coordinates']]
+            elif geometry.get('type') == 'MultiPolygon':
+                polygons = geometry['coordinates']
+            else:
+                skipped += 1
+                continue
+
+            name = str(properties.get(options['name_property']) or '').strip()
+            code = str(properties.get(options['code_property']) or name).strip()
+            if not name:
+                skipped += 1
+                continue
+
+            area = Area.objects.filter(code=code).first() or Area(code=code)
+            area.name = name[:150]
+            area.kind = options['kind']
+            area.polygons = polygons
+            area.is_active = True
+            area.save()
+            loaded += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {loaded} areas ({skipped} features skipped). Run assign_areas to re-tag existing reports."
+        ))
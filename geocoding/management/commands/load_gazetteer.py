@@ -0,0 +1,50 @@
+import csv
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from geocoding.models import GazetteerEntry
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'gazetteer.csv')
+
+
+class Command(BaseCommand):
+    help = 'Load gazetteer entries (name,kind,latitude,longitude,aliases) from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default=DEFAULT_PATH,
+            help='CSV file to load (defaults to the bundled seed gazetteer)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(line for line in f if not line.startswith('#')))
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+
+        kinds = dict(GazetteerEntry.KIND_CHOICES)
+        created = updated = 0
+        for row in rows:
+            if row.get('kind') not in kinds:
+                self.stdout.write(self.style.WARNING(f"Skipping {row.get('name')!r}: unknown kind {row.get('kind')!r}"))
+                continue
+            _, was_created = GazetteerEntry.objects.update_or_create(
+                name=row['name'].strip(),
+                kind=row['kind'],
+                defaults={
+                    'latitude': row['latitude'],
+                    'longitude': row['longitude'],
+                    'aliases': (row.get('aliases') or '').strip(),
+                    'is_active': True,
+                },
+            )
+            if was_created:
+                created += 1
+            else:
+                updated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Loaded gazetteer: {created} created, {updated} updated"))
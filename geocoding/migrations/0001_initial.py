@@ -0,0 +1,33 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GazetteerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150)),
+                ('kind', models.CharField(choices=[('landmark', 'Landmark'), ('street', 'Street'), ('section', 'Section'), ('suburb', 'Suburb'), ('town', 'Town')], default='landmark', max_length=10)),
+                ('aliases', models.CharField(blank=True, help_text='Other spellings or names, separated by semicolons (e.g. "Kwa Mhlanga; KwaMhlanga")', max_length=500)),
+                ('latitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('longitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Gazetteer Entry',
+                'verbose_name_plural': 'Gazetteer Entries',
+                'ordering': ['name'],
+                'unique_together': {('name', 'kind')},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geocoding', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Area',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150)),
+                ('code', models.CharField(help_text='Identifier from the boundary data', max_length=50, unique=True)),
+                ('kind', models.CharField(choices=[('ward', 'Ward'), ('sector', 'Patrol Sector')], default='sector', max_length=10)),
+                ('polygons', models.JSONField()),
+                ('min_latitude', models.FloatField()),
+                ('max_latitude', models.FloatField()),
+                ('min_longitude', models.FloatField()),
+                ('max_longitude', models.FloatField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Area',
+                'verbose_name_plural': 'Areas',
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import models
+
+
+class GazetteerEntry(models.Model):
+    """A named place in the policing area with its coordinates"""
+    KIND_CHOICES = [
+        ('landmark', 'Landmark'),
+        ('street', 'Street'),
+        ('section', 'Section'),
+        ('suburb', 'Suburb'),
+        ('town', 'Town'),
+    ]
+
+    name = models.CharField(max_length=150)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default='landmark')
+    aliases = models.CharField(
+        max_length=500, blank=True,
+        help_text="Other spellings or names, separated by semicolons (e.g. \"Kwa Mhlanga; KwaMhlanga\")"
+    )
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+        unique_together = ['name', 'kind']
+        verbose_name = 'Gazetteer Entry'
+        verbose_name_plural = 'Gazetteer Entries'
+
+    def __str__(self):
+        return f"{self.name} ({self.get_kind_display()})"
+
+    def names(self):
+        return [self.name] + [alias.strip() for alias in self.aliases.split(';') if alias.strip()]
+
+
+class Area(models.Model):
+    """A ward or patrol sector boundary, loaded from GeoJSON"""
+    KIND_CHOICES = [
+        ('ward', 'Ward'),
+        ('sector', 'Patrol Sector'),
+    ]
+
+    name = models.CharField(max_length=150)
+    code = models.CharField(max_length=50, unique=True, help_text="Identifier from the boundary data")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default='sector')
+    # GeoJSON MultiPolygon coordinates: [polygon][ring][point] as [longitude, latitude]
+    polygons = models.JSONField()
+    # Bounding box, for the R-tree
+    min_latitude = models.FloatField()
+    max_latitude = models.FloatField()
+    min_longitude = models.FloatField()
+    max_longitude = models.FloatField()
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Area'
+        verbose_name_plural = 'Areas'
+
+    def __str__(self):
+        return f"{self.name} ({self.get_kind_display()})"
+
+    def save(self, *args, **kwargs):
+        points = [point for polygon in self.polygons for ring in polygon for point in ring]
+        self.min_longitude = min(point[0] for point in points)
+        self.max_longitude = max(point[0] for point in points)
+        self.min_latitude = min(point[1] for point in points)
+        self.max_latitude = max(point[1] for point in points)
+        super().save(*args, **kwargs)
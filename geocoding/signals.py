@@ -0,0 +1,62 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .areas import area_for, invalidate_areas
+from .gazetteer import invalidate_gazetteer
+from .models import Area, GazetteerEntry
+from .targets import fill_coordinates, target_models
+from reports.models import CrimeReport
+
+TARGETS = {}
+
+
+def estimate_coordinates(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Partial saves that do not write the coordinates are left alone
+    if raw or (update_fields is not None and 'latitude' not in update_fields):
+        return
+    text_fields, flag = TARGETS[sender]
+
+    if flag and getattr(instance, flag) and instance.pk:
+        previous = (
+            sender.objects.filter(pk=instance.pk)
+            .values(*text_fields, 'latitude', 'longitude')
+            .first()
+        )
+        if previous is not None:
+            if (previous['latitude'], previous['longitude']) != (instance.latitude, instance.longitude):
+                # Someone placed the point by hand; it is no longer an estimate
+                setattr(instance, flag, False)
+                return
+            if all(previous[field] == getattr(instance, field) for field in text_fields):
+                return
+        # The text changed, so the estimate goes with it
+        instance.latitude = instance.longitude = None
+        setattr(instance, flag, False)
+
+    if instance.latitude is None or instance.longitude is None:
+        fill_coordinates(instance, text_fields, flag)
+
+
+for model, text_fields, flag in target_models():
+    TARGETS[model] = (text_fields, flag)
+    pre_save.connect(estimate_coordinates, sender=model, dispatch_uid=f"geocode_{model._meta.label_lower}")
+
+
+# Connected after estimate_coordinates above, so estimated points get an area too
+@receiver(pre_save, sender=CrimeReport)
+def assign_area(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not {'latitude', 'area'} & set(update_fields)):
+        return
+    instance.area_id = area_for(instance.latitude, instance.longitude)
+
+
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+def areas_changed(sender, instance, **kwargs):
+    invalidate_areas()
+
+
+@receiver(post_save, sender=GazetteerEntry)
+@receiver(post_delete, sender=GazetteerEntry)
+def gazetteer_changed(sender, instance, **kwargs):
+    invalidate_gazetteer()
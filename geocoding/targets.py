@@ -0,0 +1,50 @@
+"""
+Models whose free-text location the geocoder fills coordinates in for.
+
+Each has `latitude`/`longitude` DecimalFields. Rows whose coordinates came
+from a device or a map pin are never touched; a model with a flag field
+records that its coordinates are estimates, and those are re-estimated when
+the text changes (see geocoding.signals).
+"""
+
+from decimal import Decimal
+
+from django.apps import apps
+
+from .gazetteer import geocode
+
+# label -> (text fields tried in order, flag field marking estimated coordinates)
+GEOCODED_MODELS = {
+    'reports.CrimeReport': (['location'], 'location_geocoded'),
+    'kingspark_events.Event': (['venue', 'address'], None),
+    'isell.SaleItem': (['location'], None),
+    'services.ServiceListing': (['service_areas'], None),
+}
+
+
+def target_models():
+    """(model, text fields, flag field) for each target installed in this deployment"""
+    targets = []
+    for label, (text_fields, flag) in GEOCODED_MODELS.items():
+        try:
+            targets.append((apps.get_model(label), text_fields, flag))
+        except LookupError:
+            continue
+    return targets
+
+
+def fill_coordinates(instance, text_fields, flag):
+    """Set estimated coordinates from the location text; returns the GeocodeResult or None"""
+    for field_name in text_fields:
+        found = geocode(getattr(instance, field_name))
+        if found is not None:
+            break
+    else:
+        return None
+
+    for attname, value in (('latitude', found.latitude), ('longitude', found.longitude)):
+        places = instance._meta.get_field(attname).decimal_places
+        setattr(instance, attname, round(Decimal(str(value)), places))
+    if flag:
+        setattr(instance, flag, True)
+    return found
@@ -0,0 +1,47 @@
+"""
+In-process indexes that follow changes to the rows they are built from.
+
+The gazetteer trie and the area R-tree are built once per process from the
+database. Each keeps a version number in the shared cache: saving a row
+bumps it, and every process compares its copy against it at most once per
+VERSION_CHECK_SECONDS, rebuilding the index when it has moved on.
+"""
+
+import time
+
+from django.core.cache import cache
+
+# How long a process trusts its index before checking whether the rows changed
+VERSION_CHECK_SECONDS = 60
+
+
+class VersionedIndex:
+    """A lazily built index, reloaded through `loader` when the version under `key` changes"""
+
+    def __init__(self, key, loader):
+        self.key = key
+        self.loader = loader
+        self.index = None
+        self.version = None
+        self.checked_at = 0.0
+
+    def current_version(self):
+        version = cache.get(self.key)
+        if version is None:
+            version = int(time.time())
+            cache.add(self.key, version, None)
+        return version
+
+    def invalidate(self):
+        """Called when a row changes: every process reloads, and results keyed by the old version are ignored"""
+        cache.set(self.key, int(time.time() * 1000), None)
+
+    def get(self):
+        """(index, version) for this process, reloaded after the rows change"""
+        now = time.monotonic()
+        if self.index is None or now - self.checked_at > VERSION_CHECK_SECONDS:
+            version = self.current_version()
+            if self.index is None or version != self.version:
+                self.index, self.version = self.loader(), version
+            self.checked_at = now
+        return self.index, self.version
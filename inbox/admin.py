@@ -0,0 +1,28 @@
+from django.contrib import admin
+from .models import Conversation, Membership, Message
+
+
+class MessageInline(admin.TabularInline):
+    model = Message
+    extra = 0
+    fields = ['sender', 'body', 'created_at', 'source', 'source_id']
+    readonly_fields = ['sender', 'created_at', 'source', 'source_id']
+
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    list_display = ['title', 'kind', 'object_id', 'owner', 'counterpart', 'guest_email', 'message_count', 'last_message_at']
+    list_filter = ['kind', 'last_message_at']
+    search_fields = ['title', 'owner__username', 'counterpart__username', 'guest_email']
+    readonly_fields = ['last_message', 'last_message_at', 'message_count', 'created_at']
+    raw_id_fields = ['owner', 'counterpart']
+    inlines = [MessageInline]
+
+
+@admin.register(Membership)
+class MembershipAdmin(admin.ModelAdmin):
+    list_display = ['conversation', 'user', 'kind', 'unread_count', 'last_message_at']
+    list_filter = ['kind']
+    search_fields = ['user__username', 'conversation__title']
+    readonly_fields = ['last_message_at', 'last_read_at']
+    raw_id_fields = ['conversation', 'user']
@@ -0,0 +1,14 @@
+from django import forms
+
+
+class ReplyForm(forms.Form):
+    """Form for replying in an inbox thread"""
+
+    body = forms.CharField(
+        max_length=5000,
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'placeholder': 'Write a reply...',
+            'rows': 3
+        })
+    )
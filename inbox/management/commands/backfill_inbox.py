@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from inbox.models import Message
+from inbox.threads import deliver, source_models
+
+# Relation each source row needs to describe its listing
+RELATED = {
+    'isell.ItemMessage': 'item',
+    'iwanttobuy.BuyRequestResponse': 'buy_request',
+    'services.ServiceInquiry': 'service',
+}
+
+
+class Command(BaseCommand):
+    help = 'Copy existing item messages, buy request responses and service inquiries into the inbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Source rows to read per query'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        for model, _ in source_models():
+            label = model._meta.label
+            last_id = 0
+            copied = 0
+            while True:
+                # Oldest first, so every thread ends up pointing at its latest message
+                batch = list(
+                    model.objects.filter(id__gt=last_id)
+                    .select_related(RELATED[label])
+                    .order_by('id')[:batch_size]
+                )
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                done = set(
+                    Message.objects.filter(source=label, source_id__in=[row.id for row in batch])
+                    .values_list('source_id', flat=True)
+                )
+                for row in batch:
+                    if row.id in done:
+                        continue
+                    deliver(row, unread=not row.read, notify=False)
+                    copied += 1
+            self.stdout.write(f"{label}: copied {copied} messages")
+
+        self.stdout.write(self.style.SUCCESS('Inbox backfill complete'))
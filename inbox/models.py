@@ -0,0 +1,108 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.urls import reverse
+from django.utils import timezone
+
+KIND_CHOICES = [
+    ('item', 'Item for Sale'),
+    ('request', 'Buy Request'),
+    ('service', 'Service'),
+]
+
+
+class Conversation(models.Model):
+    """A thread about one listing between its owner and one counterpart"""
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200, help_text="Listing title when the thread started")
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owned_conversations')
+    # Null for guests who sent a service inquiry without an account
+    counterpart = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, blank=True, related_name='started_conversations'
+    )
+    guest_name = models.CharField(max_length=100, blank=True)
+    guest_email = models.EmailField(blank=True)
+    last_message = models.ForeignKey(
+        'Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    last_message_at = models.DateTimeField(default=timezone.now)
+    message_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Conversation'
+        verbose_name_plural = 'Conversations'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id', 'counterpart'],
+                condition=models.Q(counterpart__isnull=False),
+                name='inbox_conversation_member_unique',
+            ),
+            models.UniqueConstraint(
+                fields=['kind', 'object_id', 'guest_email'],
+                condition=models.Q(counterpart__isnull=True),
+                name='inbox_conversation_guest_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.get_kind_display()})"
+
+    def get_absolute_url(self):
+        return reverse('inbox:thread', args=[self.pk])
+
+    @property
+    def counterpart_name(self):
+        return self.counterpart.username if self.counterpart_id else self.guest_name or self.guest_email
+
+
+class Membership(models.Model):
+    """One participant's view of a conversation: their unread count and sort key"""
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='inbox_memberships')
+    # Copied from the conversation so the inbox page reads one index range
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    last_message_at = models.DateTimeField(default=timezone.now)
+    unread_count = models.PositiveIntegerField(default=0)
+    last_read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('conversation', 'user')
+        indexes = [
+            models.Index(fields=['user', '-last_message_at', '-id'], name='inbox_member_recent_idx'),
+            models.Index(fields=['user', 'kind', '-last_message_at', '-id'], name='inbox_member_kind_idx'),
+            models.Index(
+                fields=['user'], condition=models.Q(unread_count__gt=0), name='inbox_member_unread_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} in {self.conversation}"
+
+
+class Message(models.Model):
+    """One message in a conversation"""
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='messages')
+    # Null when a guest wrote it
+    sender = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='inbox_messages')
+    body = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now)
+    # The marketplace row this message was copied from (ItemMessage, BuyRequestResponse, ...)
+    source = models.CharField(max_length=50, blank=True)
+    source_id = models.PositiveBigIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['conversation', '-id'], name='inbox_message_thread_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'source_id'],
+                condition=models.Q(source_id__isnull=False),
+                name='inbox_message_source_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Message in {self.conversation} at {self.created_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+
+from .threads import deliver, source_models
+
+
+def copy_to_inbox(sender, instance, created, raw=False, **kwargs):
+    # New marketplace messages open or continue a thread; edits are not replayed
+    if created and not raw:
+        deliver(instance)
+
+
+for model, _ in source_models():
+    post_save.connect(copy_to_inbox, sender=model, dispatch_uid=f"inbox_copy_{model._meta.label_lower}")
@@ -0,0 +1,212 @@
+"""
+Unified marketplace inbox.
+
+Item messages, buy request responses and service inquiries are each copied
+into a Conversation keyed by (listing, counterpart) as they are saved, and
+replies are written straight to the inbox. Every participant has a
+Membership row carrying the thread's last activity and their unread count,
+so the inbox page is one keyset-paginated range over an index on
+(user, last_message_at, id), however many threads or messages a seller has.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from notifications.events import publish_event
+
+from .models import Conversation, Membership, Message
+
+THREADS_PER_PAGE = 20
+MESSAGES_PER_PAGE = 30
+
+
+def item_message(message):
+    item = message.item
+    counterpart_id = message.recipient_id if message.sender_id == item.seller_id else message.sender_id
+    return {
+        'kind': 'item',
+        'object_id': item.pk,
+        'title': item.title,
+        'owner_id': item.seller_id,
+        'counterpart_id': counterpart_id,
+        'sender_id': message.sender_id,
+        'body': message.message,
+    }
+
+
+def buy_request_response(response):
+    buy_request = response.buy_request
+    body = response.message
+    if response.price_offer is not None:
+        body = f"{body}\n\nOffer: R{response.price_offer}"
+    return {
+        'kind': 'request',
+        'object_id': buy_request.pk,
+        'title': buy_request.title,
+        'owner_id': buy_request.requester_id,
+        'counterpart_id': response.responder_id,
+        'sender_id': response.responder_id,
+        'body': body,
+    }
+
+
+def service_inquiry(inquiry):
+    service = inquiry.service
+    return {
+        'kind': 'service',
+        'object_id': service.pk,
+        'title': service.title,
+        'owner_id': service.provider_id,
+        'counterpart_id': inquiry.user_id,
+        'sender_id': inquiry.user_id,
+        'body': inquiry.message,
+        'guest_name': '' if inquiry.user_id else inquiry.name,
+        'guest_email': '' if inquiry.user_id else inquiry.email,
+    }
+
+
+# Marketplace message models copied into the inbox -> function describing one row
+SOURCES = {
+    'isell.ItemMessage': item_message,
+    'iwanttobuy.BuyRequestResponse': buy_request_response,
+    'services.ServiceInquiry': service_inquiry,
+}
+
+
+def source_models():
+    """(model, describe) for each source app installed in this deployment"""
+    sources = []
+    for label, describe in SOURCES.items():
+        try:
+            sources.append((apps.get_model(label), describe))
+        except LookupError:
+            continue
+    return sources
+
+
+def get_conversation(kind, object_id, title, owner_id, counterpart_id=None, guest_name='', guest_email=''):
+    """The thread for (listing, counterpart), created with its memberships on first use"""
+    lookup = {'kind': kind, 'object_id': object_id}
+    if counterpart_id:
+        lookup['counterpart_id'] = counterpart_id
+    else:
+        lookup.update(counterpart__isnull=True, guest_email=guest_email)
+    conversation, created = Conversation.objects.get_or_create(
+        **lookup,
+        defaults={'title': title[:200], 'owner_id': owner_id, 'guest_name': guest_name},
+    )
+    if created:
+        participants = {owner_id, counterpart_id} - {None}
+        Membership.objects.bulk_create(
+            [Membership(conversation=conversation, user_id=user_id, kind=kind) for user_id in participants],
+            ignore_conflicts=True,
+        )
+    return conversation
+
+
+def post_message(conversation, sender_id, body, created_at=None, source='', source_id=None, unread=True,
+                 notify=True):
+    """
+    Append a message and move the thread to the top of every participant's
+    inbox. With `unread` the other participants' counts go up, and with
+    `notify` they are also sent an 'inbox.message' event.
+    """
+    with transaction.atomic():
+        message = Message.objects.create(
+            conversation=conversation,
+            sender_id=sender_id,
+            body=body,
+            source=source,
+            source_id=source_id,
+            **({'created_at': created_at} if created_at else {}),
+        )
+        Conversation.objects.filter(pk=conversation.pk).update(
+            last_message=message,
+            last_message_at=message.created_at,
+            message_count=F('message_count') + 1,
+        )
+        memberships = Membership.objects.filter(conversation=conversation)
+        memberships.update(last_message_at=message.created_at)
+        if unread:
+            memberships.exclude(user_id=sender_id).update(unread_count=F('unread_count') + 1)
+        if unread and notify:
+            for membership in memberships.exclude(user_id=sender_id).select_related('user'):
+                publish_event('inbox.message', {
+                    'conversation': conversation.pk,
+                    'title': conversation.title,
+                    'url': conversation.get_absolute_url(),
+                }, user=membership.user)
+    return message
+
+
+def deliver(instance, unread=True, notify=True):
+    """Copy a saved marketplace message into its thread; returns the inbox Message"""
+    label = instance._meta.label
+    details = SOURCES[label](instance)
+    conversation = get_conversation(
+        details['kind'], details['object_id'], details['title'], details['owner_id'],
+        details['counterpart_id'], details.get('guest_name', ''), details.get('guest_email', ''),
+    )
+    return post_message(
+        conversation, details['sender_id'], details['body'],
+        created_at=instance.created_at, source=label, source_id=instance.pk, unread=unread, notify=notify,
+    )
+
+
+def encode_cursor(moment, pk):
+    return f"{int(moment.timestamp() * 1_000_000)}-{pk}"
+
+
+def decode_cursor(cursor):
+    """(datetime, id) from a thread cursor, or None if it is malformed"""
+    try:
+        micros, pk = (int(part) for part in cursor.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc), pk
+
+
+def thread_page(user, kind=None, after=None, size=THREADS_PER_PAGE):
+    """(memberships, next cursor) for one page of a user's threads, most recent first"""
+    memberships = Membership.objects.filter(user=user)
+    if kind:
+        memberships = memberships.filter(kind=kind)
+    position = decode_cursor(after) if after else None
+    if position:
+        moment, pk = position
+        memberships = memberships.filter(
+            Q(last_message_at__lt=moment) | Q(last_message_at=moment, id__lt=pk)
+        )
+    page = list(
+        memberships.select_related('conversation__last_message', 'conversation__counterpart', 'conversation__owner')
+        .order_by('-last_message_at', '-id')[:size + 1]
+    )
+    next_cursor = encode_cursor(page[size - 1].last_message_at, page[size - 1].id) if len(page) > size else None
+    return page[:size], next_cursor
+
+
+def message_page(conversation, before=None, size=MESSAGES_PER_PAGE):
+    """(messages oldest first, id to pass as `before` for older ones) for one page of a thread"""
+    messages = conversation.messages.select_related('sender')
+    if before:
+        messages = messages.filter(id__lt=before)
+    page = list(messages.order_by('-id')[:size + 1])
+    older = page[size - 1].id if len(page) > size else None
+    return page[:size][::-1], older
+
+
+def mark_read(membership):
+    if membership.unread_count:
+        Membership.objects.filter(pk=membership.pk).update(unread_count=0, last_read_at=timezone.now())
+        membership.unread_count = 0
+
+
+def unread_total(user):
+    """Unread messages across a user's threads; reads only the threads that have any"""
+    return Membership.objects.filter(user=user, unread_count__gt=0).aggregate(
+        total=Sum('unread_count')
+    )['total'] or 0
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+app_name = 'inbox'
+
+urlpatterns = [
+    path('', views.inbox, name='inbox'),
+    path('<int:pk>/', views.thread, name='thread'),
+    path('unread/', views.unread_count, name='unread_count'),
+]
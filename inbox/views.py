@@ -0,0 +1,72 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+
+from .forms import ReplyForm
+from .models import KIND_CHOICES, Membership
+from .threads import mark_read, message_page, post_message, thread_page, unread_total
+
+
+@login_required
+def inbox(request):
+    """View to list the user's marketplace conversations, most recent first"""
+    kind = request.GET.get('kind')
+    if kind not in dict(KIND_CHOICES):
+        kind = None
+
+    threads, next_cursor = thread_page(request.user, kind=kind, after=request.GET.get('after'))
+
+    context = {
+        'threads': threads,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('after'),
+        'selected_kind': kind,
+        'kind_choices': KIND_CHOICES,
+        'unread_total': unread_total(request.user),
+        'title': 'Inbox'
+    }
+
+    return render(request, 'inbox/inbox.html', context)
+
+
+@login_required
+def thread(request, pk):
+    """View to read a conversation and reply to it"""
+    membership = get_object_or_404(
+        Membership.objects.select_related('conversation__owner', 'conversation__counterpart'),
+        conversation_id=pk,
+        user=request.user,
+    )
+    conversation = membership.conversation
+
+    if request.method == 'POST':
+        form = ReplyForm(request.POST)
+        if form.is_valid():
+            post_message(conversation, request.user.id, form.cleaned_data['body'])
+            return redirect('inbox:thread', pk=conversation.pk)
+        messages.error(request, "Please write a message before sending.")
+    else:
+        form = ReplyForm()
+
+    mark_read(membership)
+    before = request.GET.get('before', '')
+    thread_messages, older = message_page(conversation, before=int(before) if before.isdigit() else None)
+
+    context = {
+        'conversation': conversation,
+        'thread_messages': thread_messages,
+        'older': older,
+        # Guests wrote from a form and cannot see replies here
+        'can_reply': conversation.counterpart_id is not None,
+        'form': form,
+        'title': conversation.title
+    }
+
+    return render(request, 'inbox/thread.html', context)
+
+
+@login_required
+def unread_count(request):
+    """JSON endpoint with the user's unread message total, for the navbar badge"""
+    return JsonResponse({'unread': unread_total(request.user)})
@@ -1,10 +1,13 @@
 from django import forms
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
+from media_assets.forms import ChunkedUploadFormMixin
 from .models import SaleItem, ItemMessage
 
-class SaleItemForm(forms.ModelForm):
+class SaleItemForm(ChunkedUploadFormMixin, forms.ModelForm):
     """Form for creating and editing sale items"""
+
+    chunked_upload_fields = ['main_image', 'additional_image1', 'additional_image2', 'video', 'pdf_document']
     
     # Custom validators
     phone_regex = RegexValidator(
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.urls import reverse
+from media_assets.storage import protected_storage
 
 class SaleItem(models.Model):
     """Model for items listed for sale"""
@@ -21,6 +22,9 @@ class SaleItem(models.Model):
     
     # Location and contact
     location = models.CharField(max_length=255)
+    # Estimated from the location text by the offline geocoder
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     contact_number = models.CharField(max_length=20)
     whatsapp_number = models.CharField(max_length=20, blank=True, null=True)
     show_email = models.BooleanField(default=False, help_text="Show your email to potential buyers")
@@ -29,8 +33,8 @@ class SaleItem(models.Model):
     main_image = models.ImageField(upload_to='isell/images/', blank=True, null=True)
     additional_image1 = models.ImageField(upload_to='isell/images/', blank=True, null=True)
     additional_image2 = models.ImageField(upload_to='isell/images/', blank=True, null=True)
-    video = models.FileField(upload_to='isell/videos/', blank=True, null=True)
-    pdf_document = models.FileField(upload_to='isell/documents/', blank=True, null=True)
+    video = models.FileField(upload_to='isell/videos/', storage=protected_storage, blank=True, null=True)
+    pdf_document = models.FileField(upload_to='isell/documents/', storage=protected_storage, blank=True, null=True)
     
     # Categorization
     category = models.CharField(max_length=100, blank=True, null=True)
@@ -51,6 +55,18 @@ class SaleItem(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Sale Item'
         verbose_name_plural = 'Sale Items'
+        indexes = [
+            # Partial indexes: list pages only ever read ACTIVE listings
+            models.Index(
+                fields=['-created_at'], condition=models.Q(status='ACTIVE'), name='isell_active_created_idx'
+            ),
+            models.Index(
+                fields=['price'], condition=models.Q(status='ACTIVE'), name='isell_active_price_idx'
+            ),
+            models.Index(
+                fields=['expiry_date'], condition=models.Q(status='ACTIVE'), name='isell_active_expiry_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - R{self.price}"
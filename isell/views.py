@@ -2,13 +2,19 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.urls import reverse
 from django.http import JsonResponse, HttpResponseForbidden
 from django.views.decorators.http import require_POST
 from django.utils import timezone
 
-from .models import SaleItem, SavedItem, ItemMessage
+from .models import SaleItem, SavedItem
 from .forms import SaleItemForm, ItemMessageForm
+from counters.buffer import record_view
+from media_assets.images import get_derivatives_many
+from search.facets import listing_facets
+from search.index import search_queryset
+from search.similar import similar_listings
+from search.tags import tagged_ids
 
 def item_list(request):
     """View to list all items for sale"""
@@ -19,18 +25,18 @@ def item_list(request):
     # Handle search
     query = request.GET.get('q')
     if query:
-        items = items.filter(
-            Q(title__icontains=query) | 
-            Q(description__icontains=query) |
-            Q(location__icontains=query) |
-            Q(tags__icontains=query)
-        )
+        items = search_queryset(items, query)
     
     # Handle category filter
     category = request.GET.get('category')
     if category:
         items = items.filter(category=category)
     
+    # Handle tag filter
+    tag = request.GET.get('tag')
+    if tag:
+        items = items.filter(pk__in=tagged_ids('item', tag))
+    
     # Handle price range filter
     min_price = request.GET.get('min_price')
     max_price = request.GET.get('max_price')
@@ -40,8 +46,10 @@ def item_list(request):
         items = items.filter(price__lte=max_price)
     
     # Handle sort order
-    sort = request.GET.get('sort', 'newest')
-    if sort == 'price_low':
+    sort = request.GET.get('sort', 'relevance' if query else 'newest')
+    if sort == 'relevance' and query:
+        items = items.order_by('-search_rank', '-created_at')
+    elif sort == 'price_low':
         items = items.order_by('price')
     elif sort == 'price_high':
         items = items.order_by('-price')
@@ -50,10 +58,8 @@ def item_list(request):
     else:  # Default to newest
         items = items.order_by('-created_at')
     
-    # Get categories for filtering
-    categories = SaleItem.objects.filter(status='ACTIVE').values_list(
-        'category', flat=True
-    ).distinct()
+    # Categories, tags and price ranges for filtering, from one cached lookup
+    facets = listing_facets('item')
     
     # Pagination
     paginator = Paginator(items, 12)  # Show 12 items per page
@@ -67,13 +73,17 @@ def item_list(request):
     
     context = {
         'page_obj': page_obj,
-        'categories': categories,
+        'categories': facets['categories'],
         'query': query,
         'selected_category': category,
+        'tag_facets': facets['tags'],
+        'selected_tag': tag,
+        'price_facets': facets['prices'],
         'min_price': min_price,
         'max_price': max_price,
         'sort': sort,
         'saved_items': saved_items,
+        'image_derivatives': get_derivatives_many(item.main_image.name for item in page_obj),
         'title': 'I Sell - Marketplace'
     }
     
@@ -85,9 +95,8 @@ def item_detail(request, pk):
     
     item = get_object_or_404(SaleItem, pk=pk)
     
-    # Increment view count
-    item.view_count += 1
-    item.save()
+    # Count the view in the buffer; the row itself is not written
+    record_view(item)
     
     # Check if item is saved by user
     is_saved = False
@@ -101,6 +110,8 @@ def item_detail(request, pk):
         'item': item,
         'is_saved': is_saved,
         'form': form,
+        # Precomputed nightly; one indexed lookup
+        'similar_listings': similar_listings('item', item.pk),
         'title': item.title
     }
     
@@ -112,7 +123,7 @@ def create_item(request):
     """View for creating a new item listing"""
     
     if request.method == 'POST':
-        form = SaleItemForm(request.POST, request.FILES)
+        form = SaleItemForm(request.POST, request.FILES, user=request.user)
         if form.is_valid():
             item = form.save(commit=False)
             item.seller = request.user
@@ -144,7 +155,7 @@ def edit_item(request, pk):
         return HttpResponseForbidden("You don't have permission to edit this listing.")
     
     if request.method == 'POST':
-        form = SaleItemForm(request.POST, request.FILES, instance=item)
+        form = SaleItemForm(request.POST, request.FILES, instance=item, user=request.user)
         if form.is_valid():
             form.save()
             messages.success(request, "Your listing has been updated successfully!")
@@ -297,22 +308,5 @@ def send_message(request, pk):
 
 @login_required
 def my_messages(request):
-    """View to display user's received messages"""
-    
-    # Get received messages
-    received_messages = ItemMessage.objects.filter(
-        recipient=request.user
-    ).select_related('item', 'sender')
-    
-    # Get sent messages
-    sent_messages = ItemMessage.objects.filter(
-        sender=request.user
-    ).select_related('item', 'recipient')
-    
-    context = {
-        'received_messages': received_messages,
-        'sent_messages': sent_messages,
-        'title': 'My Messages'
-    }
-    
-    return render(request, 'isell/my_messages.html', context)
+    """Item messages now live in the marketplace inbox, threaded per buyer"""
+    return redirect(f"{reverse('inbox:inbox')}?kind=item")
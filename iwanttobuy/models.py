@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.urls import reverse
+from media_assets.storage import protected_storage
 
 class BuyRequest(models.Model):
     """Model for buy requests posted by users"""
@@ -35,7 +36,7 @@ class BuyRequest(models.Model):
     
     # Media uploads - for reference images
     reference_image = models.ImageField(upload_to='iwanttobuy/images/', blank=True, null=True)
-    pdf_document = models.FileField(upload_to='iwanttobuy/documents/', blank=True, null=True)
+    pdf_document = models.FileField(upload_to='iwanttobuy/documents/', storage=protected_storage, blank=True, null=True)
     
     # Categorization
     category = models.CharField(max_length=100, blank=True, null=True)
@@ -55,6 +56,15 @@ class BuyRequest(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Buy Request'
         verbose_name_plural = 'Buy Requests'
+        indexes = [
+            # Partial indexes: list pages only ever read ACTIVE listings
+            models.Index(
+                fields=['-created_at'], condition=models.Q(status='ACTIVE'), name='iwanttobuy_active_created_idx'
+            ),
+            models.Index(
+                fields=['expiry_date'], condition=models.Q(status='ACTIVE'), name='iwanttobuy_active_expiry_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
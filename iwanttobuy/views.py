@@ -2,12 +2,17 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.urls import reverse
 from django.http import HttpResponseForbidden
 from django.utils import timezone
 
-from .models import BuyRequest, BuyRequestResponse
+from .models import BuyRequest
 from .forms import BuyRequestForm, BuyRequestResponseForm
+from counters.buffer import record_view
+from search.facets import listing_facets
+from search.index import search_queryset
+from search.similar import similar_listings
+from search.tags import tagged_ids
 
 def request_list(request):
     """View to list all buy requests"""
@@ -18,26 +23,28 @@ def request_list(request):
     # Handle search
     query = request.GET.get('q')
     if query:
-        buy_requests = buy_requests.filter(
-            Q(title__icontains=query) | 
-            Q(description__icontains=query) |
-            Q(location__icontains=query) |
-            Q(tags__icontains=query)
-        )
+        buy_requests = search_queryset(buy_requests, query)
     
     # Handle category filter
     category = request.GET.get('category')
     if category:
         buy_requests = buy_requests.filter(category=category)
     
+    # Handle tag filter
+    tag = request.GET.get('tag')
+    if tag:
+        buy_requests = buy_requests.filter(pk__in=tagged_ids('request', tag))
+    
     # Handle urgency filter
     urgency = request.GET.get('urgency')
     if urgency:
         buy_requests = buy_requests.filter(urgency=urgency)
     
     # Handle sort order
-    sort = request.GET.get('sort', 'newest')
-    if sort == 'urgency':
+    sort = request.GET.get('sort', 'relevance' if query else 'newest')
+    if sort == 'relevance' and query:
+        buy_requests = buy_requests.order_by('-search_rank', '-created_at')
+    elif sort == 'urgency':
         # Order by urgency level (HIGH to LOW)
         buy_requests = buy_requests.order_by(
             # Custom order for urgency levels
@@ -58,10 +65,8 @@ def request_list(request):
     else:  # Default to newest
         buy_requests = buy_requests.order_by('-created_at')
     
-    # Get categories for filtering
-    categories = BuyRequest.objects.filter(status='ACTIVE').values_list(
-        'category', flat=True
-    ).distinct()
+    # Categories, tags and urgency levels for filtering, from one cached lookup
+    facets = listing_facets('request')
     
     # Pagination
     paginator = Paginator(buy_requests, 12)  # Show 12 requests per page
@@ -70,12 +75,14 @@ def request_list(request):
     
     context = {
         'page_obj': page_obj,
-        'categories': categories,
+        'categories': facets['categories'],
         'query': query,
         'selected_category': category,
+        'tag_facets': facets['tags'],
+        'selected_tag': tag,
         'selected_urgency': urgency,
         'sort': sort,
-        'urgency_choices': BuyRequest.URGENCY_CHOICES,
+        'urgency_facets': facets['urgency'],
         'title': 'I Want to Buy'
     }
     
@@ -87,9 +94,8 @@ def request_detail(request, pk):
     
     buy_request = get_object_or_404(BuyRequest, pk=pk)
     
-    # Increment view count
-    buy_request.view_count += 1
-    buy_request.save()
+    # Count the view in the buffer; the row itself is not written
+    record_view(buy_request)
     
     # Get responses if user is the requester
     responses = None
@@ -103,6 +109,7 @@ def request_detail(request, pk):
         'buy_request': buy_request,
         'responses': responses,
         'form': form,
+        'similar_listings': similar_listings('request', buy_request.pk),
         'title': buy_request.title
     }
     
@@ -269,14 +276,5 @@ def respond_to_request(request, pk):
 
 @login_required
 def my_responses(request):
-    """View to display responses sent by the user"""
-    
-    responses = BuyRequestResponse.objects.filter(responder=request.user)
-    responses = responses.order_by('-created_at')
-    
-    context = {
-        'responses': responses,
-        'title': 'My Responses'
-    }
-    
-    return render(request, 'iwanttobuy/my_responses.html', context)
+    """Responses now live in the marketplace inbox, threaded per buy request"""
+    return redirect(f"{reverse('inbox:inbox')}?kind=request")
@@ -1,10 +1,13 @@
 from django import forms
 from django.utils import timezone
+from media_assets.forms import ChunkedUploadFormMixin
 from .models import Event, EventRegistration
 
-class EventForm(forms.ModelForm):
+class EventForm(ChunkedUploadFormMixin, forms.ModelForm):
     """Form for creating and editing events."""
 
+    chunked_upload_fields = ['image', 'flyer']
+
     class Meta:
         model = Event
         fields = [
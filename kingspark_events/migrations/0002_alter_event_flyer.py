@@ -0,0 +1,19 @@
+# Generated by Django 4.2.9 on 2026-10-19 05:39
+
+from django.db import migrations, models
+import media_assets.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kingspark_events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='flyer',
+            field=models.FileField(blank=True, null=True, storage=media_assets.storage.ContentAddressedStorage(blob_prefix='protected/'), upload_to='event_flyers/'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from media_assets.storage import protected_storage
 
 class Event(models.Model):
     """Model for community events that require admin approval."""
@@ -56,7 +57,7 @@ class Event(models.Model):
 
     # Media
     image = models.ImageField(upload_to='event_images/', null=True, blank=True)
-    flyer = models.FileField(upload_to='event_flyers/', null=True, blank=True)
+    flyer = models.FileField(upload_to='event_flyers/', storage=protected_storage, null=True, blank=True)
 
     # Approval and status
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
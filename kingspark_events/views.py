@@ -7,6 +7,7 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from .models import Event, EventRegistration
 from .forms import EventForm, EventRegistrationForm
+from media_assets.images import get_derivatives_many
 
 @login_required
 def event_list(request):
@@ -30,6 +31,7 @@ def event_list(request):
         'page_obj': page_obj,
         'categories': Event.CATEGORY_CHOICES,
         'selected_category': category,
+        'image_derivatives': get_derivatives_many(event.image.name for event in page_obj),
     }
     return render(request, 'kingspark_events/event_list.html', context)
 
@@ -65,7 +67,7 @@ def create_event(request):
         raise PermissionDenied("Only administrators can create events.")
     
     if request.method == 'POST':
-        form = EventForm(request.POST, request.FILES)
+        form = EventForm(request.POST, request.FILES, user=request.user)
         if form.is_valid():
             event = form.save(commit=False)
             event.organizer = request.user
@@ -94,7 +96,7 @@ def edit_event(request, event_id):
     event = get_object_or_404(Event, id=event_id)
 
     if request.method == 'POST':
-        form = EventForm(request.POST, request.FILES, instance=event)
+        form = EventForm(request.POST, request.FILES, instance=event, user=request.user)
         if form.is_valid():
             form.save()
             messages.success(request, 'Event updated successfully.')
@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+class MarketplaceConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'marketplace'
+    verbose_name = 'Marketplace Maintenance'
@@ -0,0 +1,109 @@
+"""
+Listing lifecycle housekeeping for the marketplaces.
+
+Listings get an expiry_date when they are saved; expire_listings() moves
+the ones past it from ACTIVE to EXPIRED in bounded batches of
+UPDATE ... WHERE id IN (...), so the partial "status = 'ACTIVE'" indexes the
+list pages read stay as small as the live working set. Removed listings
+keep their uploads for a grace period, after which purge_listing_media()
+clears the file columns and releases the files.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from search.facets import invalidate_facets
+from search.models import SearchDocument
+
+EXPIRY_BATCH_SIZE = 500
+MEDIA_RETENTION_DAYS = getattr(settings, 'MARKETPLACE_REMOVED_MEDIA_RETENTION_DAYS', 30)
+
+# label -> (search document kind, statuses of listings withdrawn by their owner)
+EXPIRING_MODELS = {
+    'isell.SaleItem': ('item', ['REMOVED']),
+    'iwanttobuy.BuyRequest': ('request', ['CANCELLED']),
+}
+
+
+def installed_models():
+    models_ = []
+    for label, (kind, removed_statuses) in EXPIRING_MODELS.items():
+        try:
+            models_.append((apps.get_model(label), kind, removed_statuses))
+        except LookupError:
+            # App not installed in this deployment
+            continue
+    return models_
+
+
+def expire_model(model, kind, now, batch_size=EXPIRY_BATCH_SIZE):
+    """Mark active listings past their expiry date as EXPIRED; returns how many"""
+    expired = 0
+    while True:
+        with transaction.atomic():
+            # Served by the partial index on expiry_date WHERE status = 'ACTIVE'
+            ids = list(
+                model.objects.filter(status='ACTIVE', expiry_date__lte=now)
+                .order_by('expiry_date')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            model.objects.filter(id__in=ids, status='ACTIVE').update(status='EXPIRED', updated_at=now)
+            # update() sends no signals; keep the search index in step
+            SearchDocument.objects.filter(kind=kind, object_id__in=ids).update(is_active=False)
+        expired += len(ids)
+
+    if expired:
+        invalidate_facets(kind)
+    return expired
+
+
+def expire_listings(batch_size=EXPIRY_BATCH_SIZE):
+    """{label: listings expired} across the marketplaces"""
+    now = timezone.now()
+    return {
+        model._meta.label: expire_model(model, kind, now, batch_size)
+        for model, kind, _ in installed_models()
+    }
+
+
+def purge_listing_media(model, statuses, cutoff, batch_size=EXPIRY_BATCH_SIZE):
+    """Clear and release the uploads of listings withdrawn before `cutoff`; returns files released"""
+    file_fields = [field for field in model._meta.concrete_fields if isinstance(field, models.FileField)]
+    if not file_fields:
+        return 0
+    columns = [field.attname for field in file_fields]
+    has_media = models.Q()
+    for column in columns:
+        has_media |= models.Q(**{f"{column}__gt": ''})
+
+    released = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                model.objects.filter(has_media, status__in=statuses, updated_at__lt=cutoff)
+                .order_by('id')
+                .values_list('id', *columns)[:batch_size]
+            )
+            if not rows:
+                break
+            model.objects.filter(id__in=[row[0] for row in rows]).update(**{column: '' for column in columns})
+            for row in rows:
+                for field, name in zip(file_fields, row[1:]):
+                    if name:
+                        # Blobs lose a reference (the collector removes them); older files are deleted
+                        transaction.on_commit(lambda storage=field.storage, name=name: storage.delete(name))
+                        released += 1
+    return released
+
+
+def purge_removed_listing_media(days=MEDIA_RETENTION_DAYS, batch_size=EXPIRY_BATCH_SIZE):
+    """{label: files released} for listings removed more than `days` ago"""
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    return {
+        model._meta.label: purge_listing_media(model, removed_statuses, cutoff, batch_size)
+        for model, _, removed_statuses in installed_models()
+    }
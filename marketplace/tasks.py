@@ -0,0 +1,26 @@
+import logging
+
+from celery import shared_task
+
+from .lifecycle import EXPIRY_BATCH_SIZE, MEDIA_RETENTION_DAYS, expire_listings, purge_removed_listing_media
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def expire_marketplace_listings(batch_size=EXPIRY_BATCH_SIZE):
+    """Move listings past their expiry date from ACTIVE to EXPIRED"""
+    expired = expire_listings(batch_size)
+    total = sum(expired.values())
+    if total:
+        logger.info(f"Expired {total} marketplace listings: {expired}")
+    return total
+
+
+@shared_task
+def purge_removed_listing_uploads(days=MEDIA_RETENTION_DAYS, batch_size=EXPIRY_BATCH_SIZE):
+    """Release the uploads of listings their owners removed more than `days` ago"""
+    released = purge_removed_listing_media(days, batch_size)
+    total = sum(released.values())
+    logger.info(f"Released {total} uploads of removed marketplace listings: {released}")
+    return total
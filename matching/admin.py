@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import ListingMatch
+
+@admin.register(ListingMatch)
+class ListingMatchAdmin(admin.ModelAdmin):
+    list_display = ['buy_request_id', 'sale_item_id', 'requester', 'seller', 'score', 'created_at']
+    list_filter = ['created_at']
+    search_fields = ['requester__username', 'seller__username']
+    readonly_fields = ['buy_request_id', 'sale_item_id', 'requester', 'seller', 'score', 'created_at']
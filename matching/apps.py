@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+class MatchingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'matching'
+    verbose_name = 'Marketplace Matching'
+
+    def ready(self):
+        import matching.signals  # Import signals here
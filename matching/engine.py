@@ -0,0 +1,206 @@
+"""
+Buy request <-> sale item matching engine.
+
+Two in-memory inverted indexes, one over active buy requests and one over
+active sale items, map each normalized title/tag token to the listings that
+contain it. Every listing also keeps its price interval (a buy request's
+[min, max] range, a sale item's single price). Scoring a listing therefore
+costs one dictionary lookup per token plus a pass over the listings sharing
+a token, never a scan of the table.
+
+The indexes live in the process of the single-process `matching` Celery
+worker: they are rebuilt from the database when that worker starts (and
+hourly as a safety net) and kept current by the tasks the listing signals
+enqueue, so every update reaches the one copy of the index.
+"""
+
+import re
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.apps import apps
+from django.conf import settings
+
+MIN_SCORE = getattr(settings, 'MARKETPLACE_MATCH_MIN_SCORE', 0.5)
+# How far above a buyer's maximum a price may be and still match
+PRICE_TOLERANCE = Decimal(str(getattr(settings, 'MARKETPLACE_MATCH_PRICE_TOLERANCE', 0.1)))
+MAX_MATCHES = 20
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = {
+    'a', 'an', 'and', 'any', 'for', 'in', 'is', 'it', 'looking', 'new', 'of', 'on', 'or',
+    'sale', 'selling', 'the', 'to', 'used', 'want', 'wanted', 'with',
+}
+
+
+def tokenize(*texts):
+    """Normalized tokens of some text: lower case, no stopwords, naive singulars"""
+    tokens = set()
+    for text in texts:
+        for token in TOKEN_RE.findall((text or '').lower()):
+            if len(token) < 2 or token in STOPWORDS:
+                continue
+            if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+                token = token[:-1]
+            tokens.add(token)
+    return frozenset(tokens)
+
+
+class Entry:
+    __slots__ = ['tokens', 'low', 'high', 'owner_id']
+
+    def __init__(self, tokens, low, high, owner_id):
+        self.tokens = tokens
+        self.low = low
+        self.high = high
+        self.owner_id = owner_id
+
+
+class MatchIndex:
+    """Inverted index from token to listing ids, with a price interval per listing"""
+
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, listing_id, tokens, low, high, owner_id):
+        self.remove(listing_id)
+        if not tokens:
+            return
+        self.entries[listing_id] = Entry(tokens, low, high, owner_id)
+        for token in tokens:
+            self.postings[token].add(listing_id)
+
+    def remove(self, listing_id):
+        entry = self.entries.pop(listing_id, None)
+        if entry is None:
+            return
+        for token in entry.tokens:
+            postings = self.postings[token]
+            postings.discard(listing_id)
+            if not postings:
+                del self.postings[token]
+
+    def shared_tokens(self, tokens):
+        """{listing id: number of `tokens` it contains}"""
+        counts = Counter()
+        for token in tokens:
+            counts.update(self.postings.get(token, ()))
+        return counts
+
+
+def prices_overlap(low, high, other_low, other_high):
+    """Whether [low, high] meets [other_low, other_high]; None means unbounded"""
+    if high is not None and other_low is not None and other_low > high * (1 + PRICE_TOLERANCE):
+        return False
+    if low is not None and other_high is not None and other_high < low:
+        return False
+    return True
+
+
+def request_interval(low, high):
+    if low is not None and high is not None and low > high:
+        low, high = high, low
+    return low, high
+
+
+class MatchingEngine:
+    def __init__(self):
+        self.requests = MatchIndex()
+        self.items = MatchIndex()
+        self.built = False
+
+    def rebuild(self):
+        """Load every active buy request and sale item from the database"""
+        self.requests = MatchIndex()
+        self.items = MatchIndex()
+        for model, index, columns in self.sources():
+            rows = model.objects.filter(status='ACTIVE').values_list(*columns)
+            for row in rows.iterator(chunk_size=2000):
+                self.add_row(index, row)
+        self.built = True
+        return len(self.requests), len(self.items)
+
+    def sources(self):
+        sources = []
+        try:
+            sources.append((
+                apps.get_model('iwanttobuy', 'BuyRequest'), self.requests,
+                ['id', 'title', 'tags', 'price_range_min', 'price_range_max', 'requester_id'],
+            ))
+            sources.append((
+                apps.get_model('isell', 'SaleItem'), self.items,
+                ['id', 'title', 'tags', 'price', 'price', 'seller_id'],
+            ))
+        except LookupError:
+            # Matching needs both marketplaces
+            return []
+        return sources
+
+    def add_row(self, index, row):
+        listing_id, title, tags, low, high, owner_id = row
+        if index is self.requests:
+            low, high = request_interval(low, high)
+        index.add(listing_id, tokenize(title, tags), low, high, owner_id)
+
+    def update_request(self, buy_request):
+        if buy_request.status != 'ACTIVE':
+            self.requests.remove(buy_request.pk)
+            return
+        low, high = request_interval(buy_request.price_range_min, buy_request.price_range_max)
+        self.requests.add(
+            buy_request.pk, tokenize(buy_request.title, buy_request.tags), low, high, buy_request.requester_id
+        )
+
+    def update_item(self, item):
+        if item.status != 'ACTIVE':
+            self.items.remove(item.pk)
+            return
+        self.items.add(item.pk, tokenize(item.title, item.tags), item.price, item.price, item.seller_id)
+
+    def matches_for_item(self, item):
+        """[(buy request id, score)] for the open requests a sale item satisfies, best first"""
+        tokens = tokenize(item.title, item.tags)
+        matches = []
+        for request_id, shared in self.requests.shared_tokens(tokens).items():
+            entry = self.requests.entries[request_id]
+            if entry.owner_id == item.seller_id:
+                continue
+            if not prices_overlap(entry.low, entry.high, item.price, item.price):
+                continue
+            # Share of what the buyer asked for that the item mentions
+            score = shared / len(entry.tokens)
+            if score >= MIN_SCORE:
+                matches.append((request_id, score))
+        return sorted(matches, key=lambda match: -match[1])[:MAX_MATCHES]
+
+    def matches_for_request(self, buy_request):
+        """[(sale item id, score)] for the active items that satisfy a buy request, best first"""
+        tokens = tokenize(buy_request.title, buy_request.tags)
+        if not tokens:
+            return []
+        low, high = request_interval(buy_request.price_range_min, buy_request.price_range_max)
+        matches = []
+        for item_id, shared in self.items.shared_tokens(tokens).items():
+            entry = self.items.entries[item_id]
+            if entry.owner_id == buy_request.requester_id:
+                continue
+            if not prices_overlap(low, high, entry.low, entry.high):
+                continue
+            score = shared / len(tokens)
+            if score >= MIN_SCORE:
+                matches.append((item_id, score))
+        return sorted(matches, key=lambda match: -match[1])[:MAX_MATCHES]
+
+
+engine = MatchingEngine()
+
+
+def get_engine():
+    """The process-wide engine, built from the database on first use"""
+    if not engine.built:
+        engine.rebuild()
+    return engine
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.9 on 2026-10-19 05:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('buy_request_id', models.PositiveBigIntegerField()),
+                ('sale_item_id', models.PositiveBigIntegerField()),
+                ('score', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('requester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buy_request_matches', to=settings.AUTH_USER_MODEL)),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sale_item_matches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Listing Match',
+                'verbose_name_plural': 'Listing Matches',
+                'indexes': [models.Index(fields=['requester', '-created_at'], name='matching_li_request_2dfe36_idx'), models.Index(fields=['seller', '-created_at'], name='matching_li_seller__6ca585_idx')],
+                'unique_together': {('buy_request_id', 'sale_item_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class ListingMatch(models.Model):
+    """
+    A sale item found to match an open buy request. Stored so each pair is
+    announced only once, however often either listing is edited.
+    """
+    # Plain ids: the marketplace apps are optional and have no migrations
+    buy_request_id = models.PositiveBigIntegerField()
+    sale_item_id = models.PositiveBigIntegerField()
+    requester = models.ForeignKey(User, on_delete=models.CASCADE, related_name='buy_request_matches')
+    seller = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sale_item_matches')
+    score = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['buy_request_id', 'sale_item_id']
+        indexes = [
+            models.Index(fields=['requester', '-created_at']),
+            models.Index(fields=['seller', '-created_at']),
+        ]
+        verbose_name = 'Listing Match'
+        verbose_name_plural = 'Listing Matches'
+
+    def __str__(self):
+        return f"Buy request #{self.buy_request_id} ~ sale item #{self.sale_item_id} ({self.score:.2f})"
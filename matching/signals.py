@@ -0,0 +1,36 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .tasks import forget_listing, match_buy_request, match_sale_item
+
+# Fields the matcher reads; saves that touch none of them are ignored
+MATCHED_FIELDS = {
+    'isell.SaleItem': {'title', 'tags', 'price', 'status'},
+    'iwanttobuy.BuyRequest': {'title', 'tags', 'price_range_min', 'price_range_max', 'status'},
+}
+
+
+def queue_match(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not MATCHED_FIELDS[sender._meta.label].intersection(update_fields):
+        return
+    task = match_sale_item if sender._meta.label == 'isell.SaleItem' else match_buy_request
+    transaction.on_commit(lambda: task.delay(instance.pk))
+
+
+def queue_forget(sender, instance, **kwargs):
+    kind = 'item' if sender._meta.label == 'isell.SaleItem' else 'request'
+    listing_id = instance.pk
+    transaction.on_commit(lambda: forget_listing.delay(kind, listing_id))
+
+
+try:
+    listing_models = [apps.get_model(label) for label in MATCHED_FIELDS]
+except LookupError:
+    # Matching needs both marketplaces installed
+    listing_models = []
+
+for model in listing_models:
+    label = model._meta.label
+    post_save.connect(queue_match, sender=model, dispatch_uid=f'matching_match_{label}')
+    post_delete.connect(queue_forget, sender=model, dispatch_uid=f'matching_forget_{label}')
@@ -0,0 +1,153 @@
+import logging
+
+from celery import shared_task
+from celery.signals import worker_ready
+from django.apps import apps
+from django.urls import reverse
+
+from notifications.events import publish_event
+
+from .engine import engine, get_engine
+from .models import ListingMatch
+
+logger = logging.getLogger(__name__)
+
+MATCHING_QUEUE = 'matching'
+
+
+@worker_ready.connect
+def build_index_on_start(sender=None, **kwargs):
+    """Build the in-memory index as soon as the worker that owns it starts"""
+    app = getattr(sender, 'app', None)
+    if app is not None and MATCHING_QUEUE in app.amqp.queues.consume_from:
+        requests, items = engine.rebuild()
+        logger.info(f"Matching index built: {requests} buy requests, {items} sale items")
+
+
+def listing_models():
+    return apps.get_model('iwanttobuy', 'BuyRequest'), apps.get_model('isell', 'SaleItem')
+
+
+def record_matches(pairs):
+    """Store new (buy request, sale item, score) matches; returns the ones not seen before"""
+    BuyRequest, SaleItem = listing_models()
+    request_ids = {request_id for request_id, _, _ in pairs}
+    item_ids = {item_id for _, item_id, _ in pairs}
+
+    # The index can lag behind bulk updates; only announce listings that are still open
+    requests = BuyRequest.objects.filter(pk__in=request_ids, status='ACTIVE').in_bulk()
+    items = SaleItem.objects.filter(pk__in=item_ids, status='ACTIVE').in_bulk()
+    seen = set(
+        ListingMatch.objects.filter(buy_request_id__in=request_ids, sale_item_id__in=item_ids)
+        .values_list('buy_request_id', 'sale_item_id')
+    )
+
+    new = []
+    for request_id, item_id, score in pairs:
+        if (request_id, item_id) in seen or request_id not in requests or item_id not in items:
+            continue
+        new.append((requests[request_id], items[item_id], score))
+    ListingMatch.objects.bulk_create(
+        [
+            ListingMatch(
+                buy_request_id=buy_request.pk,
+                sale_item_id=item.pk,
+                requester_id=buy_request.requester_id,
+                seller_id=item.seller_id,
+                score=score,
+            )
+            for buy_request, item, score in new
+        ],
+        ignore_conflicts=True,
+    )
+    return new
+
+
+def announce(buy_request, item, score, notify):
+    data = {
+        'score': round(score, 2),
+        'buy_request': {
+            'id': buy_request.pk,
+            'title': buy_request.title,
+            'url': reverse('iwanttobuy:request_detail', args=[buy_request.pk]),
+        },
+        'sale_item': {
+            'id': item.pk,
+            'title': item.title,
+            'price': str(item.price),
+            'url': reverse('isell:item_detail', args=[item.pk]),
+        },
+    }
+    if notify == 'requester':
+        publish_event('marketplace.match', dict(data, role='buyer'), user=buy_request.requester)
+    else:
+        publish_event('marketplace.match', dict(data, role='seller'), user=item.seller)
+
+
+@shared_task
+def match_sale_item(item_id):
+    """Index a new or edited sale item and tell the buyers whose open requests it matches"""
+    _, SaleItem = listing_models()
+    matching = get_engine()
+    item = SaleItem.objects.filter(pk=item_id).first()
+    if item is None:
+        matching.items.remove(item_id)
+        return 0
+
+    matching.update_item(item)
+    if item.status != 'ACTIVE':
+        return 0
+    pairs = [(request_id, item.pk, score) for request_id, score in matching.matches_for_item(item)]
+    new = record_matches(pairs)
+    for buy_request, matched_item, score in new:
+        announce(buy_request, matched_item, score, notify='requester')
+    if new:
+        logger.info(f"Sale item {item_id} matched {len(new)} buy requests")
+    return len(new)
+
+
+@shared_task
+def match_buy_request(request_id):
+    """Index a new or edited buy request and tell the sellers of items that satisfy it"""
+    BuyRequest, _ = listing_models()
+    matching = get_engine()
+    buy_request = BuyRequest.objects.filter(pk=request_id).first()
+    if buy_request is None:
+        matching.requests.remove(request_id)
+        return 0
+
+    matching.update_request(buy_request)
+    if buy_request.status != 'ACTIVE':
+        return 0
+    pairs = [(buy_request.pk, item_id, score) for item_id, score in matching.matches_for_request(buy_request)]
+    new = record_matches(pairs)
+    for matched_request, item, score in new:
+        announce(matched_request, item, score, notify='seller')
+    if new:
+        # One event for the buyer, listing what is already for sale
+        publish_event('marketplace.matches', {
+            'buy_request': {'id': buy_request.pk, 'title': buy_request.title},
+            'sale_items': [
+                {'id': item.pk, 'title': item.title, 'price': str(item.price),
+                 'url': reverse('isell:item_detail', args=[item.pk])}
+                for _, item, _ in new
+            ],
+        }, user=buy_request.requester)
+        logger.info(f"Buy request {request_id} matched {len(new)} sale items")
+    return len(new)
+
+
+@shared_task
+def forget_listing(kind, listing_id):
+    """Drop a deleted listing from the index"""
+    matching = get_engine()
+    index = matching.requests if kind == 'request' else matching.items
+    index.remove(listing_id)
+
+
+@shared_task
+def rebuild_matching_index():
+    """Reload the index from the database, picking up changes made without signals"""
+    requests, items = engine.rebuild()
+    logger.info(f"Matching index rebuilt: {requests} buy requests, {items} sale items")
+    return requests + items
@@ -0,0 +1,28 @@
+from django.contrib import admin
+from .models import ChunkedUpload, ProcessedImage, ImageDerivative, StoredBlob
+
+class ImageDerivativeInline(admin.TabularInline):
+    model = ImageDerivative
+    extra = 0
+    readonly_fields = ['name', 'format', 'width', 'height', 'size']
+
+@admin.register(ProcessedImage)
+class ProcessedImageAdmin(admin.ModelAdmin):
+    list_display = ['source', 'width', 'height', 'processed_at']
+    search_fields = ['source']
+    readonly_fields = ['processed_at']
+    inlines = [ImageDerivativeInline]
+
+@admin.register(ChunkedUpload)
+class ChunkedUploadAdmin(admin.ModelAdmin):
+    list_display = ['filename', 'user', 'size', 'offset', 'status', 'protected', 'claimed', 'created_at']
+    list_filter = ['status', 'protected', 'claimed', 'created_at']
+    search_fields = ['filename', 'user__username']
+    readonly_fields = ['id', 'size', 'offset', 'protected', 'file', 'protected_file', 'created_at', 'completed_at']
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'refcount', 'created_at', 'updated_at']
+    list_filter = ['created_at']
+    search_fields = ['name', 'digest']
+    readonly_fields = ['name', 'digest', 'size', 'refcount', 'created_at', 'updated_at']
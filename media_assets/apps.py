@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+class MediaAssetsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'media_assets'
+    verbose_name = 'Media Assets'
+
+    def ready(self):
+        import media_assets.signals  # Import signals here
@@ -0,0 +1,116 @@
+from django import forms
+from django.core.files import File
+from django.urls import reverse
+
+from .models import ChunkedUpload
+from .storage import protected_storage
+from .uploads import CHUNK_SIZE
+
+
+def upload_field_name(name):
+    return f"{name}_upload_id"
+
+
+class ChunkedFileInput(forms.FileInput):
+    """
+    File input that static/js/chunked_upload.js uploads in resumable chunks.
+    Renders a hidden companion input that receives the finished upload id.
+    Uploads for a protected field are assembled straight into protected storage.
+    """
+
+    upload_id = ''
+    protected = False
+
+    def render(self, name, value, attrs=None, renderer=None):
+        hidden_name = upload_field_name(name)
+        hidden_id = upload_field_name((attrs or {}).get('id') or f"id_{name}")
+        attrs = dict(attrs or {}, **{
+            'data-chunked-upload': hidden_id,
+            'data-upload-url': reverse('media_assets:create_upload') + ('?protected=1' if self.protected else ''),
+            'data-chunk-size': CHUNK_SIZE,
+        })
+        file_input = super().render(name, value, attrs, renderer)
+        hidden_input = forms.HiddenInput().render(hidden_name, self.upload_id, {'id': hidden_id}, renderer)
+        return file_input + hidden_input
+
+
+class ChunkedUploadFormMixin:
+    """
+    ModelForm mixin letting the media fields in `chunked_upload_fields` take
+    a finished chunked upload instead of a file in the request. The assembled
+    file goes through the field's normal validation (including clean_<field>)
+    and is then attached by name, without being copied. Protected media
+    fields get uploads assembled in protected storage; should one arrive in
+    the public storage anyway, it is copied and the public blob released.
+    """
+
+    chunked_upload_fields = []
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = user
+        self.chunked_uploads = {}
+        self.chunked_upload_errors = {}
+
+        for name in self.chunked_upload_fields:
+            field = self.fields[name]
+            field.widget = ChunkedFileInput(attrs=field.widget.attrs)
+            field.widget.protected = self._meta.model._meta.get_field(name).storage is protected_storage
+            if not self.is_bound:
+                continue
+
+            upload_id = self.data.get(self.add_prefix(upload_field_name(name)))
+            if not upload_id:
+                continue
+            field.widget.upload_id = upload_id
+
+            upload = self.get_chunked_upload(upload_id)
+            if upload is None:
+                self.chunked_upload_errors[name] = 'The uploaded file could not be found or is not complete.'
+                continue
+            self.chunked_uploads[name] = upload
+            self.files = self.files.copy()
+            self.files[self.add_prefix(name)] = upload.assembled_file
+
+    def get_chunked_upload(self, upload_id):
+        if self.user is None or not self.user.is_authenticated:
+            return None
+        try:
+            return ChunkedUpload.objects.get(id=upload_id, user=self.user, status='COMPLETE')
+        except (ChunkedUpload.DoesNotExist, ValueError, forms.ValidationError):
+            return None
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name, error in self.chunked_upload_errors.items():
+            self.add_error(name, error)
+        for name, upload in self.chunked_uploads.items():
+            if not cleaned_data.get(name):
+                continue
+            assembled = upload.assembled_file
+            if self._meta.model._meta.get_field(name).storage is assembled.storage:
+                # Point the model field at the stored file rather than re-saving it
+                cleaned_data[name] = assembled.name
+            else:
+                # Streamed into the field's own storage when the object is saved
+                cleaned_data[name] = File(assembled.open('rb'), name=upload.filename)
+        return cleaned_data
+
+    def save(self, commit=True):
+        instance = super().save(commit)
+        claimed = {name: upload for name, upload in self.chunked_uploads.items() if name in self.cleaned_data}
+        if claimed:
+            ChunkedUpload.objects.filter(id__in=[upload.id for upload in claimed.values()]).update(claimed=True)
+            for name, upload in claimed.items():
+                assembled = upload.assembled_file
+                if not isinstance(self.cleaned_data[name], str):
+                    # Copied into another storage (public upload, protected field): drop the
+                    # upload's own reference now instead of leaving the blob public until purge
+                    assembled.storage.delete(assembled.name)
+                    ChunkedUpload.objects.filter(id=upload.id).update(**{assembled.field.name: ''})
+                    continue
+                add_reference = getattr(assembled.storage, 'add_reference', None)
+                if add_reference:
+                    # The saved object is a second reference to the assembled blob
+                    add_reference(assembled.name)
+        return instance
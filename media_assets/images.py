@@ -0,0 +1,136 @@
+"""
+Derivatives pipeline for uploaded images.
+
+Originals are stored as uploaded (up to 5 MB). For each one we generate a
+small set of resized WebP copies at fixed widths, with EXIF metadata
+(including GPS position) stripped, and record their dimensions so templates
+can emit srcset/width/height without touching the files.
+"""
+
+import hashlib
+import io
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from .models import ImageDerivative, ProcessedImage
+
+# Image fields that feed the pipeline, by model label
+IMAGE_FIELDS = {
+    'community_chat.Message': ['image'],
+    'isell.SaleItem': ['main_image', 'additional_image1', 'additional_image2'],
+    'iwanttobuy.BuyRequest': ['reference_image'],
+    'services.ServiceListing': ['profile_image', 'gallery_image1', 'gallery_image2', 'gallery_image3'],
+    'kingspark_events.Event': ['image'],
+}
+
+DERIVATIVE_WIDTHS = getattr(settings, 'MEDIA_DERIVATIVE_WIDTHS', [320, 640, 1280])
+DERIVATIVE_FORMAT = getattr(settings, 'MEDIA_DERIVATIVE_FORMAT', 'webp')
+DERIVATIVE_QUALITY = getattr(settings, 'MEDIA_DERIVATIVE_QUALITY', 80)
+CACHE_TIMEOUT = 60 * 60 * 24
+PENDING_CACHE_TIMEOUT = 60
+
+
+def cache_key(source):
+    return f"media_assets:derivatives:{hashlib.md5(source.encode()).hexdigest()}"
+
+
+def derivative_name(source, width):
+    """Storage name for one derivative, alongside the other derivatives of the source"""
+    base, _ = os.path.splitext(source)
+    return f"derivatives/{base}_{width}w.{DERIVATIVE_FORMAT}"
+
+
+def process_image(source):
+    """Generate derivatives for one stored image; safe to call more than once"""
+    if ProcessedImage.objects.filter(source=source).exists():
+        return None
+
+    with default_storage.open(source, 'rb') as f:
+        original = Image.open(f)
+        # Apply the EXIF orientation to the pixels; the saved copies carry no EXIF
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    if original.mode not in ('RGB', 'RGBA'):
+        original = original.convert('RGBA' if 'transparency' in original.info else 'RGB')
+
+    width, height = original.size
+    widths = [w for w in DERIVATIVE_WIDTHS if w < width] or [min(DERIVATIVE_WIDTHS[0], width)]
+
+    derivatives = []
+    for target in widths:
+        resized = original.copy()
+        resized.thumbnail((target, target * 10), Image.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, format=DERIVATIVE_FORMAT.upper(), quality=DERIVATIVE_QUALITY, method=4)
+        name = derivative_name(source, target)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        name = default_storage.save(name, ContentFile(buffer.getvalue()))
+        derivatives.append(ImageDerivative(
+            name=name,
+            format=DERIVATIVE_FORMAT,
+            width=resized.width,
+            height=resized.height,
+            size=buffer.tell(),
+        ))
+
+    with transaction.atomic():
+        image = ProcessedImage.objects.create(source=source, width=width, height=height)
+        for derivative in derivatives:
+            derivative.image = image
+        ImageDerivative.objects.bulk_create(derivatives)
+
+    cache.delete(cache_key(source))
+    return image
+
+
+def get_derivatives(source):
+    """
+    Return (width, height, [(url, width), ...]) for a processed image, or None
+    if it has not been processed yet. Pages rendering many images should use
+    get_derivatives_many, which costs one cache and one database round trip.
+    """
+    return get_derivatives_many([source]).get(source)
+
+
+def get_derivatives_many(sources):
+    """
+    Derivatives for several images at once, as {source: get_derivatives(source)}.
+
+    The default cache is database backed, so this reads every key in one
+    get_many and loads all the misses with a single query.
+    """
+    sources = {source for source in sources if source}
+    if not sources:
+        return {}
+
+    keys = {cache_key(source): source for source in sources}
+    cached = cache.get_many(keys)
+    results = {keys[key]: value or None for key, value in cached.items()}
+
+    missing = sources - results.keys()
+    if missing:
+        processed, pending = {}, {}
+        for image in ProcessedImage.objects.filter(source__in=missing).prefetch_related('derivatives'):
+            results[image.source] = processed[cache_key(image.source)] = (
+                image.width,
+                image.height,
+                [(default_storage.url(d.name), d.width) for d in image.derivatives.all()],
+            )
+        for source in missing - results.keys():
+            # Remember briefly that it is pending so a busy page doesn't re-query
+            results[source] = None
+            pending[cache_key(source)] = ()
+        if processed:
+            cache.set_many(processed, CACHE_TIMEOUT)
+        if pending:
+            cache.set_many(pending, PENDING_CACHE_TIMEOUT)
+
+    return results
@@ -0,0 +1,107 @@
+import hashlib
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from media_assets.models import ProcessedImage
+from media_assets.storage import ContentAddressedStorage, blob_columns, recount_blob_references
+
+
+class Command(BaseCommand):
+    help = 'Move media stored before the content-addressed backend into it, sharing identical files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Rows to read per query'
+        )
+
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only hash the files and report how much space deduplication would save'
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError('DEFAULT_FILE_STORAGE is not media_assets.storage.ContentAddressedStorage')
+
+        moved = {}
+        digests = {}
+        seen_digests = set()
+        missing = 0
+        total_bytes = 0
+        duplicate_bytes = 0
+
+        for model, column, storage in blob_columns():
+            rows = (
+                model._default_manager.exclude(**{f"{column}__startswith": storage.blob_prefix})
+                .exclude(**{column: ''})
+                .exclude(**{f"{column}__isnull": True})
+                .values_list('pk', column)
+            )
+            for pk, name in rows.iterator(chunk_size=options['batch_size']):
+                if name in moved:
+                    # Already moved while handling another column
+                    model._default_manager.filter(pk=pk).update(**{column: moved[name][1]})
+                    continue
+                if name in digests:
+                    continue
+                if not storage.exists(name):
+                    missing += 1
+                    continue
+
+                size = storage.size(name)
+                total_bytes += size
+                if options['dry_run']:
+                    digest = self.hash_file(storage, name)
+                    if digest in seen_digests:
+                        duplicate_bytes += size
+                    seen_digests.add(digest)
+                    digests[name] = digest
+                    continue
+
+                with storage.open(name, 'rb') as f:
+                    blob = storage.save(name, f)
+                moved[name] = (storage, blob)
+                updated = model._default_manager.filter(**{column: name}).update(**{column: blob})
+                self.move_processed_image(name, blob)
+                self.stdout.write(f"{name} -> {blob} ({updated} rows)")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f"{len(digests)} files, {total_bytes / 1024 / 1024:.1f} MB; "
+                f"deduplication would save {duplicate_bytes / 1024 / 1024:.1f} MB ({missing} missing)"
+            ))
+            return
+
+        # Every row that pointed at a file now points at its blob; the originals can go
+        for name, (storage, _) in moved.items():
+            if storage is not default_storage and default_storage.is_blob(name):
+                # A public blob moving to another store; the collector decides when it goes
+                continue
+            storage.delete(name)
+        recount_blob_references(options['batch_size'])
+
+        blobs = {(storage, blob) for storage, blob in moved.values()}
+        stored_bytes = sum(storage.size(blob) for storage, blob in blobs)
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved {len(moved)} files into {len(blobs)} blobs, "
+            f"{total_bytes / 1024 / 1024:.1f} MB -> {stored_bytes / 1024 / 1024:.1f} MB ({missing} missing)"
+        ))
+
+    def hash_file(self, storage, name):
+        digest = hashlib.sha256()
+        with storage.open(name, 'rb') as f:
+            for chunk in f.chunks():
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def move_processed_image(self, name, blob):
+        """Keep derivatives attached to the renamed source, dropping a duplicate set"""
+        if ProcessedImage.objects.filter(source=blob).exists():
+            ProcessedImage.objects.filter(source=name).delete()
+        else:
+            ProcessedImage.objects.filter(source=name).update(source=blob)
@@ -0,0 +1,44 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from media_assets.images import IMAGE_FIELDS, process_image
+from media_assets.models import ProcessedImage
+from media_assets.tasks import generate_image_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Generate image derivatives for existing uploads that have not been processed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Process in this process instead of queueing Celery tasks'
+        )
+
+    def handle(self, *args, **options):
+        processed = set(ProcessedImage.objects.values_list('source', flat=True))
+        queued = 0
+
+        for label, fields in IMAGE_FIELDS.items():
+            try:
+                model = apps.get_model(label)
+            except LookupError:
+                continue
+
+            for row in model.objects.values_list(*fields).iterator():
+                for source in row:
+                    if not source or source in processed:
+                        continue
+                    processed.add(source)
+                    if options['sync']:
+                        try:
+                            process_image(source)
+                        except Exception as e:
+                            self.stderr.write(self.style.ERROR(f"Failed to process {source}: {e}"))
+                            continue
+                    else:
+                        generate_image_derivatives.delay(source)
+                    queued += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{'Processed' if options['sync'] else 'Queued'} {queued} images"))
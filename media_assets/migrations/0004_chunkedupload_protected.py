@@ -0,0 +1,24 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:45
+
+from django.db import migrations, models
+import media_assets.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_assets', '0003_storedblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chunkedupload',
+            name='protected',
+            field=models.BooleanField(default=False, help_text='Assembled into protected storage instead'),
+        ),
+        migrations.AddField(
+            model_name='chunkedupload',
+            name='protected_file',
+            field=models.FileField(blank=True, help_text='The assembled file of a protected upload, once complete', storage=media_assets.storage.ContentAddressedStorage(blob_prefix='protected/'), upload_to='uploads/'),
+        ),
+    ]
@@ -0,0 +1,115 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .storage import protected_storage
+
+
+class ProcessedImage(models.Model):
+    """An uploaded image that has been through the derivatives pipeline"""
+    source = models.CharField(max_length=255, unique=True, help_text="Storage name of the original upload")
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    processed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Processed Image'
+        verbose_name_plural = 'Processed Images'
+
+    def __str__(self):
+        return f"{self.source} ({self.width}x{self.height})"
+
+
+class ImageDerivative(models.Model):
+    """A resized, EXIF-free copy of a processed image"""
+    image = models.ForeignKey(ProcessedImage, on_delete=models.CASCADE, related_name='derivatives')
+    name = models.CharField(max_length=255, help_text="Storage name of the derivative file")
+    format = models.CharField(max_length=10, default='webp')
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size = models.PositiveIntegerField(help_text="File size in bytes")
+
+    class Meta:
+        ordering = ['width']
+        unique_together = ['image', 'width', 'format']
+        verbose_name = 'Image Derivative'
+        verbose_name_plural = 'Image Derivatives'
+
+    def __str__(self):
+        return f"{self.name} ({self.width}w)"
+
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload sent in chunks. Each chunk is written to storage as
+    its own part; once every byte has arrived the parts are streamed into a
+    single file and forms can reference the upload by its id. Uploads meant
+    for a protected media field are assembled into protected storage, so
+    they never have a public URL.
+    """
+    STATUS_CHOICES = [
+        ('UPLOADING', 'Uploading'),
+        ('COMPLETE', 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chunked_uploads')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.BigIntegerField(help_text="Total size in bytes, declared when the upload is created")
+    offset = models.BigIntegerField(default=0, help_text="Bytes received so far")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='UPLOADING')
+    file = models.FileField(upload_to='uploads/', blank=True, help_text="The assembled file, once complete")
+    protected = models.BooleanField(default=False, help_text="Assembled into protected storage instead")
+    protected_file = models.FileField(
+        upload_to='uploads/', storage=protected_storage, blank=True,
+        help_text="The assembled file of a protected upload, once complete",
+    )
+    claimed = models.BooleanField(default=False, help_text="Attached to a saved object by a form")
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+        verbose_name = 'Chunked Upload'
+        verbose_name_plural = 'Chunked Uploads'
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size} bytes)"
+
+    @property
+    def is_complete(self):
+        return self.status == 'COMPLETE'
+
+    @property
+    def assembled_file(self):
+        return self.protected_file if self.protected else self.file
+
+
+class StoredBlob(models.Model):
+    """
+    One file in the content-addressed media store, named by its SHA-256
+    digest. `refcount` counts the database rows pointing at it; blobs at
+    zero are removed by the garbage collector.
+    """
+    name = models.CharField(max_length=100, unique=True, help_text="Storage name, blobs/<aa>/<bb>/<digest><ext>")
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField(help_text="File size in bytes")
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['refcount', 'updated_at']),
+        ]
+        verbose_name = 'Stored Blob'
+        verbose_name_plural = 'Stored Blobs'
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} references)"
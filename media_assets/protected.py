@@ -0,0 +1,76 @@
+"""
+Access-checked serving for uploaded documents and videos.
+
+Fields listed in PROTECTED_FIELDS use `protected_storage`, which nginx does
+not serve publicly. Templates link to protected_media instead of the file
+URL; the view checks the user may see the object, then hands the transfer
+(including Range requests) to nginx with X-Accel-Redirect.
+"""
+
+from django.apps import apps
+from django.db.models import Q
+from django.urls import reverse
+
+# By model label: the protected fields, the owner field, and the filter an
+# object must match to be visible to other signed-in users
+PROTECTED_FIELDS = {
+    'community_chat.Message': {
+        'fields': ['pdf', 'video'],
+        'owner': 'author',
+        'visible': {'is_deleted': False},
+    },
+    'kingspark_events.Event': {
+        'fields': ['flyer'],
+        'owner': 'organizer',
+        'visible': {'status': 'approved'},
+    },
+    'isell.SaleItem': {
+        'fields': ['video', 'pdf_document'],
+        'owner': 'seller',
+        'visible': {'status': 'ACTIVE'},
+    },
+    'iwanttobuy.BuyRequest': {
+        'fields': ['pdf_document'],
+        'owner': 'requester',
+        'visible': {'status': 'ACTIVE'},
+    },
+    'piecejobs.BusinessService': {
+        'fields': ['pdf_document', 'video'],
+        'owner': 'poster',
+        'visible': {'status': 'OPEN'},
+    },
+    'services.ServiceListing': {
+        'fields': ['portfolio_pdf'],
+        'owner': 'provider',
+        'visible': {'status': 'ACTIVE'},
+    },
+}
+
+
+def protected_url(instance, field):
+    """URL of the access-checked view for one file field, or '' if it is empty"""
+    if not getattr(instance, field):
+        return ''
+    return reverse('media_assets:protected_media', args=[instance._meta.label, instance.pk, field])
+
+
+def get_protected_file(label, pk, field, user):
+    """
+    Return (model field, stored file name) if `user` may read the file, else
+    None. Staff see everything; owners see their own objects.
+    """
+    config = PROTECTED_FIELDS.get(label)
+    if config is None or field not in config['fields']:
+        return None
+    try:
+        model = apps.get_model(label)
+    except LookupError:
+        return None
+
+    queryset = model._default_manager.filter(pk=pk)
+    if not user.is_staff:
+        queryset = queryset.filter(Q(**config['visible']) | Q(**{config['owner']: user}))
+    name = queryset.values_list(field, flat=True).first()
+    if not name:
+        return None
+    return model._meta.get_field(field), name
@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.db import transaction
+from django.core.files.storage import default_storage
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+
+from .images import IMAGE_FIELDS
+from .models import ProcessedImage
+from .storage import ContentAddressedStorage
+from .tasks import generate_image_derivatives
+
+
+def queue_image_derivatives(sender, instance, **kwargs):
+    """Queue derivative generation for any image field not yet processed"""
+    sources = [
+        getattr(instance, field).name
+        for field in IMAGE_FIELDS[sender._meta.label]
+        if getattr(instance, field)
+    ]
+    if not sources:
+        return
+
+    processed = set(ProcessedImage.objects.filter(source__in=sources).values_list('source', flat=True))
+    for source in sources:
+        if source not in processed:
+            transaction.on_commit(lambda source=source: generate_image_derivatives.delay(source))
+
+
+def release_blobs(sender, instance, **kwargs):
+    """Drop the references a deleted row held on content-addressed blobs"""
+    for field in sender._meta.concrete_fields:
+        if not isinstance(field, models.FileField) or not isinstance(field.storage, ContentAddressedStorage):
+            continue
+        name = getattr(instance, field.attname).name
+        if field.storage.is_blob(name):
+            transaction.on_commit(lambda storage=field.storage, name=name: storage.release(name))
+
+
+if isinstance(default_storage, ContentAddressedStorage):
+    post_delete.connect(release_blobs, dispatch_uid='media_assets_release_blobs')
+
+for label in IMAGE_FIELDS:
+    try:
+        model = apps.get_model(label)
+    except LookupError:
+        # App not installed in this deployment
+        continue
+    post_save.connect(queue_image_derivatives, sender=model, dispatch_uid=f'media_assets_{label}')
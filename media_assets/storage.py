@@ -0,0 +1,220 @@
+"""
+Content-addressed, deduplicating media storage.
+
+Uploads are hashed while they are streamed to a temporary file, then moved
+to blobs/<aa>/<bb>/<sha256><ext>. A file whose content is already stored is
+discarded and the existing blob is reused, so identical uploads across apps
+share one file and one URL. Each save adds a reference and each delete
+drops one; blobs are only removed from disk by the garbage collector
+(media_assets.tasks.collect_media_blobs), in batches. The collector also
+sweeps files whose row never committed because the saving transaction
+was rolled back.
+
+`protected_storage` keeps its blobs under protected/, which nginx only
+serves through X-Accel-Redirect from the access-checked media view.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+BLOB_PREFIX = 'blobs/'
+PROTECTED_BLOB_PREFIX = 'protected/'
+
+# Plain-text columns that also hold blob names (not FileFields)
+EXTRA_BLOB_REFERENCES = [
+    ('media_assets.ImageDerivative', 'name'),
+]
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that stores each distinct file once, under its digest"""
+
+    def __init__(self, blob_prefix=BLOB_PREFIX, **kwargs):
+        super().__init__(**kwargs)
+        self.blob_prefix = blob_prefix
+
+    def is_blob(self, name):
+        return bool(name) and name.startswith(self.blob_prefix)
+
+    def blob_name_for(self, digest, ext):
+        return f"{self.blob_prefix}{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+    @property
+    def tmp_dir(self):
+        return f"{self.blob_prefix}tmp"
+
+    def _save(self, name, content):
+        StoredBlob = apps.get_model('media_assets', 'StoredBlob')
+        ext = os.path.splitext(name)[1].lower()[:10]
+        tmp_dir = self.path(self.tmp_dir)
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+
+            digest = digest.hexdigest()
+            blob_name = self.blob_name_for(digest, ext)
+            with transaction.atomic():
+                # Take the reference first; the row lock keeps the collector from removing the file under us
+                while True:
+                    blob, created = StoredBlob.objects.get_or_create(
+                        name=blob_name, defaults={'digest': digest, 'size': size, 'refcount': 1}
+                    )
+                    if created or StoredBlob.objects.filter(pk=blob.pk).update(
+                        refcount=F('refcount') + 1,
+                        updated_at=timezone.now(),
+                    ):
+                        break
+                    # The collector deleted the row in between; record the blob afresh
+
+                full_path = self.path(blob_name)
+                if not os.path.exists(full_path):
+                    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                    os.chmod(tmp_path, self.file_permissions_mode or 0o644)
+                    os.replace(tmp_path, full_path)
+                elif created:
+                    # A file whose row was rolled back; freshen it so the collector's sweep leaves it alone
+                    os.utime(full_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return blob_name
+
+    def get_available_name(self, name, max_length=None):
+        # The name is replaced by the digest in _save, so there is nothing to avoid
+        return name
+
+    def delete(self, name):
+        """Drop one reference to a blob; files stored before this backend are deleted as usual"""
+        if not self.is_blob(name):
+            return super().delete(name)
+        self.release(name)
+
+    def add_reference(self, name, count=1):
+        """Record another row pointing at an already-stored blob"""
+        if self.is_blob(name):
+            apps.get_model('media_assets', 'StoredBlob').objects.filter(name=name).update(
+                refcount=F('refcount') + count,
+                updated_at=timezone.now(),
+            )
+
+    def release(self, name, count=1):
+        if self.is_blob(name):
+            apps.get_model('media_assets', 'StoredBlob').objects.filter(name=name).update(
+                refcount=F('refcount') - count,
+                updated_at=timezone.now(),
+            )
+
+    def remove_blob(self, name):
+        """Delete a blob's file from disk; only the garbage collector should call this"""
+        super().delete(name)
+
+    def remove_unrecorded_files(self, cutoff):
+        """
+        Delete blob files with no StoredBlob row, last touched before `cutoff`:
+        left on disk by a save whose transaction was rolled back.
+        """
+        StoredBlob = apps.get_model('media_assets', 'StoredBlob')
+        removed = 0
+        for directory in self.blob_directories():
+            try:
+                _, files = self.listdir(directory)
+            except FileNotFoundError:
+                continue
+            names = [f"{directory}/{name}" for name in files]
+            recorded = set(StoredBlob.objects.filter(name__in=names).values_list('name', flat=True))
+            for name in names:
+                if name not in recorded and self.get_modified_time(name) < cutoff:
+                    self.remove_blob(name)
+                    removed += 1
+        return removed
+
+    def blob_directories(self):
+        """The blobs/<aa>/<bb> directories holding files"""
+        root = self.blob_prefix.rstrip('/')
+        try:
+            first_level, _ = self.listdir(root)
+        except FileNotFoundError:
+            return
+        for first in first_level:
+            if f"{root}/{first}" == self.tmp_dir:
+                continue
+            second_level, _ = self.listdir(f"{root}/{first}")
+            for second in second_level:
+                yield f"{root}/{first}/{second}"
+
+    def remove_stale_temporary_files(self, cutoff):
+        """Delete temporary files left behind by saves that crashed before their rename"""
+        try:
+            _, files = self.listdir(self.tmp_dir)
+        except FileNotFoundError:
+            return 0
+        removed = 0
+        for name in files:
+            path = f"{self.tmp_dir}/{name}"
+            if self.get_modified_time(path) < cutoff:
+                super().delete(path)
+                removed += 1
+        return removed
+
+
+protected_storage = ContentAddressedStorage(blob_prefix=PROTECTED_BLOB_PREFIX)
+
+
+def blob_columns():
+    """(model, column, storage) for every FileField kept in a content-addressed storage"""
+    return [
+        (model, field.attname, field.storage)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def count_blob_references():
+    """Count, from the database, how many rows point at each blob"""
+    references = Counter()
+    columns = blob_columns()
+    columns += [(apps.get_model(label), column, default_storage) for label, column in EXTRA_BLOB_REFERENCES]
+
+    for model, column, storage in columns:
+        rows = (
+            model._default_manager.filter(**{f"{column}__startswith": storage.blob_prefix})
+            .order_by()
+            .values(column)
+            .annotate(n=models.Count('pk'))
+        )
+        for row in rows:
+            references[row[column]] += row['n']
+    return references
+
+
+def recount_blob_references(batch_size=500):
+    """Reset every refcount from the database; returns the number of blobs corrected"""
+    StoredBlob = apps.get_model('media_assets', 'StoredBlob')
+    references = count_blob_references()
+    changed = []
+    for blob in StoredBlob.objects.only('id', 'name', 'refcount').iterator(chunk_size=batch_size):
+        refcount = references.get(blob.name, 0)
+        if blob.refcount != refcount:
+            blob.refcount = refcount
+            blob.updated_at = timezone.now()
+            changed.append(blob)
+    StoredBlob.objects.bulk_update(changed, ['refcount', 'updated_at'], batch_size=batch_size)
+    return len(changed)
@@ -0,0 +1,131 @@
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .images import IMAGE_FIELDS, process_image
+from .models import ChunkedUpload, ProcessedImage, StoredBlob
+from .storage import ContentAddressedStorage, protected_storage, recount_blob_references
+from .uploads import EXPIRY_HOURS, delete_parts
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def generate_image_derivatives(source):
+    """Generate resized, EXIF-free derivatives for an uploaded image"""
+    try:
+        image = process_image(source)
+    except Exception as e:
+        logger.error(f"Error generating derivatives for {source}: {e}")
+        return None
+
+    if image is None:
+        return None
+    logger.info(f"Generated derivatives for {source} ({image.width}x{image.height})")
+    return image.id
+
+
+@shared_task
+def purge_chunked_uploads(hours=EXPIRY_HOURS):
+    """
+    Remove chunked uploads older than `hours`: parts of abandoned uploads, and
+    assembled files that no form ever attached. Claimed files are kept.
+    """
+    cutoff = timezone.now() - timedelta(hours=hours)
+    purged = 0
+    for upload in ChunkedUpload.objects.filter(created_at__lt=cutoff).iterator():
+        if not upload.is_complete:
+            delete_parts(upload)
+        elif not upload.claimed and upload.assembled_file:
+            upload.assembled_file.delete(save=False)
+        upload.delete()
+        purged += 1
+    logger.info(f"Purged {purged} chunked uploads older than {hours} hours")
+    return purged
+
+
+@shared_task
+def purge_orphaned_derivatives(batch_size=500):
+    """
+    Delete the derivatives of images that no row points at any more (deleted
+    or purged listings, replaced photos). The nightly blob recount then lets
+    the collector remove their files.
+    """
+    columns = []
+    for label, fields in IMAGE_FIELDS.items():
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            continue
+        columns += [(model, field) for field in fields]
+
+    purged = 0
+    last_id = 0
+    while True:
+        batch = list(
+            ProcessedImage.objects.filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', 'source')[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1][0]
+        sources = {source for _, source in batch}
+        in_use = set()
+        for model, field in columns:
+            in_use.update(
+                model._default_manager.filter(**{f"{field}__in": sources}).values_list(field, flat=True)
+            )
+        orphaned = [image_id for image_id, source in batch if source not in in_use]
+        if orphaned:
+            ProcessedImage.objects.filter(id__in=orphaned).delete()
+            purged += len(orphaned)
+
+    logger.info(f"Purged derivatives of {purged} images no longer in use")
+    return purged
+
+
+@shared_task
+def collect_media_blobs(batch_size=500, grace_hours=24, recount=False):
+    """
+    Remove content-addressed blobs that nothing has referenced for
+    `grace_hours`, `batch_size` at a time. With `recount`, first reset every
+    refcount from the rows that actually point at each blob.
+    """
+    if not isinstance(default_storage, ContentAddressedStorage):
+        return 0
+
+    if recount:
+        corrected = recount_blob_references(batch_size)
+        logger.info(f"Corrected {corrected} blob reference counts")
+
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+    removed = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                StoredBlob.objects.select_for_update()
+                .filter(refcount__lte=0, updated_at__lt=cutoff)
+                .order_by('id')[:batch_size]
+            )
+            if not batch:
+                break
+            for blob in batch:
+                default_storage.remove_blob(blob.name)
+            StoredBlob.objects.filter(id__in=[blob.id for blob in batch]).delete()
+        removed += len(batch)
+
+    removed_tmp = default_storage.remove_stale_temporary_files(cutoff)
+    removed_unrecorded = sum(
+        storage.remove_unrecorded_files(cutoff) for storage in (default_storage, protected_storage)
+    )
+    logger.info(
+        f"Collected {removed} unreferenced media blobs, {removed_unrecorded} unrecorded blob files "
+        f"and {removed_tmp} stale temporary files"
+    )
+    return removed
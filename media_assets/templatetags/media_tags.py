@@ -0,0 +1,48 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from media_assets.images import get_derivatives
+from media_assets.protected import protected_url
+
+register = template.Library()
+
+@register.simple_tag(takes_context=True)
+def responsive_image(context, image, alt='', sizes='100vw', css_class='', loading='lazy'):
+    """
+    Render an <img> for an ImageField with a srcset of its WebP derivatives.
+
+    Usage: {% responsive_image item.main_image alt=item.title sizes="(max-width: 768px) 100vw, 33vw" css_class="card-img-top" %}
+    Falls back to the original file until the derivatives have been generated.
+    List views pass the page's derivatives, from get_derivatives_many, as
+    `image_derivatives` in the context; other images are looked up one by one.
+    """
+    if not image:
+        return ''
+
+    prefetched = context.get('image_derivatives') or {}
+    if image.name in prefetched:
+        derivatives = prefetched[image.name]
+    else:
+        derivatives = get_derivatives(image.name)
+    if not derivatives:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+            image.url, alt, css_class, loading,
+        )
+
+    width, height, variants = derivatives
+    srcset = format_html_join(', ', '{} {}w', variants)
+    return format_html(
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+        variants[0][0], srcset, sizes, width, height, alt, css_class, loading,
+    )
+
+
+@register.simple_tag
+def protected_media_url(instance, field):
+    """
+    URL of the access-checked view for a protected document or video.
+
+    Usage: <a href="{% protected_media_url message 'pdf' %}">
+    """
+    return protected_url(instance, field)
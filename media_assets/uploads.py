@@ -0,0 +1,139 @@
+"""
+Resumable chunked uploads (a subset of the tus protocol).
+
+Each PATCH writes its chunk straight to storage as a scratch file, reading
+the request body a block at a time, with no transaction open. The offset is
+then advanced with a compare-and-set, and only the request that wins it
+moves its scratch file into place as the part. When the last chunk arrives the
+parts are streamed, in order, into the final file, so neither a chunk nor
+the whole upload is ever held in memory. Parts are scratch data and live
+on the local filesystem rather than in the (content-addressed) default
+storage.
+"""
+
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+CHUNK_SIZE = getattr(settings, 'CHUNKED_UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+MAX_SIZE = getattr(settings, 'CHUNKED_UPLOAD_MAX_SIZE', 100 * 1024 * 1024)
+EXPIRY_HOURS = getattr(settings, 'CHUNKED_UPLOAD_EXPIRY_HOURS', 24)
+READ_BLOCK_SIZE = 64 * 1024
+MAX_FILENAME_LENGTH = 50
+
+parts_storage = FileSystemStorage()
+
+
+class LimitedReader:
+    """File-like view of the first `length` bytes of a stream"""
+
+    def __init__(self, stream, length):
+        self.stream = stream
+        self.remaining = length
+        self.read_bytes = 0
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(min(size, READ_BLOCK_SIZE))
+        self.remaining -= len(data)
+        self.read_bytes += len(data)
+        return data
+
+
+class ConcatenatedReader:
+    """File-like reader over several stored files, one after another"""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.current = None
+
+    def read(self, size=-1):
+        while self.names or self.current:
+            if self.current is None:
+                self.current = parts_storage.open(self.names.pop(0), 'rb')
+            data = self.current.read(READ_BLOCK_SIZE if size is None or size < 0 else size)
+            if data:
+                return data
+            self.current.close()
+            self.current = None
+        return b''
+
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+
+
+def parts_dir(upload):
+    return f"chunked_uploads/{upload.id.hex}"
+
+
+def part_name(upload, offset):
+    # Zero-padded so listing the directory returns parts in offset order
+    return f"{parts_dir(upload)}/{offset:012d}.part"
+
+
+def final_name(upload):
+    """Storage name for the assembled file; short enough for a default FileField"""
+    stem, ext = os.path.splitext(get_valid_filename(upload.filename) or 'upload')
+    stem = stem[:MAX_FILENAME_LENGTH - len(ext)]
+    return f"uploads/{upload.id.hex}/{stem}{ext.lower()}"
+
+
+def write_chunk(upload, offset, stream, length):
+    """
+    Store `length` bytes from `stream` as a scratch file for the chunk at
+    `offset`. Returns its name, or None after a short read (nothing is left
+    behind). The scratch file is ignored until place_chunk moves it into place.
+    """
+    reader = LimitedReader(stream, length)
+    # Unique, so retries of the same chunk racing each other never share a file
+    name = f"{parts_dir(upload)}/{offset:012d}.{uuid.uuid4().hex}.tmp"
+    name = parts_storage.save(name, File(reader, name=os.path.basename(name)))
+    if reader.read_bytes != length:
+        parts_storage.delete(name)
+        return None
+    return name
+
+
+def place_chunk(upload, offset, name):
+    """Make a scratch file the part at `offset`; only the request that advanced the offset may call this"""
+    os.replace(parts_storage.path(name), parts_storage.path(part_name(upload, offset)))
+
+
+def assemble(upload):
+    """Stream the parts into the final file and mark the upload complete"""
+    directory = parts_dir(upload)
+    _, files = parts_storage.listdir(directory)
+    names = [f"{directory}/{name}" for name in sorted(files) if name.endswith('.part')]
+
+    reader = ConcatenatedReader(names)
+    target = upload.assembled_file
+    try:
+        target.name = target.storage.save(final_name(upload), File(reader, name=upload.filename))
+    finally:
+        reader.close()
+
+    delete_parts(upload)
+    upload.status = 'COMPLETE'
+    upload.completed_at = timezone.now()
+    upload.save(update_fields=['protected_file' if upload.protected else 'file', 'status', 'completed_at'])
+    return upload
+
+
+def delete_parts(upload):
+    directory = parts_dir(upload)
+    try:
+        _, files = parts_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in files:
+        parts_storage.delete(f"{directory}/{name}")
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+app_name = 'media_assets'
+
+urlpatterns = [
+    path('uploads/', views.create_upload, name='create_upload'),
+    path('uploads/<uuid:upload_id>/', views.upload_detail, name='upload_detail'),
+    path('protected-media/<str:label>/<int:pk>/<str:field>/', views.protected_media, name='protected_media'),
+]
@@ -0,0 +1,206 @@
+import base64
+import binascii
+import logging
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods, require_POST
+
+from .models import ChunkedUpload
+from .protected import get_protected_file
+from .uploads import (
+    CHUNK_SIZE, MAX_SIZE, READ_BLOCK_SIZE, assemble, delete_parts, parts_storage, place_chunk, write_chunk,
+)
+
+logger = logging.getLogger(__name__)
+
+TUS_VERSION = '1.0.0'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def tus_response(status=204, upload=None, **headers):
+    response = HttpResponse(status=status)
+    response['Tus-Resumable'] = TUS_VERSION
+    response['Cache-Control'] = 'no-store'
+    if upload is not None:
+        response['Upload-Offset'] = str(upload.offset)
+        response['Upload-Length'] = str(upload.size)
+    for name, value in headers.items():
+        response[name.replace('_', '-')] = value
+    return response
+
+
+def parse_metadata(header):
+    """Decode a tus Upload-Metadata header ("key base64value,key base64value")"""
+    metadata = {}
+    for pair in filter(None, (item.strip() for item in header.split(','))):
+        key, _, value = pair.partition(' ')
+        try:
+            metadata[key] = base64.b64decode(value).decode('utf-8') if value else ''
+        except (binascii.Error, UnicodeDecodeError):
+            continue
+    return metadata
+
+
+@login_required
+@require_POST
+def create_upload(request):
+    """Start a resumable upload; the client then PATCHes chunks to the returned URL"""
+    try:
+        size = int(request.headers.get('Upload-Length', ''))
+    except ValueError:
+        return tus_response(400)
+    if size <= 0:
+        return tus_response(400)
+    if size > MAX_SIZE:
+        return tus_response(413, Tus_Max_Size=str(MAX_SIZE))
+
+    metadata = parse_metadata(request.headers.get('Upload-Metadata', ''))
+    upload = ChunkedUpload.objects.create(
+        user=request.user,
+        filename=(metadata.get('filename') or 'upload')[:255],
+        content_type=metadata.get('filetype', '')[:100],
+        size=size,
+        # Set by ChunkedFileInput for protected media fields
+        protected=request.GET.get('protected') == '1',
+    )
+    url = reverse('media_assets:upload_detail', args=[upload.id])
+
+    response = JsonResponse({'id': str(upload.id), 'url': url, 'chunk_size': CHUNK_SIZE}, status=201)
+    response['Location'] = url
+    response['Tus-Resumable'] = TUS_VERSION
+    return response
+
+
+@login_required
+@require_http_methods(['HEAD', 'PATCH', 'DELETE'])
+def upload_detail(request, upload_id):
+    """HEAD reports the current offset, PATCH appends a chunk, DELETE cancels"""
+    upload = get_object_or_404(ChunkedUpload, id=upload_id, user=request.user)
+
+    if request.method == 'HEAD':
+        return tus_response(200, upload)
+
+    if request.method == 'DELETE':
+        if upload.is_complete:
+            return tus_response(409, upload)
+        delete_parts(upload)
+        upload.delete()
+        return tus_response(204)
+
+    if request.content_type != 'application/offset+octet-stream':
+        return tus_response(415)
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+        length = int(request.headers.get('Content-Length', ''))
+    except ValueError:
+        return tus_response(400)
+    if length > CHUNK_SIZE:
+        return tus_response(413, Tus_Max_Size=str(CHUNK_SIZE))
+
+    if upload.is_complete or offset != upload.offset:
+        return tus_response(409, upload)
+    if length <= 0 or offset + length > upload.size:
+        return tus_response(400, upload)
+
+    # Read the body with no transaction open; it arrives at the client's pace
+    name = write_chunk(upload, offset, request, length)
+    if name is None:
+        # The client went away mid-chunk; it should HEAD and resend from the offset
+        return tus_response(400, upload)
+
+    with transaction.atomic():
+        # Compare-and-set: of two retries of the same chunk, only one advances the offset
+        advanced = ChunkedUpload.objects.filter(pk=upload.pk, offset=offset, status='UPLOADING').update(
+            offset=offset + length
+        )
+        if advanced:
+            # Still holding the row lock, so the next chunk cannot be accepted before this part exists
+            place_chunk(upload, offset, name)
+    if not advanced:
+        parts_storage.delete(name)
+        upload.refresh_from_db()
+        return tus_response(409, upload)
+
+    upload.offset = offset + length
+    if upload.offset == upload.size:
+        assemble(upload)
+        logger.info(f"Assembled chunked upload {upload.id} ({upload.size} bytes) for {request.user.username}")
+
+    return tus_response(204, upload)
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD'])
+def protected_media(request, label, pk, field):
+    """Serve a protected upload once the user is allowed to see the object it belongs to"""
+    found = get_protected_file(label, pk, field, request.user)
+    if found is None:
+        raise Http404
+    model_field, name = found
+    storage = model_field.storage
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    if settings.PROTECTED_MEDIA_X_ACCEL_REDIRECT:
+        # nginx sends the file itself, Range requests included, so no worker is tied up
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = storage.url(name)
+    else:
+        if not storage.exists(name):
+            raise Http404
+        response = ranged_file_response(request, storage, name, content_type)
+
+    filename = f"{label.split('.')[-1].lower()}-{pk}-{field}{os.path.splitext(name)[1]}"
+    response['Content-Disposition'] = f'inline; filename="{filename}"'
+    response['Cache-Control'] = 'private, max-age=3600'
+    return response
+
+
+def ranged_file_response(request, storage, name, content_type):
+    """Development stand-in for nginx: stream the file, honouring a single byte range"""
+    size = storage.size(name)
+    match = RANGE_RE.match(request.headers.get('Range', ''))
+    if not match or not any(match.groups()):
+        response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # "bytes=-N" asks for the last N bytes
+        start = max(0, size - int(last))
+        end = size - 1
+    if start > end:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    f = storage.open(name, 'rb')
+    f.seek(start)
+    response = StreamingHttpResponse(read_range(f, end - start + 1), status=206, content_type=content_type)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def read_range(f, length):
+    try:
+        while length > 0:
+            data = f.read(min(READ_BLOCK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        f.close()
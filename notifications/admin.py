@@ -1,3 +1,9 @@
 from django.contrib import admin
+from .models import StreamEvent
 
-# Register your models here.
+@admin.register(StreamEvent)
+class StreamEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'event_type', 'user', 'created_at']
+    list_filter = ['event_type', 'created_at']
+    search_fields = ['user__username']
+    readonly_fields = ['created_at']
@@ -0,0 +1,46 @@
+"""
+Event bus for Server-Sent Events, shared with the Channels layer.
+
+publish_event() records the event in StreamEvent (so reconnecting clients
+can replay what they missed via Last-Event-ID) and then fans it out over the
+channel layer to every open stream in the matching group.
+"""
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from .models import StreamEvent
+
+ALERTS_GROUP = 'events.alerts'
+
+
+def user_group(user_id):
+    """Channel layer group for events about one user's own reports"""
+    return f"events.user.{user_id}"
+
+
+def serialize_event(event):
+    return {
+        'id': event.id,
+        'event': event.event_type,
+        'data': event.data,
+    }
+
+
+def publish_event(event_type, data, user=None):
+    """Store an event and push it to open SSE streams once the transaction commits"""
+    event = StreamEvent.objects.create(event_type=event_type, data=data, user=user)
+    group = user_group(user.id) if user else ALERTS_GROUP
+
+    def send():
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            group,
+            {
+                'type': 'stream.event',
+                **serialize_event(event),
+            }
+        )
+    transaction.on_commit(send)
+    return event
@@ -1,3 +1,21 @@
 from django.db import models
+from django.contrib.auth.models import User
+from django.utils import timezone
 
-# Create your models here.
+
+class StreamEvent(models.Model):
+    """Log of events pushed to SSE clients, kept so they can resume with Last-Event-ID"""
+    event_type = models.CharField(max_length=50)
+    data = models.JSONField(default=dict)
+    # Null for broadcast events (community alerts), set for per-user events
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='stream_events')
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['user', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} #{self.id}"
@@ -0,0 +1,18 @@
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from .models import StreamEvent
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def purge_stream_events(days=2):
+    """Delete SSE replay events older than `days`"""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = StreamEvent.objects.filter(created_at__lt=cutoff).delete()
+    logger.info(f"Purged {deleted} stream events older than {days} days")
+    return deleted
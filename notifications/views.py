@@ -1,3 +1,93 @@
-from django.shortcuts import render
+import asyncio
+import json
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from django.db.models import Q
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .events import ALERTS_GROUP, serialize_event, user_group
+from .models import StreamEvent
+
+KEEPALIVE_SECONDS = 15
+REPLAY_LIMIT = 500
+
+
+def format_sse(event):
+    """Encode an event in the text/event-stream wire format"""
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+@sync_to_async
+def get_user_id(request):
+    user = request.user
+    return user.id if user.is_authenticated else None
+
+
+@sync_to_async
+def missed_events(user_id, last_event_id):
+    """Events the client has not seen, oldest first"""
+    events = StreamEvent.objects.filter(
+        Q(user__isnull=True) | Q(user_id=user_id),
+        id__gt=last_event_id,
+    ).order_by('id')[:REPLAY_LIMIT]
+    return [serialize_event(event) for event in events]
+
+
+async def event_stream(request):
+    """
+    Server-Sent Events stream of community alerts and status changes on the
+    current user's own crime reports.
+
+    Runs as an async view so an idle client costs a coroutine rather than a
+    worker. It must be served by the ASGI server (daphne, the `asgi` service
+    that nginx routes /notifications/stream/ to): under WSGI Django collects
+    the whole async iterator before sending anything, so the stream would
+    never start. Reconnecting clients send Last-Event-ID and get what they
+    missed.
+    """
+    user_id = await get_user_id(request)
+    if user_id is None:
+        return HttpResponse(status=401)
+
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or 0)
+    except ValueError:
+        last_event_id = 0
+
+    channel_layer = get_channel_layer()
+    groups = [ALERTS_GROUP, user_group(user_id)]
+
+    async def stream():
+        channel = await channel_layer.new_channel()
+        # Subscribe before replaying so nothing published in between is lost
+        for group in groups:
+            await channel_layer.group_add(group, channel)
+        try:
+            yield f"retry: {KEEPALIVE_SECONDS * 1000}\n\n"
+
+            last_sent = last_event_id
+            if last_event_id:
+                for event in await missed_events(user_id, last_event_id):
+                    last_sent = event['id']
+                    yield format_sse(event)
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(channel_layer.receive(channel), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message['id'] <= last_sent:
+                    continue
+                last_sent = message['id']
+                yield format_sse(message)
+        finally:
+            for group in groups:
+                await channel_layer.group_discard(group, channel)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Tell nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,10 +1,13 @@
 from django import forms
 from django.core.validators import RegexValidator, MinValueValidator
+from media_assets.forms import ChunkedUploadFormMixin
 from .models import BusinessService
 
-class BusinessServiceForm(forms.ModelForm):
+class BusinessServiceForm(ChunkedUploadFormMixin, forms.ModelForm):
     """Form for creating and editing business services."""
     
+    chunked_upload_fields = ['photo', 'pdf_document', 'video']
+    
     # Custom validators
     phone_regex = RegexValidator(
         regex=r'^\+?1?\d{9,15}$',
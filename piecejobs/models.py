@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.validators import MinValueValidator
+from media_assets.storage import protected_storage
 
 class BusinessService(models.Model):
     """Model for business service listings."""
@@ -29,8 +30,8 @@ class BusinessService(models.Model):
     
     # Media uploads
     photo = models.ImageField(upload_to='piecejobs/photos/', blank=True, null=True)
-    pdf_document = models.FileField(upload_to='piecejobs/pdfs/', blank=True, null=True)
-    video = models.FileField(upload_to='piecejobs/videos/', blank=True, null=True)
+    pdf_document = models.FileField(upload_to='piecejobs/pdfs/', storage=protected_storage, blank=True, null=True)
+    video = models.FileField(upload_to='piecejobs/videos/', storage=protected_storage, blank=True, null=True)
     
     # Metadata
     poster = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posted_jobs')
@@ -3,11 +3,12 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.urls import reverse
-from django.db.models import Q
 from django.http import HttpResponseForbidden
 
 from .models import BusinessService, ServiceApplication
 from .forms import BusinessServiceForm
+from search.facets import listing_facets
+from search.index import search_queryset
 
 def job_list(request):
     """View to list all business services."""
@@ -17,12 +18,7 @@ def job_list(request):
     # Handle search
     query = request.GET.get('q')
     if query:
-        services = services.filter(
-            Q(title__icontains=query) | 
-            Q(description__icontains=query) |
-            Q(location__icontains=query) |
-            Q(category__icontains=query)
-        )
+        services = search_queryset(services, query).order_by('-search_rank', '-created_at')
     
     # Filter by category
     category = request.GET.get('category')
@@ -34,8 +30,8 @@ def job_list(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Get unique categories for filtering
-    categories = BusinessService.objects.values_list('category', flat=True).distinct()
+    # Categories with job counts for filtering, from the cached facets
+    categories = listing_facets('job')['categories']
     
     context = {
         'page_obj': page_obj,
@@ -68,7 +64,7 @@ def job_detail(request, pk):
 def create_job(request):
     """View to create a new business service."""
     if request.method == 'POST':
-        form = BusinessServiceForm(request.POST, request.FILES)
+        form = BusinessServiceForm(request.POST, request.FILES, user=request.user)
         if form.is_valid():
             service = form.save(commit=False)
             service.poster = request.user
@@ -98,7 +94,7 @@ def edit_job(request, pk):
         return HttpResponseForbidden("You don't have permission to edit this service.")
     
     if request.method == 'POST':
-        form = BusinessServiceForm(request.POST, request.FILES, instance=service)
+        form = BusinessServiceForm(request.POST, request.FILES, instance=service, user=request.user)
         if form.is_valid():
             form.save()
             messages.success(request, "Service updated successfully!")
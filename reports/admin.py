@@ -1,13 +1,13 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import CrimeReport
+from .models import CrimeReport, Incident
 
 @admin.register(CrimeReport)
 class CrimeReportAdmin(admin.ModelAdmin):
     list_display = ['title', 'category', 'location', 'get_status_badge', 'date_reported', 'reporter']
-    list_filter = ['status', 'category', 'date_reported']
+    list_filter = ['status', 'category', 'area', 'is_duplicate', 'date_reported']
     search_fields = ['title', 'description', 'location', 'reporter__username']
-    readonly_fields = ['date_reported']
+    readonly_fields = ['date_reported', 'area', 'incident', 'is_duplicate', 'duplicate_score']
     date_hierarchy = 'date_reported'
     
     fieldsets = (
@@ -15,11 +15,14 @@ class CrimeReportAdmin(admin.ModelAdmin):
             'fields': ('title', 'description', 'category', 'status')
         }),
         ('Location Information', {
-            'fields': ('location', 'latitude', 'longitude')
+            'fields': ('location', 'latitude', 'longitude', 'location_geocoded', 'area')
         }),
         ('Reporter Information', {
             'fields': ('reporter', 'date_reported')
         }),
+        ('Incident', {
+            'fields': ('incident', 'is_duplicate', 'duplicate_score')
+        }),
     )
     
     def get_status_badge(self, obj):
@@ -51,3 +54,22 @@ class CrimeReportAdmin(admin.ModelAdmin):
         queryset.update(status='CLOSED')
         self.message_user(request, f'{queryset.count()} report(s) marked as closed.')
     mark_as_closed.short_description = 'Mark selected reports as closed'
+
+class IncidentReportInline(admin.TabularInline):
+    model = CrimeReport
+    fields = ['title', 'reporter', 'date_reported', 'status', 'is_duplicate', 'duplicate_score']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+    show_change_link = True
+
+@admin.register(Incident)
+class IncidentAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'category', 'report_count', 'first_reported_at', 'last_reported_at']
+    list_filter = ['category', 'first_reported_at']
+    search_fields = ['location', 'canonical_report__title']
+    readonly_fields = [
+        'canonical_report', 'category', 'location', 'cell', 'latitude', 'longitude', 'time_bucket', 'signature',
+        'report_count', 'first_reported_at', 'last_reported_at',
+    ]
+    inlines = [IncidentReportInline]
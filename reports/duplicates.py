@@ -0,0 +1,187 @@
+"""
+Duplicate report detection.
+
+Residents often report the same incident several times. Every new report
+is matched against the incidents already open near it: candidates come
+from an indexed (cell, time bucket) lookup, i.e. the reports.geo cells
+within DUPLICATE_RADIUS_KM and the neighbouring DUPLICATE_BUCKET_HOURS
+buckets, so no history is scanned. Each candidate is scored on text
+similarity (a MinHash estimate of the Jaccard similarity of the words
+of title and description), category and distance. A report
+scoring DUPLICATE_THRESHOLD or more joins the best incident as a
+duplicate; otherwise it opens a new incident of its own.
+
+Notifications and statistics count incidents: they only look at reports
+with is_duplicate=False, one per incident.
+"""
+
+import hashlib
+import re
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .geo import cell_key_for, cells_within, distance_km
+from .models import CrimeReport, Incident
+
+RADIUS_KM = getattr(settings, 'DUPLICATE_RADIUS_KM', 0.5)
+BUCKET_HOURS = getattr(settings, 'DUPLICATE_BUCKET_HOURS', 6)
+THRESHOLD = getattr(settings, 'DUPLICATE_THRESHOLD', 0.55)
+# Score weights; a matching category and location alone fall short of the threshold
+TEXT_WEIGHT = 0.6
+CATEGORY_WEIGHT = 0.25
+PROXIMITY_WEIGHT = 0.15
+
+NUM_HASHES = 64
+# Largest prime below 2**32: a * h + b stays inside uint64 for a, b, h below it
+HASH_PRIME = 4294967291
+_generator = np.random.default_rng(20240601)
+HASH_A = _generator.integers(1, HASH_PRIME, NUM_HASHES, dtype=np.uint64)
+HASH_B = _generator.integers(0, HASH_PRIME, NUM_HASHES, dtype=np.uint64)
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = {
+    'a', 'an', 'and', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'he', 'her', 'his', 'i', 'in', 'is',
+    'it', 'me', 'my', 'near', 'of', 'on', 'our', 'she', 'someone', 'the', 'their', 'there', 'they', 'this',
+    'to', 'was', 'we', 'were', 'with',
+}
+
+
+def shingles(*texts):
+    """
+    Words of some text, lower case, stopwords dropped, naive singulars.
+
+    Reports are a sentence or two written independently, so word bigrams
+    rarely match between two reports of one incident; single words do.
+    """
+    tokens = set()
+    for text in texts:
+        for token in TOKEN_RE.findall((text or '').lower()):
+            if token in STOPWORDS:
+                continue
+            if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+                token = token[:-1]
+            tokens.add(token)
+    return tokens
+
+
+def minhash(*texts):
+    """MinHash signature (NUM_HASHES ints) of the shingles of some text; empty if there are none"""
+    words = shingles(*texts)
+    if not words:
+        return []
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(word.encode(), digest_size=4).digest(), 'big') % HASH_PRIME
+         for word in words],
+        dtype=np.uint64,
+    )
+    # One universal hash (a*h + b) mod p per row, minimum over the shingles
+    values = (np.outer(HASH_A, hashes) + HASH_B[:, None]) % np.uint64(HASH_PRIME)
+    return values.min(axis=1).tolist()
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    if not signature or len(signature) != len(other):
+        return 0.0
+    return float(np.mean(np.array(signature) == np.array(other)))
+
+
+def time_bucket(when):
+    return int(when.timestamp() // (BUCKET_HOURS * 3600))
+
+
+def candidates(report):
+    """Incidents a report could belong to: nearby cells, neighbouring time buckets"""
+    bucket = time_bucket(report.date_reported)
+    incidents = Incident.objects.filter(
+        time_bucket__in=[bucket - 1, bucket, bucket + 1],
+        first_reported_at__lte=report.date_reported + timedelta(hours=BUCKET_HOURS),
+        last_reported_at__gte=report.date_reported - timedelta(hours=BUCKET_HOURS),
+    )
+    if report.latitude is None or report.longitude is None:
+        # No coordinates: only the same location text counts as nearby
+        return incidents.filter(cell='', location__iexact=report.location.strip())
+    return incidents.filter(cell__in=cells_within(report.latitude, report.longitude, RADIUS_KM))
+
+
+def score(report, signature, incident):
+    """How likely a report describes an incident, from 0 to 1; None if too far away"""
+    if report.latitude is not None and incident.latitude is not None:
+        distance = distance_km(report.latitude, report.longitude, incident.latitude, incident.longitude)
+        if distance > RADIUS_KM:
+            return None
+        proximity = 1 - distance / RADIUS_KM
+    else:
+        proximity = 1.0
+    return (
+        TEXT_WEIGHT * similarity(signature, incident.signature)
+        + CATEGORY_WEIGHT * (report.category == incident.category)
+        + PROXIMITY_WEIGHT * proximity
+    )
+
+
+def assign_incident(report):
+    """
+    Link a saved report to the incident it describes, opening a new one if none matches.
+
+    Returns (incident, is_duplicate).
+    """
+    signature = minhash(report.title, report.description)
+    with transaction.atomic():
+        best, best_score = None, THRESHOLD
+        for incident in candidates(report).select_for_update():
+            incident_score = score(report, signature, incident)
+            if incident_score is not None and incident_score >= best_score:
+                best, best_score = incident, incident_score
+
+        if best is None:
+            incident = Incident.objects.create(
+                canonical_report=report,
+                category=report.category,
+                location=report.location.strip()[:255],
+                cell=cell_key_for(report.latitude, report.longitude) or '',
+                latitude=report.latitude,
+                longitude=report.longitude,
+                time_bucket=time_bucket(report.date_reported),
+                signature=signature,
+                first_reported_at=report.date_reported,
+                last_reported_at=report.date_reported,
+            )
+            is_duplicate, best_score = False, None
+        else:
+            incident = best
+            Incident.objects.filter(pk=incident.pk).update(
+                report_count=F('report_count') + 1,
+                last_reported_at=max(incident.last_reported_at, report.date_reported),
+                first_reported_at=min(incident.first_reported_at, report.date_reported),
+            )
+            is_duplicate = True
+
+        CrimeReport.objects.filter(pk=report.pk).update(
+            incident=incident, is_duplicate=is_duplicate, duplicate_score=best_score
+        )
+    report.incident, report.is_duplicate, report.duplicate_score = incident, is_duplicate, best_score
+    return incident, is_duplicate
+
+
+def release_incident(report):
+    """After a report is deleted, hand its incident to the earliest remaining report, or drop it"""
+    incident = Incident.objects.filter(pk=report.incident_id).first()
+    if incident is None:
+        return
+    remaining = CrimeReport.objects.filter(incident=incident).order_by('date_reported', 'id')
+    if not remaining.exists():
+        incident.delete()
+        return
+    incident.report_count = remaining.count()
+    if report.is_duplicate:
+        incident.save(update_fields=['report_count'])
+        return
+    successor = remaining.first()
+    incident.canonical_report = successor
+    incident.save(update_fields=['report_count', 'canonical_report'])
+    CrimeReport.objects.filter(pk=successor.pk).update(is_duplicate=False, duplicate_score=None)
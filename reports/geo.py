@@ -0,0 +1,69 @@
+"""
+Grid helpers for bucketing crime report coordinates into fixed-size area cells.
+
+A cell is identified by its integer (row, col) position on a lat/lng grid of
+CELL_SIZE_DEGREES, written as the key "row_col" (e.g. "-2538_2860").
+"""
+
+import math
+import re
+
+CELL_SIZE_DEGREES = 0.01  # Roughly 1.1 km north-south
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+# Canonical integers in ASCII digits only: int() would also take "1_000", " 7" or "007"
+CELL_KEY_RE = re.compile(r'(-?(?:0|[1-9][0-9]*))_(-?(?:0|[1-9][0-9]*))')
+
+
+def cell_for(latitude, longitude):
+    """Return the (row, col) grid cell containing a coordinate"""
+    return (
+        math.floor(float(latitude) / CELL_SIZE_DEGREES),
+        math.floor(float(longitude) / CELL_SIZE_DEGREES),
+    )
+
+
+def cell_key(row, col):
+    """Return the string key for a grid cell"""
+    return f"{row}_{col}"
+
+
+def cell_key_for(latitude, longitude):
+    """Return the cell key for a coordinate, or None if it is missing"""
+    if latitude is None or longitude is None:
+        return None
+    return cell_key(*cell_for(latitude, longitude))
+
+
+def parse_cell_key(key):
+    """Parse a "row_col" key back into integers, raising ValueError if malformed"""
+    match = CELL_KEY_RE.fullmatch(str(key))
+    if match is None:
+        raise ValueError(f"Malformed cell key: {key!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def cells_within(latitude, longitude, radius_km):
+    """Return the keys of all cells overlapping a circle's bounding box"""
+    latitude = float(latitude)
+    longitude = float(longitude)
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    lng_delta = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 0.01))
+
+    min_row, min_col = cell_for(latitude - lat_delta, longitude - lng_delta)
+    max_row, max_col = cell_for(latitude + lat_delta, longitude + lng_delta)
+    return [
+        cell_key(row, col)
+        for row in range(min_row, max_row + 1)
+        for col in range(min_col, max_col + 1)
+    ]
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two coordinates (haversine)"""
+    lat1, lng1, lat2, lng2 = map(math.radians, map(float, (lat1, lng1, lat2, lng2)))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,307 @@
+"""
+Precomputed crime density tiles for the crime map.
+
+For each time window (last week, month, year) the report coordinates are
+binned onto a pixel grid in Web Mercator tile space and smoothed with a
+Gaussian kernel of HEATMAP_BANDWIDTH_METRES, convolved by FFT. The density
+is colour-mapped and cut into 256px PNG tiles, one set per zoom level,
+stored as HeatmapTile rows and served by reports.views.heatmap_tile. The
+browser only ever receives images, never the points themselves.
+
+Density is mapped to colour on a fixed scale (one isolated report is 1.0,
+saturating at each window's `saturation`), so a tile can be re-rendered on
+its own without seams against its neighbours: a new report only rebuilds
+the tiles within reach of its kernel (render_around), and a nightly full
+rebuild (rebuild_window) lets old reports age out of each window.
+"""
+
+import io
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image
+
+from .models import CrimeReport, HeatmapTile
+
+TILE_SIZE = 256
+MIN_ZOOM = getattr(settings, 'HEATMAP_MIN_ZOOM', 10)
+MAX_ZOOM = getattr(settings, 'HEATMAP_MAX_ZOOM', 16)
+BANDWIDTH_METRES = getattr(settings, 'HEATMAP_BANDWIDTH_METRES', 150)
+# Tiles rendered together in one grid, BLOCK_TILES x BLOCK_TILES at most
+BLOCK_TILES = 8
+# Gaussian kernels are cut off at this many standard deviations
+KERNEL_SIGMAS = 3
+# Below this share of the saturation a pixel is left transparent
+MIN_VISIBLE = 0.02
+EXCLUDED_STATUSES = ['REJECTED']
+
+# Window -> (label, days covered, density at which the colour saturates)
+WINDOWS = {
+    '7d': ('Last 7 days', 7, 3),
+    '30d': ('Last 30 days', 30, 8),
+    '365d': ('Last 12 months', 365, 40),
+}
+DEFAULT_WINDOW = '30d'
+
+EQUATOR_METRES_PER_PIXEL = 2 * math.pi * 6378137 / TILE_SIZE
+
+# (position, r, g, b, a) colour stops from sparse to dense
+COLOUR_STOPS = [
+    (0.0, 0, 0, 255, 0),
+    (0.15, 0, 128, 255, 110),
+    (0.35, 0, 220, 160, 150),
+    (0.55, 170, 230, 0, 180),
+    (0.75, 255, 200, 0, 200),
+    (1.0, 230, 20, 20, 220),
+]
+
+
+def colour_table():
+    """256-entry RGBA lookup table interpolated between the colour stops"""
+    positions = [stop[0] for stop in COLOUR_STOPS]
+    levels = np.linspace(0, 1, 256)
+    return np.stack([
+        np.interp(levels, positions, [stop[channel] for stop in COLOUR_STOPS])
+        for channel in range(1, 5)
+    ], axis=1).astype(np.uint8)
+
+
+COLOURS = colour_table()
+
+
+def world_pixels(latitudes, longitudes, zoom):
+    """Web Mercator pixel coordinates of arrays of points at a zoom level"""
+    scale = TILE_SIZE * 2 ** zoom
+    lat = np.radians(np.clip(latitudes, -85.0511, 85.0511))
+    x = (longitudes + 180.0) / 360.0 * scale
+    y = (1 - np.log(np.tan(lat) + 1 / np.cos(lat)) / math.pi) / 2 * scale
+    return x, y
+
+
+def pixel_to_lat_lng(x, y, zoom):
+    scale = TILE_SIZE * 2 ** zoom
+    lng = x / scale * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / scale))))
+    return lat, lng
+
+
+def kernel_radius(latitude, zoom):
+    """(sigma, cut-off radius) of the kernel in pixels at a latitude and zoom"""
+    metres_per_pixel = EQUATOR_METRES_PER_PIXEL * math.cos(math.radians(latitude)) / 2 ** zoom
+    sigma = max(BANDWIDTH_METRES / metres_per_pixel, 1.0)
+    return sigma, int(math.ceil(KERNEL_SIGMAS * sigma))
+
+
+def gaussian_line(sigma, radius):
+    """One axis of the Gaussian kernel, with a peak of 1 so one isolated report has density 1"""
+    offsets = np.arange(-radius, radius + 1, dtype=np.float64)
+    return np.exp(-offsets ** 2 / (2 * sigma ** 2))
+
+
+def fft_size(n):
+    """Smallest 5-smooth number >= n; pocketfft is much faster on these than on large primes"""
+    best = 2 * n
+    power2 = 1
+    while power2 < best:
+        power3 = power2
+        while power3 < best:
+            power5 = power3
+            while power5 < best:
+                if power5 >= n:
+                    best = power5
+                power5 *= 5
+            power3 *= 3
+        power2 *= 2
+    return best
+
+
+def gaussian_blur(grid, sigma, radius):
+    """
+    Full linear convolution of a grid with the Gaussian kernel, via real FFTs.
+
+    The kernel is separable, so its 2-D spectrum is the outer product of
+    two 1-D spectra and never has to be built or transformed as a square.
+    """
+    line = gaussian_line(sigma, radius)
+    full = (grid.shape[0] + len(line) - 1, grid.shape[1] + len(line) - 1)
+    shape = (fft_size(full[0]), fft_size(full[1]))
+    kernel_spectrum = np.outer(np.fft.fft(line, shape[0]), np.fft.rfft(line, shape[1]))
+    density = np.fft.irfft2(np.fft.rfft2(grid, shape) * kernel_spectrum, shape)
+    return density[:full[0], :full[1]]
+
+
+def density_grid(xs, ys, x0, y0, width, height, sigma, radius):
+    """
+    Kernel density over the pixel rectangle starting at (x0, y0).
+
+    Points up to `radius` pixels outside the rectangle are binned too, so
+    the edges get the contributions of their neighbours.
+    """
+    left, top = x0 - radius, y0 - radius
+    cols = np.floor(xs - left).astype(np.int64)
+    rows = np.floor(ys - top).astype(np.int64)
+    grid_width, grid_height = width + 2 * radius, height + 2 * radius
+    inside = (cols >= 0) & (cols < grid_width) & (rows >= 0) & (rows < grid_height)
+    counts = np.bincount(
+        rows[inside] * grid_width + cols[inside], minlength=grid_width * grid_height
+    ).reshape(grid_height, grid_width).astype(np.float32)
+
+    density = gaussian_blur(counts, sigma, radius)
+    # Grid pixel (i, j) lands on (i + radius, j + radius) of the full convolution
+    return density[2 * radius:2 * radius + height, 2 * radius:2 * radius + width]
+
+
+def render_png(density, saturation):
+    """Colour-map a tile of density values; None when nothing would show"""
+    level = np.log1p(np.maximum(density, 0)) / math.log1p(saturation)
+    if level.max() < MIN_VISIBLE:
+        return None
+    index = (np.clip(level, 0, 1) * 255).astype(np.uint8)
+    rgba = COLOURS[index]
+    rgba[level < MIN_VISIBLE, 3] = 0
+    buffer = io.BytesIO()
+    Image.fromarray(rgba, 'RGBA').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def window_reports(window):
+    _, days, _ = WINDOWS[window]
+    return CrimeReport.objects.filter(
+        is_duplicate=False,
+        latitude__isnull=False,
+        longitude__isnull=False,
+        date_reported__gte=timezone.now() - timedelta(days=days),
+    ).exclude(status__in=EXCLUDED_STATUSES)
+
+
+def report_points(queryset):
+    """(latitudes, longitudes) arrays of a report queryset"""
+    rows = np.array(list(queryset.values_list('latitude', 'longitude')), dtype=np.float64)
+    if not len(rows):
+        return np.empty(0), np.empty(0)
+    return rows[:, 0], rows[:, 1]
+
+
+def render_block(window, zoom, tile_x0, tile_y0, tile_x1, tile_y1, latitudes, longitudes):
+    """
+    Render the tiles in [tile_x0, tile_x1] x [tile_y0, tile_y1] and store them.
+
+    Tiles left empty are deleted. Returns the number of tiles stored.
+    """
+    _, _, saturation = WINDOWS[window]
+    x0, y0 = tile_x0 * TILE_SIZE, tile_y0 * TILE_SIZE
+    width = (tile_x1 - tile_x0 + 1) * TILE_SIZE
+    height = (tile_y1 - tile_y0 + 1) * TILE_SIZE
+    centre_lat, _ = pixel_to_lat_lng(x0 + width / 2, y0 + height / 2, zoom)
+    sigma, radius = kernel_radius(centre_lat, zoom)
+
+    xs, ys = world_pixels(latitudes, longitudes, zoom)
+    density = density_grid(xs, ys, x0, y0, width, height, sigma, radius)
+
+    now = timezone.now()
+    tiles = []
+    empty = []
+    for tile_y in range(tile_y0, tile_y1 + 1):
+        for tile_x in range(tile_x0, tile_x1 + 1):
+            top, left = (tile_y - tile_y0) * TILE_SIZE, (tile_x - tile_x0) * TILE_SIZE
+            png = render_png(density[top:top + TILE_SIZE, left:left + TILE_SIZE], saturation)
+            if png is None:
+                empty.append((tile_x, tile_y))
+                continue
+            tiles.append(HeatmapTile(window=window, zoom=zoom, x=tile_x, y=tile_y, png=png, updated_at=now))
+
+    HeatmapTile.objects.bulk_create(
+        tiles,
+        update_conflicts=True,
+        unique_fields=['window', 'zoom', 'x', 'y'],
+        update_fields=['png', 'updated_at'],
+    )
+    if empty:
+        stale = Q()
+        for tile_x, tile_y in empty:
+            stale |= Q(x=tile_x, y=tile_y)
+        HeatmapTile.objects.filter(stale, window=window, zoom=zoom).delete()
+    return len(tiles)
+
+
+def tiles_reached(latitudes, longitudes, zoom):
+    """Tiles that reports at these points contribute density to"""
+    if not len(latitudes):
+        return set()
+    xs, ys = world_pixels(np.asarray(latitudes), np.asarray(longitudes), zoom)
+    _, radius = kernel_radius(float(np.mean(latitudes)), zoom)
+    reach = int(math.ceil(radius / TILE_SIZE))
+    # Reports share tiles heavily; expand each occupied tile once
+    occupied = np.unique(np.stack([xs // TILE_SIZE, ys // TILE_SIZE], axis=1).astype(np.int64), axis=0)
+    return {
+        (tile_x + dx, tile_y + dy)
+        for tile_x, tile_y in occupied.tolist()
+        for dx in range(-reach, reach + 1)
+        for dy in range(-reach, reach + 1)
+    }
+
+
+def blocks_of(tiles):
+    """Group tiles into aligned blocks, yielding each block's (x0, y0, x1, y1) tile bounds"""
+    blocks = defaultdict(list)
+    for tile_x, tile_y in tiles:
+        blocks[(tile_x // BLOCK_TILES, tile_y // BLOCK_TILES)].append((tile_x, tile_y))
+    for members in blocks.values():
+        xs = [tile_x for tile_x, _ in members]
+        ys = [tile_y for _, tile_y in members]
+        yield min(xs), min(ys), max(xs), max(ys)
+
+
+def block_bounds(zoom, tile_x0, tile_y0, tile_x1, tile_y1):
+    """(south, west, north, east) of a tile block widened by the kernel radius"""
+    x0, y0 = tile_x0 * TILE_SIZE, tile_y0 * TILE_SIZE
+    x1, y1 = (tile_x1 + 1) * TILE_SIZE, (tile_y1 + 1) * TILE_SIZE
+    centre_lat, _ = pixel_to_lat_lng((x0 + x1) / 2, (y0 + y1) / 2, zoom)
+    _, radius = kernel_radius(centre_lat, zoom)
+    # Pixel y grows southwards
+    north, west = pixel_to_lat_lng(x0 - radius, y0 - radius, zoom)
+    south, east = pixel_to_lat_lng(x1 + radius, y1 + radius, zoom)
+    return south, west, north, east
+
+
+def render_around(points):
+    """Re-render, in every window and zoom level, the tiles around some (lat, lng) points"""
+    rendered = 0
+    for window in WINDOWS:
+        reports = window_reports(window)
+        for zoom in range(MIN_ZOOM, MAX_ZOOM + 1):
+            dirty = tiles_reached([float(lat) for lat, _ in points], [float(lng) for _, lng in points], zoom)
+            for block in blocks_of(dirty):
+                south, west, north, east = block_bounds(zoom, *block)
+                latitudes, longitudes = report_points(reports.filter(
+                    latitude__range=(south, north), longitude__range=(west, east)
+                ))
+                rendered += render_block(window, zoom, *block, latitudes, longitudes)
+    return rendered
+
+
+def rebuild_window(window):
+    """Render every tile of one window from scratch, dropping tiles no report reaches any more"""
+    started = timezone.now()
+    latitudes, longitudes = report_points(window_reports(window))
+    rendered = 0
+    for zoom in range(MIN_ZOOM, MAX_ZOOM + 1):
+        for block in blocks_of(tiles_reached(latitudes, longitudes, zoom)):
+            rendered += render_block(window, zoom, *block, latitudes, longitudes)
+    HeatmapTile.objects.filter(window=window, updated_at__lt=started).delete()
+    return rendered
+
+
+def empty_tile():
+    """A fully transparent tile, served where nothing has been rendered"""
+    buffer = io.BytesIO()
+    Image.new('RGBA', (TILE_SIZE, TILE_SIZE), (0, 0, 0, 0)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+EMPTY_TILE = empty_tile()
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from reports import heatmap
+
+
+class Command(BaseCommand):
+    help = 'Render the crime map density tiles from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            choices=list(heatmap.WINDOWS),
+            default=None,
+            help='Only rebuild this time window (default: all of them)'
+        )
+
+    def handle(self, *args, **options):
+        windows = [options['window']] if options['window'] else list(heatmap.WINDOWS)
+        for window in windows:
+            rendered = heatmap.rebuild_window(window)
+            self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} tiles for the {window} window"))
@@ -0,0 +1,89 @@
+import time
+import statistics
+
+from django.core.management.base import BaseCommand
+
+from reports.tasks import generate_monthly_crime_report, queue_latency_probe
+
+
+class Command(BaseCommand):
+    help = 'Measure alerts queue latency with and without report generation load'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--probes',
+            type=int,
+            default=50,
+            help='Number of latency probes to send in each phase'
+        )
+
+        parser.add_argument(
+            '--reports',
+            type=int,
+            default=10,
+            help='Number of monthly report builds to enqueue as background load'
+        )
+
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0.05,
+            help='Seconds between probes'
+        )
+
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=30.0,
+            help='Seconds to wait for each probe result'
+        )
+
+    def handle(self, *args, **options):
+        probes = options['probes']
+
+        self.stdout.write(self.style.NOTICE(f'Baseline: sending {probes} probes to the alerts queue...'))
+        baseline = self.measure(probes, options['interval'], options['timeout'])
+
+        self.stdout.write(self.style.NOTICE(f"Enqueuing {options['reports']} report builds on the reports queue..."))
+        for _ in range(options['reports']):
+            generate_monthly_crime_report.delay()
+
+        self.stdout.write(self.style.NOTICE(f'Under load: sending {probes} probes to the alerts queue...'))
+        loaded = self.measure(probes, options['interval'], options['timeout'])
+
+        self.report('Baseline', baseline)
+        self.report('Under load', loaded)
+
+        if baseline and loaded:
+            ratio = statistics.median(loaded) / max(statistics.median(baseline), 1e-6)
+            style = self.style.SUCCESS if ratio < 2 else self.style.ERROR
+            self.stdout.write(style(f'Median alert latency ratio (load/baseline): {ratio:.2f}x'))
+
+    def measure(self, count, interval, timeout):
+        """Send probes and collect their queue wait times in seconds"""
+        results = []
+        for _ in range(count):
+            results.append(queue_latency_probe.delay(time.time()))
+            time.sleep(interval)
+
+        latencies = []
+        for result in results:
+            try:
+                latencies.append(result.get(timeout=timeout))
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f'Probe failed: {e}'))
+        return latencies
+
+    def report(self, label, latencies):
+        if not latencies:
+            self.stdout.write(self.style.ERROR(f'{label}: no probe results'))
+            return
+
+        ordered = sorted(latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        self.stdout.write(
+            f'{label}: n={len(ordered)} '
+            f'p50={statistics.median(ordered) * 1000:.1f}ms '
+            f'p95={p95 * 1000:.1f}ms '
+            f'max={ordered[-1] * 1000:.1f}ms'
+        )
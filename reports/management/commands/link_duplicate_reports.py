@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from reports.duplicates import assign_incident
+from reports.models import CrimeReport
+
+
+class Command(BaseCommand):
+    help = 'Link crime reports that have no incident yet to one, in date order, marking duplicates (sends nothing)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Reports to read per query'
+        )
+
+    def handle(self, *args, **options):
+        linked = 0
+        duplicates = 0
+        while True:
+            batch = list(
+                CrimeReport.objects.filter(incident__isnull=True)
+                .order_by('date_reported', 'id')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            for report in batch:
+                _, is_duplicate = assign_incident(report)
+                linked += 1
+                duplicates += is_duplicate
+
+        self.stdout.write(self.style.SUCCESS(f"Linked {linked} reports to incidents, {duplicates} of them duplicates"))
@@ -1,67 +1,175 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template, render_to_string
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.safestring import mark_safe
 
-# Assuming you have a CrimeReport model in your reports app
-from reports.models import CrimeReport # This line might need adjustment based on your actual model name and location
+from reports.models import CrimeReport
 
 User = get_user_model()
 
+DRY_RUN_EMAIL_BACKEND = 'django.core.mail.backends.dummy.EmailBackend'
+
+
 class Command(BaseCommand):
     help = 'Sends bi-weekly crime reports to all registered users.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of concurrent sender threads, each with its own SMTP connection'
+        )
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of emails handed to a sender thread at a time'
+        )
+
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Render and "send" through a dummy backend, then print throughput stats'
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Starting bi-weekly crime report email task...")
+        started = time.perf_counter()
 
         # Calculate the date range for the last two weeks
         end_date = timezone.now()
         start_date = end_date - timedelta(weeks=2)
 
-        # Fetch crime reports within the date range
-        # You'll need to adjust this query based on your CrimeReport model's fields (e.g., a 'created_at' field)
-        recent_reports = CrimeReport.objects.filter(date_reported__range=(start_date, end_date))
+        # Materialize the reports once; every email shows the same list, one report per incident
+        recent_reports = list(
+            CrimeReport.objects.filter(date_reported__range=(start_date, end_date), is_duplicate=False)
+            .only('title', 'location', 'date_reported', 'description')
+            .order_by('date_reported')
+        )
 
-        if not recent_reports.exists():
+        if not recent_reports:
             self.stdout.write("No new crime reports in the last two weeks. Skipping email.")
             return
 
-        # Prepare report data for the email template
         report_data = {
             'start_date': start_date.strftime("%Y-%m-%d"),
             'end_date': end_date.strftime("%Y-%m-%d"),
             'reports': recent_reports,
-            'report_count': recent_reports.count()
+            'report_count': len(recent_reports),
         }
 
-        # Get all registered users
-        users = User.objects.filter(is_active=True)
+        # The report list is identical for every recipient, so render it once
+        report_block = mark_safe(render_to_string('emails/crime_report_list.html', {'report_data': report_data}))
+        template = get_template('emails/crime_report_email.html')
+        text_content = "This is an automated crime report from CPF Crime Reporting System."  # Fallback text content
 
-        if not users.exists():
-            self.stdout.write("No active users found to send reports to.")
+        # Get all registered users with an email address
+        recipients = list(
+            User.objects.filter(is_active=True).exclude(email='').values_list('username', 'email')
+        )
+
+        if not recipients:
+            self.stdout.write("No active users with an email address found to send reports to.")
             return
 
-        for user in users:
-            if user.email:
+        def build_email(username, email_address):
+            html_content = template.render({
+                'user': {'username': username},
+                'report_data': report_data,
+                'report_block': report_block,
+            })
+            email = EmailMultiAlternatives(
+                'Bi-Weekly Crime Report',
+                text_content,
+                settings.DEFAULT_FROM_EMAIL,
+                [email_address],
+            )
+            email.attach_alternative(html_content, "text/html")
+            return email
+
+        backend = DRY_RUN_EMAIL_BACKEND if options['dry_run'] else None
+        batch_size = max(1, options['batch_size'])
+        batches = [recipients[i:i + batch_size] for i in range(0, len(recipients), batch_size)]
+        local = threading.local()
+        connections = []
+        connections_lock = threading.Lock()
+
+        def open_connection():
+            connection = local.connection = get_connection(backend=backend)
+            connection.open()
+            with connections_lock:
+                connections.append(connection)
+            return connection
+
+        def send_batch(batch):
+            # Each worker thread keeps one SMTP connection open for all its batches
+            sent, failed = 0, []
+            emails = [build_email(username, email_address) for username, email_address in batch]
+            try:
+                connection = getattr(local, 'connection', None) or open_connection()
+            except Exception as e:
+                local.connection = None
+                return 0, [(email.to[0], e) for email in emails]
+
+            # One message per call, so a failure never resends anything already delivered
+            for index, email in enumerate(emails):
+                try:
+                    sent += connection.send_messages([email]) or 0
+                    continue
+                except Exception as e:
+                    failed.append((email.to[0], e))
+
+                # The session may be broken after an error; reconnect before the next recipient
                 try:
-                    # Render the email content from a template
-                    html_content = render_to_string('emails/crime_report_email.html', {'user': user, 'report_data': report_data})
-                    text_content = "This is an automated crime report from CPF Crime Reporting System." # Fallback text content
-
-                    email = EmailMultiAlternatives(
-                        'Bi-Weekly Crime Report',
-                        text_content,
-                        'webmaster@yourdomain.com', # Use DEFAULT_FROM_EMAIL from settings.py
-                        [user.email]
-                    )
-                    email.attach_alternative(html_content, "text/html")
-                    email.send()
-                    self.stdout.write(self.style.SUCCESS(f"Successfully sent report to {user.email}"))
+                    connection.close()
+                    connection.open()
                 except Exception as e:
-                    self.stderr.write(self.style.ERROR(f"Failed to send report to {user.email}: {e}"))
-            else:
-                self.stdout.write(f"User {user.username} has no email address. Skipping.")
+                    local.connection = None
+                    failed.extend((remaining.to[0], e) for remaining in emails[index + 1:])
+                    break
+            return sent, failed
+
+        sent_count = 0
+        render_started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            futures = [executor.submit(send_batch, batch) for batch in batches]
+            for future in as_completed(futures):
+                sent, failed = future.result()
+                sent_count += sent
+                for email_address, error in failed:
+                    self.stderr.write(self.style.ERROR(f"Failed to send report to {email_address}: {error}"))
+
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                pass  # Broken sessions were already reported per recipient
+
+        send_elapsed = time.perf_counter() - render_started
+        total_elapsed = time.perf_counter() - started
+
+        if options['dry_run']:
+            rate = len(recipients) / send_elapsed if send_elapsed else float('inf')
+            self.stdout.write(self.style.SUCCESS(
+                f"Dry run: built {len(recipients)} emails ({len(recent_reports)} reports each) "
+                f"in {len(batches)} batches across {len(connections)} connections"
+            ))
+            self.stdout.write(
+                f"Render+send: {send_elapsed:.2f}s ({rate:.0f} emails/s), total: {total_elapsed:.2f}s"
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Successfully sent {sent_count}/{len(recipients)} reports in {total_elapsed:.2f}s"
+            ))
 
         self.stdout.write("Bi-weekly crime report email task completed.")
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crimereport',
+            name='location_geocoded',
+            field=models.BooleanField(default=False, help_text='Coordinates were estimated from the location text by the offline geocoder'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geocoding', '0002_area'),
+        ('reports', '0002_crimereport_location_geocoded'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crimereport',
+            name='area',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='crime_reports', to='geocoding.area'),
+        ),
+        migrations.AddIndex(
+            model_name='crimereport',
+            index=models.Index(fields=['date_reported', 'area'], name='reports_date_area_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:08
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_crimereport_area'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HeatmapTile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(max_length=10)),
+                ('zoom', models.PositiveSmallIntegerField()),
+                ('x', models.PositiveIntegerField()),
+                ('y', models.PositiveIntegerField()),
+                ('png', models.BinaryField()),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='heatmaptile',
+            constraint=models.UniqueConstraint(fields=('window', 'zoom', 'x', 'y'), name='reports_heatmap_tile_unique'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_heatmaptile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crimereport',
+            name='duplicate_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='crimereport',
+            name='is_duplicate',
+            field=models.BooleanField(default=False, help_text='Another report of the same incident came first (see reports.duplicates)'),
+        ),
+        migrations.CreateModel(
+            name='Incident',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('THEFT', 'Theft'), ('ASSAULT', 'Assault'), ('VANDALISM', 'Vandalism'), ('BURGLARY', 'Burglary'), ('HOMICIDE', 'Homicide'), ('ROBBERY', 'Robbery'), ('DRUG_OFFENSE', 'Drug Offense'), ('CYBERCRIME', 'Cybercrime'), ('OTHER', 'Other')], default='OTHER', max_length=50)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('cell', models.CharField(blank=True, max_length=32)),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('time_bucket', models.IntegerField()),
+                ('signature', models.JSONField(default=list)),
+                ('report_count', models.PositiveIntegerField(default=1)),
+                ('first_reported_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_reported_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('canonical_report', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reports.crimereport')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='crimereport',
+            name='incident',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reports', to='reports.incident'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['cell', 'time_bucket'], name='reports_incident_cell_time_idx'),
+        ),
+    ]
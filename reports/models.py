@@ -32,7 +32,75 @@ class CrimeReport(models.Model):
     date_reported = models.DateTimeField(default=timezone.now)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    location_geocoded = models.BooleanField(
+        default=False, help_text="Coordinates were estimated from the location text by the offline geocoder"
+    )
     reporter = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    # Ward or patrol sector containing the coordinates, filled in on save
+    area = models.ForeignKey(
+        'geocoding.Area', on_delete=models.SET_NULL, null=True, blank=True, related_name='crime_reports'
+    )
+    # The real-world incident this report describes; statistics count one report per incident
+    incident = models.ForeignKey(
+        'Incident', on_delete=models.SET_NULL, null=True, blank=True, related_name='reports'
+    )
+    is_duplicate = models.BooleanField(
+        default=False, help_text="Another report of the same incident came first (see reports.duplicates)"
+    )
+    duplicate_score = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Per-area counts over a date range (monthly PDF, analytics)
+            models.Index(fields=['date_reported', 'area'], name='reports_date_area_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class Incident(models.Model):
+    """One real-world incident, which several residents may have reported"""
+    canonical_report = models.ForeignKey(
+        CrimeReport, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    category = models.CharField(max_length=50, choices=CrimeReport.CRIME_CATEGORIES, default='OTHER')
+    location = models.CharField(max_length=255, blank=True)
+    # reports.geo cell key, empty when the first report had no coordinates
+    cell = models.CharField(max_length=32, blank=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    # Hours since the epoch // DUPLICATE_BUCKET_HOURS, of the first report
+    time_bucket = models.IntegerField()
+    # MinHash of the first report's title and description
+    signature = models.JSONField(default=list)
+    report_count = models.PositiveIntegerField(default=1)
+    first_reported_at = models.DateTimeField(default=timezone.now)
+    last_reported_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Candidate lookup for new reports (reports.duplicates)
+            models.Index(fields=['cell', 'time_bucket'], name='reports_incident_cell_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"Incident #{self.pk}: {self.get_category_display()} at {self.location}"
+
+
+class HeatmapTile(models.Model):
+    """One rendered crime density tile (see reports.heatmap)"""
+    window = models.CharField(max_length=10)
+    zoom = models.PositiveSmallIntegerField()
+    x = models.PositiveIntegerField()
+    y = models.PositiveIntegerField()
+    png = models.BinaryField()
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['window', 'zoom', 'x', 'y'], name='reports_heatmap_tile_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.window} {self.zoom}/{self.x}/{self.y}"
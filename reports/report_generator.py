@@ -45,7 +45,9 @@ class MonthlyReportGenerator:
         
     def get_crime_data(self):
         """Query database for crime data in the specified month"""
+        # One report per incident; duplicates of it would inflate every count
         crime_data = CrimeReport.objects.filter(
+            is_duplicate=False,
             date_reported__gte=self.start_date,
             date_reported__lte=self.end_date + datetime.timedelta(days=1)  # Include whole day
         )
@@ -72,6 +74,10 @@ class MonthlyReportGenerator:
         self.crimes_by_location = list(crime_data.values('location').annotate(
             count=Count('location')).order_by('-count')[:10])  # Top 10 locations
         
+        # Get crime by ward/sector (group-by over the date_reported, area index)
+        self.crimes_by_area = list(crime_data.values('area_id', 'area__name').annotate(
+            count=Count('id')).order_by('-count'))
+        
         return crime_data
     
     def create_charts(self):
@@ -263,6 +269,29 @@ class MonthlyReportGenerator:
             elements.append(table)
         else:
             elements.append(Paragraph("No location data available", styles["Normal"]))
+        
+        # Section: Reports by Area
+        if any(item['area_id'] for item in self.crimes_by_area):
+            elements.append(Spacer(1, 0.3 * inch))
+            elements.append(Paragraph("Reports by Area", styles["Heading2"]))
+            
+            area_data = [['Ward / Sector', 'Number of Reports', 'Percentage']]
+            for item in self.crimes_by_area:
+                percentage = (item['count'] / self.total_crimes) * 100 if self.total_crimes > 0 else 0
+                area_data.append([item['area__name'] or 'Unassigned', item['count'], f"{percentage:.1f}%"])
+            
+            table = Table(area_data, colWidths=[2.5*inch, 1.5*inch, 1*inch])
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            elements.append(table)
             
         # Add footer with safety tips
         elements.append(Spacer(1, 0.5 * inch))
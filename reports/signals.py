@@ -1,29 +1,103 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from .models import CrimeReport
 from accounts.models import Profile # Assuming Profile is in accounts app
-from .tasks import send_sms_alert
+from . import heatmap
+from .duplicates import assign_incident, release_incident
+from .geo import cell_key_for
+from .tasks import render_heatmap_tiles, send_sms_alert
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from dashboard.consumers import alert_groups_for
+from notifications.events import publish_event
 
 User = get_user_model()
 
+def heatmap_key(latitude, longitude, date_reported, status=None, is_duplicate=False):
+    """What decides a report's contribution to the heatmap tiles (None when it has none)"""
+    if latitude is None or longitude is None or status in heatmap.EXCLUDED_STATUSES or is_duplicate:
+        return None
+    return (float(latitude), float(longitude), date_reported)
+
+def refresh_heatmap(*keys):
+    points = [[latitude, longitude] for latitude, longitude, _ in filter(None, keys)]
+    if points:
+        transaction.on_commit(lambda: render_heatmap_tiles.delay(points))
+
+@receiver(pre_save, sender=CrimeReport)
+def crime_report_pre_save(sender, instance, **kwargs):
+    # Remember the stored status and position so post_save can tell whether they changed
+    previous = None
+    if instance.pk:
+        previous = (
+            CrimeReport.objects.filter(pk=instance.pk)
+            .values_list('status', 'latitude', 'longitude', 'date_reported', 'is_duplicate')
+            .first()
+        )
+    instance._previous_status = previous[0] if previous else None
+    instance._previous_heatmap = heatmap_key(*previous[1:4], previous[0], previous[4]) if previous else None
+
 @receiver(post_save, sender=CrimeReport)
 def crime_report_post_save(sender, instance, created, **kwargs):
     if created:
+        # Link the report to the incident it describes before anything counts it
+        assign_incident(instance)
+
+    # Redraw the density tiles the report was or now is drawn on
+    current = heatmap_key(
+        instance.latitude, instance.longitude, instance.date_reported, instance.status, instance.is_duplicate
+    )
+    previous = getattr(instance, '_previous_heatmap', None)
+    if current != previous:
+        refresh_heatmap(previous, current)
+
+    previous_status = getattr(instance, '_previous_status', None)
+    if not created and instance.reporter_id and previous_status and previous_status != instance.status:
+        # Tell the reporter their report moved on (SSE stream)
+        publish_event('report.status', {
+            'id': instance.id,
+            'title': instance.title,
+            'previous_status': previous_status,
+            'status': instance.status,
+            'status_display': instance.get_status_display(),
+        }, user=instance.reporter)
+
+    if created and not instance.is_duplicate:
+        # Residents are alerted once per incident, not once per report of it
         message = f"New Crime Alert: {instance.title} at {instance.location} on {instance.date_reported.strftime('%Y-%m-%d %H:%M')}"
         # Send SMS to all users with a phone number
         for user in User.objects.all():
             if hasattr(user, 'profile') and user.profile.phone_number:
                 send_sms_alert.delay(user.profile.phone_number, message)
         
-        # Trigger dashboard alerts via WebSocket
+        # Trigger dashboard alerts via WebSocket, only for clients watching this area/category
+        cell = cell_key_for(instance.latitude, instance.longitude)
+        alert = {
+            'id': instance.id,
+            'title': instance.title,
+            'category': instance.category,
+            'location': instance.location,
+            'latitude': float(instance.latitude) if instance.latitude is not None else None,
+            'longitude': float(instance.longitude) if instance.longitude is not None else None,
+            'cell': cell,
+            'date_reported': instance.date_reported.isoformat(),
+        }
         channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            "crime_alerts",
-            {
-                "type": "send_alert",
-                "message": message,
-            }
-        )
+        for group in alert_groups_for(cell, instance.category):
+            async_to_sync(channel_layer.group_send)(
+                group,
+                {
+                    "type": "send_alert",
+                    "message": message,
+                    "alert": alert,
+                }
+            )
+
+@receiver(post_delete, sender=CrimeReport)
+def crime_report_post_delete(sender, instance, **kwargs):
+    release_incident(instance)
+    refresh_heatmap(heatmap_key(
+        instance.latitude, instance.longitude, instance.date_reported, instance.status, instance.is_duplicate
+    ))
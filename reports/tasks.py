@@ -1,13 +1,15 @@
 import os
+import time
 import logging
 from datetime import datetime, timedelta
-from celery import shared_task
+from celery import shared_task, chain
 from twilio.rest import Client
 from django.conf import settings
 from django.core.mail import EmailMessage, get_connection
 from django.contrib.auth.models import User
 from django.template.loader import render_to_string
 
+from . import heatmap
 from .report_generator import MonthlyReportGenerator
 
 logger = logging.getLogger(__name__)
@@ -32,6 +34,11 @@ def send_sms_alert(to_phone_number, message):
     except Exception as e:
         logger.error(f"Error sending SMS to {to_phone_number}: {e}")
 
+@shared_task
+def queue_latency_probe(sent_at):
+    """Return how long this task waited on the alerts queue (seconds)"""
+    return time.time() - sent_at
+
 @shared_task
 def generate_monthly_crime_report():
     """Generate monthly crime report PDF"""
@@ -49,10 +56,16 @@ def generate_monthly_crime_report():
         return None
 
 @shared_task
-def send_monthly_report_email(pdf_path=None):
+def send_monthly_report_email(pdf_path=None, regenerate=True):
     """Send monthly crime report to all registered users"""
-    if pdf_path is None:
-        pdf_path = generate_monthly_crime_report()
+    if pdf_path is None and regenerate:
+        # Build the PDF on the CPU-bound reports queue, then come back to the
+        # email queue with the result instead of rendering on an IO worker.
+        chain(
+            generate_monthly_crime_report.s(),
+            send_monthly_report_email.s(regenerate=False),
+        ).delay()
+        return
         
     if not pdf_path or not os.path.exists(pdf_path):
         logger.error(f"PDF file not found: {pdf_path}")
@@ -128,3 +141,18 @@ def send_monthly_report_email(pdf_path=None):
     except Exception as e:
         logger.error(f"Error in send_monthly_report_email: {e}")
 
+
+@shared_task
+def render_heatmap_tiles(points):
+    """Re-render the crime map density tiles around [lat, lng] points that gained or lost a report"""
+    rendered = heatmap.render_around(points)
+    logger.info(f"Re-rendered {rendered} heatmap tiles around {len(points)} points")
+    return rendered
+
+
+@shared_task
+def rebuild_heatmap_tiles():
+    """Render every crime map density tile again, so reports age out of their time windows"""
+    for window in heatmap.WINDOWS:
+        rendered = heatmap.rebuild_window(window)
+        logger.info(f"Rebuilt {rendered} heatmap tiles for the {window} window")
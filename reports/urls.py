@@ -9,4 +9,5 @@ urlpatterns = [
     path('<int:pk>/detail/', views.report_detail, name='report_detail'), # New: Detail view for a single report
     path('map-data/', views.crime_map_data, name='crime_map_data'), # New: API endpoint for map data
     path('map/', views.crime_map_view, name='crime_map'), # New: Crime Map view
+    path('heatmap/<str:window>/<int:z>/<int:x>/<int:y>.png', views.heatmap_tile, name='heatmap_tile'),
 ]
@@ -3,7 +3,10 @@ from django.contrib.auth.decorators import login_required, user_passes_test # Ad
 from django.db.models import Q  # Add Q import for queries
 from .forms import CrimeReportForm, CrimeReportUpdateForm # Added CrimeReportUpdateForm
 from .models import CrimeReport # Added for fetching crime reports
-from django.http import JsonResponse # Added for crime_map_data
+from django.http import Http404, HttpResponse, JsonResponse # Added for crime_map_data
+from django.utils.http import http_date
+from . import heatmap
+from .models import HeatmapTile
 
 # Helper function to check if a user is a Police Officer or Admin
 def is_staff_or_admin(user):
@@ -107,4 +110,23 @@ def crime_map_data(request):
 
 @login_required
 def crime_map_view(request):
-    return render(request, 'crime_map.html')
+    return render(request, 'crime_map.html', {
+        'heatmap_windows': [(window, label) for window, (label, _, _) in heatmap.WINDOWS.items()],
+        'heatmap_default_window': heatmap.DEFAULT_WINDOW,
+        'heatmap_min_zoom': heatmap.MIN_ZOOM,
+        'heatmap_max_zoom': heatmap.MAX_ZOOM,
+    })
+
+@login_required
+def heatmap_tile(request, window, z, x, y):
+    """One precomputed crime density tile; a transparent tile where no report reaches"""
+    if window not in heatmap.WINDOWS or not heatmap.MIN_ZOOM <= z <= heatmap.MAX_ZOOM:
+        raise Http404
+    tile = HeatmapTile.objects.filter(window=window, zoom=z, x=x, y=y).values_list('png', 'updated_at').first()
+    if tile is None:
+        response = HttpResponse(heatmap.EMPTY_TILE, content_type='image/png')
+    else:
+        response = HttpResponse(bytes(tile[0]), content_type='image/png')
+        response['Last-Modified'] = http_date(tile[1].timestamp())
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
@@ -0,0 +1,21 @@
+from django.contrib import admin
+from .models import SearchDocument, SimilarListings, Tag
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['title', 'kind', 'object_id', 'category', 'price', 'is_active', 'updated_at']
+    list_filter = ['kind', 'is_active', 'created_at']
+    search_fields = ['title', 'body', 'location', 'category']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug']
+    search_fields = ['name', 'slug']
+
+@admin.register(SimilarListings)
+class SimilarListingsAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'object_id', 'neighbour_ids', 'computed_at']
+    list_filter = ['kind']
+    search_fields = ['object_id']
+    readonly_fields = ['neighbour_ids', 'scores', 'computed_at']
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+    verbose_name = 'Marketplace Search'
+
+    def ready(self):
+        import search.signals  # Import signals here
@@ -0,0 +1,109 @@
+"""
+Cached facet counts for the marketplace list pages.
+
+Counts are computed from the search index, once per listing kind, and kept
+in the cache until one of that kind's listings changes (the search signals
+drop the entry), so a list page reads its filter options (categories, tags,
+price ranges and, per kind, urgency levels or service categories) in a
+single cache get.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import SearchDocument, TaggedListing
+
+FACET_CACHE_SECONDS = getattr(settings, 'SEARCH_FACET_CACHE_SECONDS', 60 * 60)
+TOP_TAGS = 30
+# Lower edges of the price histogram buckets (Rands); the last bucket is open-ended
+PRICE_BUCKETS = getattr(settings, 'SEARCH_FACET_PRICE_BUCKETS', [0, 100, 500, 1000, 5000, 10000])
+
+
+def facet_cache_key(kind):
+    return f"search:facets:{kind}"
+
+
+def price_histogram(documents):
+    """[(low, high, count)] over PRICE_BUCKETS, counted in one aggregate query"""
+    buckets = list(zip(PRICE_BUCKETS, PRICE_BUCKETS[1:] + [None]))
+    aggregates = {}
+    for i, (low, high) in enumerate(buckets):
+        in_bucket = Q(price__gte=low)
+        if high is not None:
+            in_bucket &= Q(price__lt=high)
+        aggregates[f"bucket_{i}"] = Count('pk', filter=in_bucket)
+    counts = documents.aggregate(**aggregates)
+    return [(low, high, counts[f"bucket_{i}"]) for i, (low, high) in enumerate(buckets)]
+
+
+def request_urgency():
+    """[(code, label, count)] of active buy requests per urgency level"""
+    BuyRequest = apps.get_model('iwanttobuy', 'BuyRequest')
+    counts = dict(
+        BuyRequest.objects.filter(status='ACTIVE')
+        .order_by()
+        .values_list('urgency')
+        .annotate(n=Count('pk'))
+    )
+    return [(code, label, counts.get(code, 0)) for code, label in BuyRequest.URGENCY_CHOICES]
+
+
+def service_categories():
+    """Every service category with its number of active listings"""
+    ServiceCategory = apps.get_model('services', 'ServiceCategory')
+    return list(
+        ServiceCategory.objects.annotate(n=Count('services', filter=Q(services__status='ACTIVE')))
+        .values('id', 'name', 'icon', 'n')
+        .order_by('name')
+    )
+
+
+# Facets that only some kinds have, read from the source tables
+EXTRA_FACETS = {
+    'request': {'urgency': request_urgency},
+    'service': {'service_categories': service_categories},
+}
+
+
+def compute_facets(kind):
+    active = SearchDocument.objects.filter(kind=kind, is_active=True)
+    categories = (
+        active.exclude(category='')
+        .order_by()
+        .values('category')
+        .annotate(n=Count('pk'))
+        .order_by('category')
+    )
+    tags = (
+        TaggedListing.objects.filter(kind=kind, object_id__in=active.values('object_id'))
+        .values('tag__slug', 'tag__name')
+        .annotate(n=Count('pk'))
+        .order_by('-n', 'tag__name')[:TOP_TAGS]
+    )
+    facets = {
+        'categories': [(row['category'], row['n']) for row in categories],
+        'tags': [(row['tag__slug'], row['tag__name'], row['n']) for row in tags],
+        'prices': price_histogram(active),
+    }
+    for name, compute in EXTRA_FACETS.get(kind, {}).items():
+        facets[name] = compute()
+    return facets
+
+
+def listing_facets(kind):
+    """
+    Filter options for the active listings of `kind`: 'categories' [(name,
+    count)], 'tags' [(slug, name, count)], 'prices' [(low, high, count)], plus
+    'urgency' for buy requests and 'service_categories' for services.
+    """
+    facets = cache.get(facet_cache_key(kind))
+    if facets is None:
+        facets = compute_facets(kind)
+        cache.set(facet_cache_key(kind), facets, FACET_CACHE_SECONDS)
+    return facets
+
+
+def invalidate_facets(kind):
+    cache.delete(facet_cache_key(kind))
@@ -0,0 +1,173 @@
+"""
+Cross-marketplace search index.
+
+Every listing from the four marketplaces (items for sale, buy requests,
+services and piece jobs) is copied into one SearchDocument row with a
+weighted tsvector, so one GIN-indexed full-text query replaces the
+icontains scans each list view used to run. On databases other than
+PostgreSQL the vector is left empty and searches fall back to icontains
+over the document table.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import Count, F, FloatField, OuterRef, Q, Subquery, Value
+
+from .facets import invalidate_facets
+from .models import SearchDocument
+from .tags import remove_tags, sync_tags
+
+SEARCH_CONFIG = getattr(settings, 'SEARCH_CONFIG', 'english')
+
+
+def join_text(*parts):
+    return ' '.join(part for part in parts if part)
+
+
+def build_item(item):
+    return {
+        'title': item.title,
+        'body': join_text(item.description, item.tags),
+        'location': item.location,
+        'category': item.category or '',
+        'price': item.price,
+        'is_active': item.status == 'ACTIVE',
+    }
+
+
+def build_request(buy_request):
+    return {
+        'title': buy_request.title,
+        'body': join_text(buy_request.description, buy_request.tags),
+        'location': buy_request.location,
+        'category': buy_request.category or '',
+        'price': buy_request.price_range_max or buy_request.price_range_min,
+        'is_active': buy_request.status == 'ACTIVE',
+    }
+
+
+def build_service(service):
+    return {
+        'title': service.title,
+        'body': join_text(service.description, service.subcategories, service.tags),
+        'location': service.service_areas,
+        'category': service.category.name if service.category_id else '',
+        'price': service.price_amount,
+        'is_active': service.status == 'ACTIVE',
+    }
+
+
+def build_job(job):
+    return {
+        'title': job.title,
+        'body': job.description,
+        'location': job.location,
+        'category': job.category or '',
+        'price': job.offer_price,
+        'is_active': job.status == 'OPEN',
+    }
+
+
+# Source model -> (document kind, builder, fields whose changes affect the document or facets)
+SOURCES = {
+    'isell.SaleItem': (
+        'item', build_item,
+        {'title', 'description', 'tags', 'location', 'category', 'price', 'status'},
+    ),
+    'iwanttobuy.BuyRequest': (
+        'request', build_request,
+        # urgency is not indexed, but the cached facets count it
+        {'title', 'description', 'tags', 'location', 'category', 'price_range_min', 'price_range_max', 'status',
+         'urgency'},
+    ),
+    'services.ServiceListing': (
+        'service', build_service,
+        {'title', 'description', 'subcategories', 'tags', 'service_areas', 'category', 'price_amount', 'status'},
+    ),
+    'piecejobs.BusinessService': (
+        'job', build_job,
+        {'title', 'description', 'location', 'category', 'offer_price', 'status'},
+    ),
+}
+
+# Title matches rank above category matches, which rank above the rest
+DOCUMENT_VECTOR = (
+    SearchVector('title', weight='A', config=SEARCH_CONFIG)
+    + SearchVector('category', weight='B', config=SEARCH_CONFIG)
+    + SearchVector('body', 'location', weight='C', config=SEARCH_CONFIG)
+)
+
+
+def uses_full_text():
+    return connection.vendor == 'postgresql'
+
+
+def source_models():
+    """(model, kind, builder) for each source app installed in this deployment"""
+    sources = []
+    for label, (kind, build, _) in SOURCES.items():
+        try:
+            sources.append((apps.get_model(label), kind, build))
+        except LookupError:
+            continue
+    return sources
+
+
+def index_instance(instance, update_fields=None):
+    """Create or refresh the search document for one listing"""
+    kind, build, indexed_fields = SOURCES[instance._meta.label]
+    if update_fields is not None and not indexed_fields.intersection(update_fields):
+        # e.g. a view counter update; nothing searchable changed
+        return
+
+    document, _ = SearchDocument.objects.update_or_create(
+        kind=kind,
+        object_id=instance.pk,
+        defaults=dict(build(instance), created_at=instance.created_at),
+    )
+    if uses_full_text():
+        SearchDocument.objects.filter(pk=document.pk).update(search_vector=DOCUMENT_VECTOR)
+    if hasattr(instance, 'tags'):
+        sync_tags(kind, {instance.pk: instance.tags})
+    invalidate_facets(kind)
+
+
+def remove_instance(instance):
+    kind = SOURCES[instance._meta.label][0]
+    SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+    remove_tags(kind, instance.pk)
+    transaction.on_commit(lambda: invalidate_facets(kind))
+
+
+def matching_documents(query):
+    """Active documents matching `query`, annotated with search_rank"""
+    documents = SearchDocument.objects.filter(is_active=True)
+    if uses_full_text():
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        return documents.filter(search_vector=search_query).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query)
+        )
+    return documents.filter(
+        Q(title__icontains=query) |
+        Q(body__icontains=query) |
+        Q(location__icontains=query) |
+        Q(category__icontains=query)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def search_queryset(queryset, query):
+    """Restrict a source-model queryset to listings matching `query`, annotated with search_rank"""
+    kind = SOURCES[queryset.model._meta.label][0]
+    documents = matching_documents(query).filter(kind=kind)
+    rank = documents.filter(object_id=OuterRef('pk')).values('search_rank')[:1]
+    return queryset.filter(pk__in=documents.values('object_id')).annotate(
+        search_rank=Subquery(rank, output_field=FloatField())
+    )
+
+
+def facet_counts(documents, field):
+    """{value: count} for one document field over a result set"""
+    rows = documents.order_by().values(field).annotate(n=Count('pk'))
+    return {row[field]: row['n'] for row in rows if row[field]}
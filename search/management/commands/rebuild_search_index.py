@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+
+from search.facets import invalidate_facets
+from search.index import DOCUMENT_VECTOR, source_models, uses_full_text
+from search.models import SearchDocument, TaggedListing
+from search.tags import sync_tags
+
+DOCUMENT_FIELDS = ['title', 'body', 'location', 'category', 'price', 'is_active', 'created_at', 'updated_at']
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the marketplace search index and listing tags from the listing tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Listings to index per query'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        for model, kind, build in source_models():
+            queryset = model.objects.all()
+            if kind == 'service':
+                queryset = queryset.select_related('category')
+
+            has_tags = any(field.name == 'tags' for field in model._meta.fields)
+            indexed = 0
+            batch = []
+            tag_strings = {}
+            for instance in queryset.iterator(chunk_size=batch_size):
+                batch.append(SearchDocument(
+                    kind=kind,
+                    object_id=instance.pk,
+                    created_at=instance.created_at,
+                    **build(instance),
+                ))
+                if has_tags:
+                    tag_strings[instance.pk] = instance.tags
+                if len(batch) >= batch_size:
+                    indexed += self.write_batch(kind, batch, tag_strings)
+                    batch = []
+                    tag_strings = {}
+            indexed += self.write_batch(kind, batch, tag_strings)
+
+            existing = model.objects.values('pk')
+            stale, _ = SearchDocument.objects.filter(kind=kind).exclude(object_id__in=existing).delete()
+            TaggedListing.objects.filter(kind=kind).exclude(object_id__in=existing).delete()
+            invalidate_facets(kind)
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {indexed} indexed, {stale} stale removed")
+
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
+
+    def write_batch(self, kind, batch, tag_strings):
+        if not batch:
+            return 0
+        SearchDocument.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['kind', 'object_id'],
+            update_fields=DOCUMENT_FIELDS,
+        )
+        if uses_full_text():
+            # One UPDATE per batch computes the vectors in the database
+            SearchDocument.objects.filter(
+                kind=kind, object_id__in=[document.object_id for document in batch]
+            ).update(search_vector=DOCUMENT_VECTOR)
+        if tag_strings:
+            sync_tags(kind, tag_strings)
+        return len(batch)
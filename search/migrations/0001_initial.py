@@ -0,0 +1,63 @@
+# Generated by Django 4.2.9 on 2026-10-19 05:43
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+def create_vector_index(apps, schema_editor):
+    # GIN indexes are PostgreSQL-only; other databases search without the vector
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX "search_doc_vector_gin" ON "search_searchdocument" USING gin ("search_vector")'
+        )
+
+
+def drop_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS "search_doc_vector_gin"')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('item', 'Item for Sale'), ('request', 'Buy Request'), ('service', 'Service'), ('job', 'Piece Job')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('body', models.TextField(blank=True)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('category', models.CharField(blank=True, max_length=100)),
+                ('price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+                'indexes': [models.Index(fields=['is_active', 'kind', 'category'], name='search_sear_is_acti_38905c_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='searchdocument',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='search_doc_vector_gin'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_vector_index, drop_vector_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.9 on 2026-10-19 05:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils.text import slugify
+
+# The listing apps have no migrations, so their tables are read directly
+TAGGED_TABLES = [
+    ('item', 'isell_saleitem'),
+    ('request', 'iwanttobuy_buyrequest'),
+    ('service', 'services_servicelisting'),
+]
+
+
+def backfill_tags(apps, schema_editor):
+    Tag = apps.get_model('search', 'Tag')
+    TaggedListing = apps.get_model('search', 'TaggedListing')
+    connection = schema_editor.connection
+    tables = set(connection.introspection.table_names())
+
+    for kind, table in TAGGED_TABLES:
+        if table not in tables:
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id, tags FROM {connection.ops.quote_name(table)} WHERE tags IS NOT NULL AND tags <> ''"
+            )
+            rows = cursor.fetchall()
+
+        names = {}
+        links = set()
+        for object_id, value in rows:
+            for part in value.split(','):
+                name = ' '.join(part.split())[:50]
+                slug = slugify(name)[:50]
+                if slug:
+                    names.setdefault(slug, name.lower())
+                    links.add((object_id, slug))
+
+        Tag.objects.bulk_create(
+            [Tag(slug=slug, name=name) for slug, name in names.items()],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        tag_ids = dict(Tag.objects.values_list('slug', 'id'))
+        TaggedListing.objects.bulk_create(
+            [TaggedListing(kind=kind, object_id=object_id, tag_id=tag_ids[slug]) for object_id, slug in links],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('slug', models.SlugField(unique=True)),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaggedListing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('item', 'Item for Sale'), ('request', 'Buy Request'), ('service', 'Service'), ('job', 'Piece Job')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listings', to='search.tag')),
+            ],
+            options={
+                'verbose_name': 'Tagged Listing',
+                'verbose_name_plural': 'Tagged Listings',
+                'indexes': [models.Index(fields=['kind', 'object_id'], name='search_tagg_kind_3d77d9_idx')],
+                'unique_together': {('tag', 'kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.9 on 2026-10-19 05:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarListings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('item', 'Item for Sale'), ('request', 'Buy Request'), ('service', 'Service'), ('job', 'Piece Job')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('neighbour_ids', models.JSONField(default=list)),
+                ('scores', models.JSONField(default=list, help_text='Cosine similarity of each neighbour')),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Similar Listings',
+                'verbose_name_plural': 'Similar Listings',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,105 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from django.urls import reverse
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized, searchable copy of one marketplace listing. Kept in sync
+    from the source models by signals (see search.index).
+    """
+    KIND_CHOICES = [
+        ('item', 'Item for Sale'),
+        ('request', 'Buy Request'),
+        ('service', 'Service'),
+        ('job', 'Piece Job'),
+    ]
+
+    # URL name of each kind's detail page
+    DETAIL_URLS = {
+        'item': 'isell:item_detail',
+        'request': 'iwanttobuy:request_detail',
+        'service': 'services:service_detail',
+        'job': 'business_services:service_detail',
+    }
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    category = models.CharField(max_length=100, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='search_doc_vector_gin'),
+            models.Index(fields=['is_active', 'kind', 'category']),
+        ]
+        verbose_name = 'Search Document'
+        verbose_name_plural = 'Search Documents'
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+    def get_absolute_url(self):
+        return reverse(self.DETAIL_URLS[self.kind], args=[self.object_id])
+
+
+class Tag(models.Model):
+    """A normalized listing tag, shared by all the marketplaces"""
+    name = models.CharField(max_length=50)
+    slug = models.SlugField(max_length=50, unique=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Tag'
+        verbose_name_plural = 'Tags'
+
+    def __str__(self):
+        return self.name
+
+
+class TaggedListing(models.Model):
+    """Links a tag to a listing of any kind (the same kinds as SearchDocument)"""
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='listings')
+    kind = models.CharField(max_length=10, choices=SearchDocument.KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+
+    class Meta:
+        # The unique index (tag, kind, object_id) also answers tag filters on its own
+        unique_together = ['tag', 'kind', 'object_id']
+        indexes = [
+            models.Index(fields=['kind', 'object_id']),
+        ]
+        verbose_name = 'Tagged Listing'
+        verbose_name_plural = 'Tagged Listings'
+
+    def __str__(self):
+        return f"{self.tag} on {self.kind} #{self.object_id}"
+
+
+class SimilarListings(models.Model):
+    """
+    Precomputed nearest neighbours of one listing among the active listings
+    of the same kind, best first. Rebuilt nightly (see search.similar).
+    """
+    kind = models.CharField(max_length=10, choices=SearchDocument.KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    neighbour_ids = models.JSONField(default=list)
+    scores = models.JSONField(default=list, help_text="Cosine similarity of each neighbour")
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        verbose_name = 'Similar Listings'
+        verbose_name_plural = 'Similar Listings'
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {len(self.neighbour_ids)} similar"
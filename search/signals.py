@@ -0,0 +1,24 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .index import SOURCES, index_instance, remove_instance
+
+
+def update_search_document(sender, instance, update_fields=None, **kwargs):
+    """Refresh a listing's search document once the save is committed"""
+    transaction.on_commit(lambda: index_instance(instance, update_fields))
+
+
+def delete_search_document(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+for label in SOURCES:
+    try:
+        model = apps.get_model(label)
+    except LookupError:
+        # App not installed in this deployment
+        continue
+    post_save.connect(update_search_document, sender=model, dispatch_uid=f'search_index_{label}')
+    post_delete.connect(delete_search_document, sender=model, dispatch_uid=f'search_remove_{label}')
@@ -0,0 +1,154 @@
+"""
+"Similar listings" recommendations, computed in batch.
+
+Once a night the active search documents of each kind (items, buy requests,
+services) are turned into L2-normalized TF-IDF vectors and every listing's
+top-k neighbours by cosine similarity are found with blocked matrix
+products: BLOCK_SIZE rows at a time against the whole matrix, so memory stays
+at BLOCK_SIZE x N scores however many listings there are. The results go
+into SimilarListings, one row per listing, and detail pages read them with
+an indexed lookup; nothing is computed per request.
+
+Terms that occur in only one listing cannot make two listings similar, so
+they are dropped before the matrix is built (min_df=2), and the vocabulary
+is capped at MAX_FEATURES by document frequency. That keeps the dense
+float32 matrix small enough for NumPy without SciPy's sparse types.
+"""
+
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from .models import SearchDocument, SimilarListings
+
+SIMILAR_KINDS = ['item', 'request', 'service']
+TOP_K = getattr(settings, 'SIMILAR_LISTINGS_TOP_K', 6)
+MAX_FEATURES = getattr(settings, 'SIMILAR_LISTINGS_MAX_FEATURES', 4096)
+MIN_SIMILARITY = 0.2
+BLOCK_SIZE = 512
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'i', 'in', 'is', 'it',
+    'my', 'of', 'on', 'or', 'our', 'that', 'the', 'this', 'to', 'we', 'will', 'with', 'you', 'your',
+}
+
+
+def tokenize(text):
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def document_terms(title, body, category):
+    # The title counts twice: it says what the listing is, the body says how
+    return Counter(tokenize(f"{title} {title} {category} {body}"))
+
+
+def tfidf_matrix(term_counts, max_features=MAX_FEATURES, min_df=2):
+    """Row-normalized float32 TF-IDF matrix (n documents x vocabulary)"""
+    n = len(term_counts)
+    document_frequency = Counter()
+    for counts in term_counts:
+        document_frequency.update(counts.keys())
+    vocabulary = [term for term, df in document_frequency.most_common(max_features) if df >= min_df]
+    columns = {term: column for column, term in enumerate(vocabulary)}
+
+    matrix = np.zeros((n, len(vocabulary)), dtype=np.float32)
+    for row, counts in enumerate(term_counts):
+        for term, count in counts.items():
+            column = columns.get(term)
+            if column is not None:
+                # Sublinear term frequency: repeating a word helps, but less each time
+                matrix[row, column] = 1 + math.log(count)
+
+    df = np.array([document_frequency[term] for term in vocabulary], dtype=np.float32)
+    matrix *= np.log((1 + n) / (1 + df)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    matrix /= norms
+    return matrix
+
+
+def top_neighbours(matrix, k=TOP_K, block_size=BLOCK_SIZE):
+    """Yield (row, [(neighbour row, similarity)]) for every row, best first"""
+    n = matrix.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        scores = matrix[start:stop] @ matrix.T
+        # A listing is not its own neighbour
+        scores[np.arange(stop - start), np.arange(start, stop)] = -1
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        for offset in range(stop - start):
+            yield start + offset, [
+                (int(column), float(score))
+                for column, score in zip(best[offset], best_scores[offset])
+                if score >= MIN_SIMILARITY
+            ]
+
+
+def compute_similar_listings(kind, k=TOP_K, block_size=BLOCK_SIZE):
+    """Rebuild the SimilarListings rows of one kind; returns the number of listings covered"""
+    started = timezone.now()
+    rows = list(
+        SearchDocument.objects.filter(kind=kind, is_active=True)
+        .order_by('object_id')
+        .values_list('object_id', 'title', 'body', 'category')
+    )
+    object_ids = [row[0] for row in rows]
+    matrix = tfidf_matrix([document_terms(title, body, category) for _, title, body, category in rows])
+
+    batch = []
+    for row, neighbours in top_neighbours(matrix, k, block_size):
+        batch.append(SimilarListings(
+            kind=kind,
+            object_id=object_ids[row],
+            neighbour_ids=[object_ids[column] for column, _ in neighbours],
+            scores=[round(score, 3) for _, score in neighbours],
+            computed_at=started,
+        ))
+        if len(batch) >= block_size:
+            save_rows(batch)
+            batch = []
+    save_rows(batch)
+
+    # Listings that expired or were removed since the last run
+    SimilarListings.objects.filter(kind=kind, computed_at__lt=started).delete()
+    return len(object_ids)
+
+
+def save_rows(batch):
+    if batch:
+        SimilarListings.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['kind', 'object_id'],
+            update_fields=['neighbour_ids', 'scores', 'computed_at'],
+        )
+
+
+def similar_listings(kind, object_id, limit=TOP_K):
+    """Active search documents similar to one listing, best first; [] until the nightly job has run"""
+    neighbour_ids = (
+        SimilarListings.objects.filter(kind=kind, object_id=object_id)
+        .values_list('neighbour_ids', flat=True)
+        .first()
+    )
+    if not neighbour_ids:
+        return []
+    neighbour_ids = neighbour_ids[:limit]
+    documents = SearchDocument.objects.filter(kind=kind, object_id__in=neighbour_ids, is_active=True)
+    by_id = {document.object_id: document for document in documents}
+    return [by_id[object_id] for object_id in neighbour_ids if object_id in by_id]
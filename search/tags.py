@@ -0,0 +1,59 @@
+"""
+Normalized listing tags.
+
+Listings keep their comma-separated `tags` text for editing; the search
+signals mirror it into Tag and TaggedListing rows, so filtering by a tag is
+an exact, indexed lookup instead of an icontains over the text.
+"""
+
+from django.db.models import Q
+from django.utils.text import slugify
+
+from .models import Tag, TaggedListing
+
+MAX_TAG_LENGTH = 50
+
+
+def parse_tags(value):
+    """[(slug, name)] for a comma-separated tag string, without duplicates"""
+    tags = {}
+    for part in (value or '').split(','):
+        name = ' '.join(part.split())[:MAX_TAG_LENGTH]
+        slug = slugify(name)[:MAX_TAG_LENGTH]
+        if slug and slug not in tags:
+            tags[slug] = name.lower()
+    return list(tags.items())
+
+
+def sync_tags(kind, tag_strings):
+    """Make the tag rows of each listing in {object_id: tag string} match its string"""
+    wanted = {object_id: parse_tags(value) for object_id, value in tag_strings.items()}
+    names = {slug: name for tags in wanted.values() for slug, name in tags}
+
+    Tag.objects.bulk_create([Tag(slug=slug, name=name) for slug, name in names.items()], ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.filter(slug__in=names).values_list('slug', 'id'))
+
+    desired = {(object_id, tag_ids[slug]) for object_id, tags in wanted.items() for slug, _ in tags}
+    current = set(
+        TaggedListing.objects.filter(kind=kind, object_id__in=wanted).values_list('object_id', 'tag_id')
+    )
+    TaggedListing.objects.bulk_create(
+        [TaggedListing(kind=kind, object_id=object_id, tag_id=tag_id) for object_id, tag_id in desired - current],
+        ignore_conflicts=True,
+    )
+
+    stale = current - desired
+    if stale:
+        condition = Q()
+        for object_id, tag_id in stale:
+            condition |= Q(object_id=object_id, tag_id=tag_id)
+        TaggedListing.objects.filter(condition, kind=kind).delete()
+
+
+def remove_tags(kind, object_id):
+    TaggedListing.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def tagged_ids(kind, slug):
+    """Subquery of the ids of `kind` listings tagged `slug`"""
+    return TaggedListing.objects.filter(kind=kind, tag__slug=slug).values('object_id')
@@ -0,0 +1,15 @@
+import logging
+
+from celery import shared_task
+
+from .similar import SIMILAR_KINDS, compute_similar_listings
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def compute_similar_listing_recommendations():
+    """Recompute the "similar listings" of every active item, buy request and service"""
+    covered = {kind: compute_similar_listings(kind) for kind in SIMILAR_KINDS}
+    logger.info(f"Computed similar listings: {covered}")
+    return covered
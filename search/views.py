@@ -0,0 +1,85 @@
+from decimal import Decimal, InvalidOperation
+
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.shortcuts import render
+
+from .index import facet_counts, matching_documents
+from .models import SearchDocument
+
+
+def parse_price(value):
+    try:
+        return Decimal(value) if value else None
+    except InvalidOperation:
+        return None
+
+
+def search(request):
+    """One search across items for sale, buy requests, services and piece jobs"""
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('kind')
+    category = request.GET.get('category')
+    min_price = parse_price(request.GET.get('min_price'))
+    max_price = parse_price(request.GET.get('max_price'))
+
+    documents = SearchDocument.objects.none()
+    kind_counts = {}
+    category_counts = {}
+    if query:
+        documents = matching_documents(query)
+        if min_price is not None:
+            documents = documents.filter(price__gte=min_price)
+        if max_price is not None:
+            documents = documents.filter(price__lte=max_price)
+
+        # Each facet is counted before its own filter, so the other options stay visible
+        kind_counts = facet_counts(documents, 'kind')
+        if kind:
+            documents = documents.filter(kind=kind)
+        category_counts = facet_counts(documents, 'category')
+        if category:
+            documents = documents.filter(category=category)
+        documents = documents.order_by('-search_rank', '-created_at')
+
+    paginator = Paginator(documents, 20)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'query': query,
+            'count': paginator.count,
+            'page': page_obj.number,
+            'num_pages': paginator.num_pages,
+            'facets': {'kind': kind_counts, 'category': category_counts},
+            'results': [
+                {
+                    'kind': document.kind,
+                    'id': document.object_id,
+                    'title': document.title,
+                    'location': document.location,
+                    'category': document.category,
+                    'price': str(document.price) if document.price is not None else None,
+                    'url': document.get_absolute_url(),
+                    'rank': document.search_rank,
+                }
+                for document in page_obj
+            ],
+        })
+
+    kind_labels = dict(SearchDocument.KIND_CHOICES)
+    params = request.GET.copy()
+    params.pop('page', None)
+    context = {
+        'page_obj': page_obj,
+        'query': query,
+        'selected_kind': kind,
+        'selected_category': category,
+        'min_price': request.GET.get('min_price'),
+        'max_price': request.GET.get('max_price'),
+        'kind_facets': [(value, kind_labels.get(value, value), n) for value, n in sorted(kind_counts.items())],
+        'category_facets': sorted(category_counts.items(), key=lambda facet: (-facet[1], facet[0])),
+        'querystring': params.urlencode(),
+        'title': f'Search: {query}' if query else 'Search',
+    }
+    return render(request, 'search/results.html', context)
@@ -4,3 +4,6 @@ class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services'
     verbose_name = 'I Provide Services'
+
+    def ready(self):
+        import services.signals  # Import signals here
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from services.models import ServiceListing, ServiceReview, rating_score_expression
+
+
+class Command(BaseCommand):
+    help = 'Recompute the rating aggregates of every service listing from its reviews'
+
+    def handle(self, *args, **options):
+        reviews = ServiceReview.objects.filter(service=OuterRef('pk')).order_by().values('service')
+        updated = ServiceListing.objects.update(
+            rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0),
+            rating_count=Coalesce(Subquery(reviews.annotate(total=Count('id')).values('total')), 0),
+        )
+        ServiceListing.objects.update(rating_score=rating_score_expression())
+        self.stdout.write(self.style.SUCCESS(f"Recounted ratings for {updated} service listings"))
@@ -2,6 +2,22 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.urls import reverse
+from media_assets.storage import protected_storage
+
+# Bayesian rating: every listing counts as if it already had RATING_PRIOR_WEIGHT
+# reviews of RATING_PRIOR_MEAN stars, so a single 5-star review cannot outrank
+# a long record of 4.8s
+RATING_PRIOR_MEAN = 3.0
+RATING_PRIOR_WEIGHT = 5
+
+
+def rating_score_expression(sum_delta=0, count_delta=0):
+    """rating_score after adding the deltas, computed in the UPDATE from the row's current values"""
+    return models.ExpressionWrapper(
+        (models.Value(RATING_PRIOR_WEIGHT * RATING_PRIOR_MEAN) + models.F('rating_sum') + sum_delta)
+        / (models.Value(float(RATING_PRIOR_WEIGHT)) + models.F('rating_count') + count_delta),
+        output_field=models.FloatField(),
+    )
 
 class ServiceCategory(models.Model):
     """Model for service categories"""
@@ -56,6 +72,9 @@ class ServiceListing(models.Model):
     qualifications = models.TextField(blank=True, null=True)
     availability = models.CharField(max_length=20, choices=AVAILABILITY_CHOICES, default='ANYTIME')
     service_areas = models.CharField(max_length=255, help_text="Areas where service is provided")
+    # Estimated from the service areas by the offline geocoder
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     
     # Contact information
     contact_number = models.CharField(max_length=20)
@@ -68,7 +87,7 @@ class ServiceListing(models.Model):
     gallery_image1 = models.ImageField(upload_to='services/gallery/', blank=True, null=True)
     gallery_image2 = models.ImageField(upload_to='services/gallery/', blank=True, null=True)
     gallery_image3 = models.ImageField(upload_to='services/gallery/', blank=True, null=True)
-    portfolio_pdf = models.FileField(upload_to='services/portfolios/', blank=True, null=True)
+    portfolio_pdf = models.FileField(upload_to='services/portfolios/', storage=protected_storage, blank=True, null=True)
     
     # Tags for better search
     tags = models.CharField(max_length=255, blank=True, null=True, help_text="Comma separated tags")
@@ -84,8 +103,16 @@ class ServiceListing(models.Model):
     # Stats
     view_count = models.PositiveIntegerField(default=0)
     
+    # Review aggregates, kept current by the ServiceReview signals
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_score = models.FloatField(default=RATING_PRIOR_MEAN, help_text="Bayesian average rating, used for ranking")
+    
     class Meta:
         ordering = ['-featured', '-created_at']
+        indexes = [
+            models.Index(fields=['status', '-rating_score', '-featured'], name='services_rating_rank_idx'),
+        ]
         verbose_name = 'Service Listing'
         verbose_name_plural = 'Service Listings'
     
@@ -101,6 +128,13 @@ class ServiceListing(models.Model):
     
     def get_absolute_url(self):
         return reverse('services:service_detail', kwargs={'pk': self.pk})
+    
+    @property
+    def average_rating(self):
+        """Plain mean of the review ratings, or None before the first review"""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
 
 
 class ServiceReview(models.Model):
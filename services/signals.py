@@ -0,0 +1,48 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from search.facets import invalidate_facets
+
+from .models import ServiceCategory, ServiceListing, ServiceReview, rating_score_expression
+
+
+def update_rating(service_id, sum_delta, count_delta):
+    """Apply a review change to the listing's aggregates in one atomic UPDATE"""
+    ServiceListing.objects.filter(pk=service_id).update(
+        rating_sum=F('rating_sum') + sum_delta,
+        rating_count=F('rating_count') + count_delta,
+        rating_score=rating_score_expression(sum_delta, count_delta),
+    )
+
+
+@receiver(pre_save, sender=ServiceReview)
+def service_review_pre_save(sender, instance, **kwargs):
+    # Remember the stored rating so post_save can apply only the difference
+    if instance.pk:
+        instance._previous_rating = (
+            ServiceReview.objects.filter(pk=instance.pk).values_list('rating', flat=True).first()
+        )
+    else:
+        instance._previous_rating = None
+
+
+@receiver(post_save, sender=ServiceReview)
+def service_review_post_save(sender, instance, created, **kwargs):
+    previous_rating = getattr(instance, '_previous_rating', None)
+    if created:
+        update_rating(instance.service_id, instance.rating, 1)
+    elif previous_rating is not None and previous_rating != instance.rating:
+        update_rating(instance.service_id, instance.rating - previous_rating, 0)
+
+
+@receiver(post_delete, sender=ServiceReview)
+def service_review_post_delete(sender, instance, **kwargs):
+    update_rating(instance.service_id, -instance.rating, -1)
+
+
+@receiver(post_save, sender=ServiceCategory)
+@receiver(post_delete, sender=ServiceCategory)
+def service_category_changed(sender, instance, **kwargs):
+    # The cached service facets carry each category's name and icon
+    invalidate_facets('service')
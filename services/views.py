@@ -2,12 +2,18 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, Avg
+from django.urls import reverse
 from django.http import HttpResponseForbidden, JsonResponse
 from django.views.decorators.http import require_POST
 
 from .models import ServiceListing, ServiceReview, ServiceInquiry, ServiceCategory
 from .forms import ServiceListingForm, ServiceReviewForm, ServiceInquiryForm
+from counters.buffer import record_view
+from media_assets.images import get_derivatives_many
+from search.facets import listing_facets
+from search.index import search_queryset
+from search.similar import similar_listings
+from search.tags import tagged_ids
 
 def service_list(request):
     """View to list all service listings"""
@@ -18,32 +24,34 @@ def service_list(request):
     # Handle search
     query = request.GET.get('q')
     if query:
-        services = services.filter(
-            Q(title__icontains=query) | 
-            Q(description__icontains=query) |
-            Q(service_areas__icontains=query) |
-            Q(tags__icontains=query)
-        )
+        services = search_queryset(services, query)
     
     # Handle category filter
     category_id = request.GET.get('category')
     if category_id:
         services = services.filter(category_id=category_id)
     
+    # Handle tag filter
+    tag = request.GET.get('tag')
+    if tag:
+        services = services.filter(pk__in=tagged_ids('service', tag))
+    
     # Handle sort order
-    sort = request.GET.get('sort', 'featured')
-    if sort == 'newest':
+    sort = request.GET.get('sort', 'relevance' if query else 'featured')
+    if sort == 'relevance' and query:
+        services = services.order_by('-search_rank', '-featured')
+    elif sort == 'newest':
         services = services.order_by('-created_at')
     elif sort == 'oldest':
         services = services.order_by('created_at')
     elif sort == 'rating':
-        # Annotate with average rating
-        services = services.annotate(avg_rating=Avg('reviews__rating')).order_by('-avg_rating', '-featured')
+        # Walks the (status, rating_score, featured) index
+        services = services.order_by('-rating_score', '-featured')
     else:  # Default to featured
         services = services.order_by('-featured', '-created_at')
     
-    # Get all categories for the filter
-    categories = ServiceCategory.objects.all()
+    # Categories (with listing counts) and tags for the filter, from one cached lookup
+    facets = listing_facets('service')
     
     # Pagination
     paginator = Paginator(services, 12)  # Show 12 services per page
@@ -52,10 +60,13 @@ def service_list(request):
     
     context = {
         'page_obj': page_obj,
-        'categories': categories,
+        'categories': facets['service_categories'],
         'query': query,
         'selected_category': category_id,
+        'tag_facets': facets['tags'],
+        'selected_tag': tag,
         'sort': sort,
+        'image_derivatives': get_derivatives_many(service.profile_image.name for service in page_obj),
         'title': 'I Provide Services'
     }
     
@@ -67,15 +78,14 @@ def service_detail(request, pk):
     
     service = get_object_or_404(ServiceListing, pk=pk)
     
-    # Increment view count
-    service.view_count += 1
-    service.save()
+    # Count the view in the buffer; the row itself is not written
+    record_view(service)
     
     # Get reviews for this service
     reviews = service.reviews.all().order_by('-created_at')
     
-    # Calculate average rating
-    avg_rating = reviews.aggregate(Avg('rating'))['rating__avg']
+    # Average rating from the stored aggregates
+    avg_rating = service.average_rating
     
     # Review form (for authenticated users)
     review_form = None
@@ -94,6 +104,7 @@ def service_detail(request, pk):
         'avg_rating': avg_rating,
         'review_form': review_form,
         'inquiry_form': inquiry_form,
+        'similar_listings': similar_listings('service', service.pk),
         'title': service.title
     }
     
@@ -321,16 +332,8 @@ def send_inquiry(request, pk):
 
 @login_required
 def my_inquiries(request):
-    """View to display inquiries about the user's services"""
-    
-    inquiries = ServiceInquiry.objects.filter(service__provider=request.user).order_by('-created_at')
-    
-    context = {
-        'inquiries': inquiries,
-        'title': 'Service Inquiries'
-    }
-    
-    return render(request, 'services/my_inquiries.html', context)
+    """Inquiries now live in the marketplace inbox, threaded per customer"""
+    return redirect(f"{reverse('inbox:inbox')}?kind=service")
 
 
 @login_required
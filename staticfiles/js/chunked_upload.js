@@ -0,0 +1,132 @@
+// Resumable chunked uploads for file inputs rendered by media_assets.forms.ChunkedFileInput.
+// The selected file is sent in chunks (tus-style PATCH requests) as soon as it is chosen;
+// when it is complete the hidden companion input gets the upload id and the file input
+// is cleared, so the form itself only posts the id. Interrupted uploads resume from the
+// server's offset, including after a page reload.
+
+document.addEventListener('DOMContentLoaded', function() {
+    const inputs = document.querySelectorAll('input[type=file][data-chunked-upload]');
+    if (!inputs.length) {
+        return;
+    }
+
+    const csrfInput = document.querySelector('[name=csrfmiddlewaretoken]');
+    const csrfToken = csrfInput ? csrfInput.value : '';
+    const MAX_RETRIES = 5;
+
+    function storageKey(file) {
+        return `chunked-upload:${file.name}:${file.size}:${file.lastModified}`;
+    }
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    async function request(method, url, options = {}) {
+        const headers = Object.assign({'Tus-Resumable': '1.0.0', 'X-CSRFToken': csrfToken}, options.headers || {});
+        return fetch(url, {method: method, headers: headers, body: options.body, credentials: 'same-origin'});
+    }
+
+    async function currentOffset(url) {
+        const response = await request('HEAD', url);
+        if (!response.ok) {
+            return null;
+        }
+        return parseInt(response.headers.get('Upload-Offset'), 10);
+    }
+
+    async function createUpload(input, file) {
+        const metadata = `filename ${btoa(unescape(encodeURIComponent(file.name)))},filetype ${btoa(file.type || '')}`;
+        const response = await request('POST', input.dataset.uploadUrl, {
+            headers: {'Upload-Length': String(file.size), 'Upload-Metadata': metadata},
+        });
+        if (!response.ok) {
+            throw new Error(response.status === 413 ? 'File is too large.' : 'Could not start the upload.');
+        }
+        return response.json();
+    }
+
+    async function upload(input, file, onProgress) {
+        const chunkSize = parseInt(input.dataset.chunkSize, 10);
+        const key = storageKey(file);
+        let saved = JSON.parse(localStorage.getItem(key) || 'null');
+        let offset = saved ? await currentOffset(saved.url) : null;
+
+        if (offset === null) {
+            saved = await createUpload(input, file);
+            offset = 0;
+            localStorage.setItem(key, JSON.stringify({id: saved.id, url: saved.url}));
+        }
+
+        let retries = 0;
+        while (offset < file.size) {
+            const chunk = file.slice(offset, offset + chunkSize);
+            let response;
+            try {
+                response = await request('PATCH', saved.url, {
+                    headers: {'Content-Type': 'application/offset+octet-stream', 'Upload-Offset': String(offset)},
+                    body: chunk,
+                });
+            } catch (e) {
+                response = null;
+            }
+
+            if (response && response.ok) {
+                offset = parseInt(response.headers.get('Upload-Offset'), 10);
+                retries = 0;
+                onProgress(offset / file.size);
+                continue;
+            }
+            if (response && [404, 413, 415].includes(response.status)) {
+                localStorage.removeItem(key);
+                throw new Error('The upload was rejected.');
+            }
+            if (++retries > MAX_RETRIES) {
+                throw new Error('The upload keeps failing; please try again later.');
+            }
+            // Back off, then ask the server where to carry on from
+            await sleep(Math.min(1000 * 2 ** retries, 15000));
+            const resumed = await currentOffset(saved.url);
+            if (resumed !== null) {
+                offset = resumed;
+            }
+        }
+
+        localStorage.removeItem(key);
+        return saved.id;
+    }
+
+    inputs.forEach(function(input) {
+        const hidden = document.getElementById(input.dataset.chunkedUpload);
+        const form = input.form;
+        const status = document.createElement('div');
+        status.className = 'form-text';
+        input.insertAdjacentElement('afterend', status);
+
+        input.addEventListener('change', async function() {
+            const file = input.files[0];
+            hidden.value = '';
+            if (!file) {
+                status.textContent = '';
+                return;
+            }
+
+            const submit = form ? form.querySelectorAll('[type=submit]') : [];
+            submit.forEach(btn => btn.disabled = true);
+            status.textContent = 'Uploading... 0%';
+            try {
+                hidden.value = await upload(input, file, function(progress) {
+                    status.textContent = `Uploading... ${Math.floor(progress * 100)}%`;
+                });
+                // The form now posts the upload id instead of the file itself
+                input.value = '';
+                input.required = false;
+                status.textContent = `${file.name} uploaded`;
+            } catch (e) {
+                status.textContent = e.message;
+            } finally {
+                submit.forEach(btn => btn.disabled = false);
+            }
+        });
+    });
+});